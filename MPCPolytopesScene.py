@@ -1,5 +1,9 @@
 from manim import *
 
+from explicit_mpc import build, closed_loop_features, load_benchmark
+from point_cloud import MovePointSet, PointCloud
+from tsne_embedding import embed
+
 class MPCPolytopesScene(Scene):
     CONFIG = {
         "camera_config": {
@@ -19,24 +23,50 @@ class MPCPolytopesScene(Scene):
         self.add(empc_description)
         self.wait(3)
 
-        # Interesting Convex Polytopes
+        # Critical regions of the double integrator's explicit MPC law
+        explicit, tree = build()
+        # Written by render_all before rendering; a cold cache benchmarks 100k
+        # lookups and 200 QPs here (about 2 s) and warns
+        benchmark = load_benchmark()
+        state_axes = Axes(
+            x_range=[explicit.x_min[0], explicit.x_max[0], 5],
+            y_range=[explicit.x_min[1], explicit.x_max[1], 5],
+            x_length=7,
+            y_length=3.5,
+            tips=False,
+        ).move_to([-0.5, -1.5, 0])
+        regions = [
+            Polygon(*[state_axes.c2p(*vertex) for vertex in vertices],
+                    color=GREY, stroke_width=1, fill_opacity=0.1)
+            for vertices in explicit.vertices
+        ]
+        self.play(LaggedStart(*[Create(region) for region in regions], lag_ratio=0.02))
+
+        # The three largest regions carry the labels
+        largest = np.argsort(explicit.areas())[::-1][:3]
         polytopes = [
-            Polygon([-4, -3, 0], [-2, -4, 0], [0, -3, 0], [-3, -1, 0], color=BLUE),
-            Polygon([1, -3, 0], [2, -4, 0], [3, -2, 0], [2.5, -1, 0], [2, -0.5, 0], color=GREEN),
-            Polygon([-4, 0, 0], [-3, 1, 0], [0, 1, 0], [3, 0, 0], [0.5, -1, 0], color=RED)
+            regions[i].copy().set_stroke(color, width=3).set_fill(color, opacity=0.3)
+            for i, color in zip(largest, [BLUE, GREEN, RED])
         ]
         polytope_labels = [
-            MathTex(r"F_1x + g_1", font_size=30).move_to(polytopes[0].get_center()),
-            MathTex(r"F_2x + g_2", font_size=30).move_to(polytopes[1].get_center()),
-            MathTex(r"F_3x + g_3", font_size=30).move_to(polytopes[2].get_center())
+            MathTex(rf"F_{k}x + g_{k}", font_size=30).move_to(state_axes.c2p(*explicit.centers[i]))
+            for k, i in enumerate(largest, start=1)
         ]
 
         for polytope, label in zip(polytopes, polytope_labels):
             self.play(Create(polytope), Write(label))
+
+        lookup_text = Text(
+            f"{len(explicit)} regions, search tree depth {tree.depth}: "
+            f"{1e9 * benchmark['lookup_time_per_state']:.0f} ns per state vs "
+            f"{1e3 * benchmark['qp_time_per_state']:.2f} ms for an online QP",
+            font_size=18,
+        ).next_to(state_axes, DOWN)
+        self.play(Write(lookup_text))
         self.wait(2)
 
         # Transition to t-SNE
-        self.play(FadeOut(empc_description))
+        self.play(FadeOut(empc_description), FadeOut(lookup_text), *[FadeOut(region) for region in regions])
 
         # t-SNE Explanation
         tsne_description = Text(
@@ -55,14 +85,23 @@ class MPCPolytopesScene(Scene):
         self.add(three_d_axes)
         self.wait(1)
 
-        blue_dots = VGroup(*[Dot(color=BLUE).move_to(np.random.uniform(-2.5, 2.5) * RIGHT + np.random.uniform(-2.5, 2.5) * UP) for _ in range(10)])
-        green_dots = VGroup(*[Dot(color=GREEN).move_to(np.random.uniform(-2.5, 2.5) * RIGHT + np.random.uniform(-2.5, 2.5) * UP) for _ in range(10)])
-        red_dots = VGroup(*[Dot(color=RED).move_to(np.random.uniform(-2.5, 2.5) * RIGHT + np.random.uniform(-2.5, 2.5) * UP) for _ in range(10)])
-        nn_space_points = VGroup(blue_dots, green_dots, red_dots)
+        # Closed-loop runs from the three labelled regions: 60-D state and input trajectories
+        features, run_cluster = closed_loop_features(explicit, tree, largest, per_region=150)
+        embedding = embed(features, perplexity=30.0)
+        tsne_colors = [BLUE, GREEN, RED]
+
+        # The first three principal components place the runs on the 3-D axes
+        centered = features - features.mean(axis=0)
+        components = centered @ np.linalg.svd(centered, full_matrices=False)[2][:3].T
+        components *= 2.5 / np.abs(components).max()
+        cluster_dots = [
+            PointCloud([three_d_axes.c2p(*point) for point in components[run_cluster == k]], radii=0.03, colors=color)
+            for k, color in enumerate(tsne_colors)
+        ]
+        nn_space_points = VGroup(*cluster_dots)
         self.play(Create(nn_space_points))
         self.wait(1)
 
-        tsne_colors = [BLUE, GREEN, RED]
         two_d_axes = Axes(
             x_range=[0, 5, 1],
             y_range=[0, 5, 1],
@@ -73,22 +112,29 @@ class MPCPolytopesScene(Scene):
         # Start transformation animation
         self.play(Transform(three_d_axes, two_d_axes))
 
+        # Embedding scaled into [0.5, 4.5] on both axes, keeping its aspect ratio
+        low = embedding.min(axis=0)
+        tsne_points = 0.5 + 4 * (embedding - low) / (embedding.max(axis=0) - low).max()
+        tsne_positions = [
+            np.array([two_d_axes.c2p(*point) for point in tsne_points[run_cluster == k]])
+            for k in range(len(tsne_colors))
+        ]
         tsne_labels = [
-            MathTex(r"C_1", font_size=30).move_to(polytopes[0].get_center()),
-            MathTex(r"C_2", font_size=30).move_to(polytopes[1].get_center()),
-            MathTex(r"C_3", font_size=30).move_to(polytopes[2].get_center())
+            MathTex(rf"C_{k + 1}", font_size=30).move_to(two_d_axes.c2p(*tsne_points[run_cluster == k].mean(axis=0)))
+            for k in range(len(tsne_colors))
         ]
+        tsne_caption = Text(
+            f"t-SNE of {len(features)} closed-loop runs ({features.shape[1]}-D) started in each region",
+            font_size=18,
+        ).next_to(two_d_axes, DOWN)
 
-        for polytope, color, color_dots in zip(polytopes, tsne_colors, [blue_dots, green_dots, red_dots]):
-            # Get the center of the polytope
-            polytope_center = polytope.get_center()
-
-            # Corresponding t-SNE cluster around the polytope center
-            tsne_cluster = VGroup(*[Dot(color=color).move_to(polytope_center + 0.6 * RIGHT*np.random.normal() + 0.6 * UP*np.random.normal()) for _ in range(10)])
-            self.play(Transform(color_dots, tsne_cluster))
+        for polytope, label, color_dots, positions, tsne_label in zip(
+                polytopes, polytope_labels, cluster_dots, tsne_positions, tsne_labels):
+            self.play(MovePointSet(color_dots, positions))
             self.play(FadeOut(polytope))
-            self.play(Transform(polytope_labels[tsne_colors.index(color)], tsne_labels[tsne_colors.index(color)]))
+            self.play(Transform(label, tsne_label))
             self.wait(1)
+        self.play(Write(tsne_caption))
 
 # To render this scene, use the following command in your terminal:
 # manim -pql script_name.py MPCPolytopesScene
@@ -1,19 +1,23 @@
 from manim import *
 import numpy as np
-from PIL import Image
 from manim_ml.neural_network import NeuralNetwork, FeedForwardLayer, Convolutional2DLayer, ImageLayer
 
+from image_cache import downsampled_image
+from nn_model import get_model
+
 # Make nn
 class NN(ThreeDScene):
     CONFIG = {
         "camera_config": {
             "frame_height": 5.625,
             "frame_width": 7.5,
-            "disable_caching": True,
         }
     }
 
     def construct(self):
+        # Manim CE ignores CONFIG; the per-animation cache is turned off here instead
+        config.disable_caching = True
+
         def make_forward_pass_until_encoder(self, stop_at_layer_index, **kwargs):
             animations = []
             for i, layer in enumerate(self.input_layers):
@@ -37,8 +41,8 @@ class NN(ThreeDScene):
         self.add(title)
         self.wait(1)
 
-        image = Image.open("multipleInputs.png") 
-        numpy_image = np.asarray(image)
+        # Only as many pixel rows as 2.5 units cover at the render resolution
+        numpy_image = downsampled_image("multipleInputs.png", 2.5, config.pixel_height / config.frame_height)
 
         nn = NeuralNetwork([
             ImageLayer(numpy_image, height=2.5),
@@ -72,6 +76,19 @@ class NN(ThreeDScene):
         forward_pass_animation = make_forward_pass_until_encoder(nn, encoder_index)
         self.play(forward_pass_animation)
 
+        # Color every node by its mean activation magnitude over a batch of double integrator states
+        states = np.random.default_rng(0).uniform(-1, 1, (256, 2))
+        activations = get_model().forward(states)
+        node_colors = []
+        for layer, activation in zip(nn.input_layers[1:], activations):
+            magnitude = np.abs(activation).mean(axis=0)
+            magnitude /= max(magnitude.max(), 1e-12)
+            node_colors.extend(
+                node.animate.set_fill(interpolate_color(BLUE_E, YELLOW, t), opacity=1)
+                for node, t in zip(layer.node_group, magnitude)
+            )
+        self.play(*node_colors)
+
         self.wait(2)
 
         # Position where the arrow will start (middle layer)
@@ -1,10 +1,27 @@
 from manim import *
 import numpy as np
 
+from gradient_background import GradientField
+from ipm_trace import load_trace
+from screening import load_benchmark
+
+
+def mu_tex(mu):
+    # mu in scientific notation, e.g. 1.2 \times 10^{-4}
+    mantissa, exponent = f"{mu:.1e}".split("e")
+    if int(exponent) == 0:
+        return rf"\mu = {mantissa}"
+    return rf"\mu = {mantissa} \times 10^{{{int(exponent)}}}"
+
 # Manim Scene
 class OptimizationScene(Scene):
 
     def construct(self):
+        # Iterates of the interior-point method, with all constraints and with the tight ones only
+        runs = load_trace()
+        full, reduced = runs["full"], runs["reduced"]
+        x_opt = full["x"][-1]
+
         title = Text("Improving Computational Efficiency", color=WHITE).scale(0.75).to_edge(UP)
 
         # Displaying the optimization problem
@@ -76,7 +93,7 @@ class OptimizationScene(Scene):
         ]
 
         # Optimal point
-        optimal_point = Dot(axes.c2p(1.186, -2.593), color=GOLD)
+        optimal_point = Dot(axes.c2p(*x_opt), color=GOLD)
         optimal_label = Text("Optimal Point", color=GOLD).next_to(optimal_point, LEFT).scale(0.4)
 
         # Group everything related to the graph
@@ -103,19 +120,9 @@ class OptimizationScene(Scene):
         self.add(IPM_description)
         self.wait(7)
         self.play(FadeOut(optimization_problem), FadeOut(primal_dual_formulation), FadeOut(IPM_description), FadeOut(title))
-        # Gradient for cost function min x_2
-        gradient_start = -5  # Start value of x_2
-        gradient_end = 7     # End value of x_2
-        num_rects = 100       # Number of rectangles to use for the gradient
-        for i in range(num_rects):
-            x2_val = gradient_start + (gradient_end - gradient_start) * i / num_rects
-            color_val = interpolate_color(BLUE, ORANGE, i / num_rects)  # Gradation from RED to GREEN
-            rect = Rectangle(
-                width=6, height=(gradient_end - gradient_start) / num_rects,
-                fill_color=color_val, fill_opacity=0.1, stroke_width=0
-            )
-            rect.move_to(axes.c2p(0, x2_val))
-            self.add(rect)
+        # Gradient for cost function min x_2, as one image over the axes
+        cost_gradient = GradientField(axes, lambda x1, x2: x2, colors=(BLUE, ORANGE), opacity=0.1, resolution=(16, 256))
+        self.add(cost_gradient)
         self.play(Create(axes), Write(x_label), Write(y_label))
         for constraint, label in zip(constraints, constraint_labels):
             self.play(Create(constraint), Write(label))
@@ -140,26 +147,33 @@ class OptimizationScene(Scene):
         self.add(explanation_1)
         self.wait(4)
 
-        # Solver's path
+        # Solver's path, one corner per iterate
         path = VMobject(color=BLUE_B)
-        path_start = axes.coords_to_point(0, 0)  # Starting point
-        path_mid = axes.coords_to_point(1.25, 0)  # Midpoint
-        path_end = axes.coords_to_point(1.186, -2.593)  # Ending point
-        path.set_points_as_corners([path_start, path_mid, path_end])
+        path.set_points_as_corners([axes.c2p(*x) for x in full["x"]])
         path_label = Text("Central Path", color=BLUE_B).next_to(path, RIGHT).scale(0.5)
-        
-        # Create dots for mu values
-        dot_mu_greater_1 = Dot(path_start, color=YELLOW)
-        dot_mu_0_to_1 = Dot(path_mid, color=ORANGE)
-        dot_mu_0 = Dot(path_end, color=RED)
-        
+
+        # Iterate dots colored by log(mu), from the first iterate (YELLOW) to the last (RED)
+        log_mu = np.log10(full["mu"])
+        shades = (log_mu[0] - log_mu) / (log_mu[0] - log_mu[-1])
+        iterate_dots = VGroup(*[
+            Dot(axes.c2p(*x), radius=0.05, color=interpolate_color(YELLOW, RED, shade))
+            for x, shade in zip(full["x"], shades)
+        ])
+
+        # Dots and labels for the first, a middle and the last iterate
+        mid = int(np.argmin(np.abs(log_mu - 0.5 * (log_mu[0] + log_mu[-1]))))
+        dot_mu_greater_1 = Dot(axes.c2p(*full["x"][0]), color=YELLOW)
+        dot_mu_0_to_1 = Dot(axes.c2p(*full["x"][mid]), color=ORANGE)
+        dot_mu_0 = Dot(axes.c2p(*full["x"][-1]), color=RED)
+
         # Labels for mu values
-        label_mu_greater_1 = MathTex(r"\mu > 1", color=YELLOW).next_to(dot_mu_greater_1, UP+LEFT).scale(0.5)
-        label_mu_0_to_1 = MathTex(r"0 \leq \mu \leq 1", color=ORANGE).next_to(dot_mu_0_to_1, UP).scale(0.5)
-        label_mu_0 = MathTex(r"\mu = 0", color=RED).next_to(dot_mu_0, RIGHT).scale(0.5)
-        
+        label_mu_greater_1 = MathTex(mu_tex(full["mu"][0]), color=YELLOW).next_to(dot_mu_greater_1, UP+LEFT).scale(0.5)
+        label_mu_0_to_1 = MathTex(mu_tex(full["mu"][mid]), color=ORANGE).next_to(dot_mu_0_to_1, RIGHT).scale(0.5)
+        label_mu_0 = MathTex(mu_tex(full["mu"][-1]), color=RED).next_to(dot_mu_0, RIGHT).scale(0.5)
+
         # Add path and labels to scene
         self.play(Create(path), Write(path_label), run_time=4)
+        self.play(FadeIn(iterate_dots))
         self.add(dot_mu_greater_1, label_mu_greater_1)
         self.add(dot_mu_0_to_1, label_mu_0_to_1)
         self.add(dot_mu_0, label_mu_0)
@@ -177,10 +191,38 @@ class OptimizationScene(Scene):
 
         self.play(Transform(explanation, explanation_text_2))
 
-        # New path of the solver
+        # New path of the solver, recorded with the tight constraints only
         new_path = VMobject(color=BLUE_B)
-        new_path.set_points_as_corners([axes.coords_to_point(0, 0), axes.coords_to_point(1.186, -2.593)])
-        self.play(Transform(path, new_path), run_time=4)
+        new_path.set_points_as_corners([axes.c2p(*x) for x in reduced["x"]])
+        new_dots = VGroup(*[Dot(axes.c2p(*x), radius=0.05, color=BLUE_B) for x in reduced["x"]])
+        self.play(Transform(path, new_path), Transform(iterate_dots, new_dots), run_time=4)
+
+        # Measured KKT size, iterations and time of both runs
+        comparison = VGroup(*[
+            Text(
+                f"{name}: {run['kkt_size']}x{run['kkt_size']} KKT system, "
+                f"{len(run['mu']) - 1} iterations, {1e3 * run['iteration_time'].sum():.1f} ms",
+                color=color,
+            ).scale(0.35)
+            for name, run, color in (("All constraints", full, RED), ("Tight constraints", reduced, BLUE))
+        ]).arrange(DOWN, aligned_edge=LEFT).next_to(explanation, DOWN)
+        self.play(FadeIn(comparison))
+        self.wait(2)
+
+        # Measured gains of screening on powered descent instances
+        # Written by render_all before rendering; a cold cache runs ~120 LCvx
+        # solves here (about 7 s) and warns
+        screening = load_benchmark()
+        screening_text = Text(
+            f"Powered descent, N = {screening['N']}, {screening['instances']} instances:\n"
+            f"KKT system {screening['full_kkt_size']} -> {screening['screened_kkt_size']:.0f} rows, "
+            f"{screening['full_iterations']:.1f} -> {screening['screened_iterations']:.1f} iterations,\n"
+            f"{screening['speedup']:.2f}x median speedup, "
+            f"{100 * screening['add_back_rate']:.0f}% needed add-back, "
+            f"{100 * screening['fallback_rate']:.0f}% fell back to all constraints",
+            t2c={f"{screening['speedup']:.2f}x": GREEN},
+        ).scale(0.3).next_to(comparison, DOWN, aligned_edge=LEFT)
+        self.play(FadeIn(screening_text))
 
 
         self.wait(7)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Row annotations for multi-row equations that are built once and recolored in place.
+
+A walkthrough that highlights different rows of an equation only needs one
+label per row. Each highlight step is a color-only animation, so no new
+Text objects are created per step.
+
+    annotations = EquationAnnotations(lcvs_eq, LCVX_ROW_LABELS, groups=LCVX_ROW_GROUPS)
+    annotations.set_colors("cost", color=BLUE)
+    self.play(FadeIn(annotations))
+    self.play(annotations.highlight(["kinematics", "dynamics", "mass"], color=YELLOW))
+"""
+from manim import *
+
+from mobject_cache import cached_text
+
+
+class Recolor(Animation):
+    """
+    Interpolates the color of a mobject without touching its points.
+    """
+
+    def __init__(self, mobject, color, **kwargs):
+        self.target_color = color
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.start_color = self.mobject.get_color()
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_color(interpolate_color(self.start_color, self.target_color, self.rate_func(alpha)))
+
+
+class EquationAnnotations(VGroup):
+    """
+    One label per equation row, placed to the left of the row.
+
+    labels can be strings (built as cached Text) or mobjects. groups maps
+    names to lists of row indices so highlight steps can refer to
+    e.g. "dynamics" instead of row numbers.
+    """
+
+    def __init__(self, equation, labels, groups=None, base_color=GRAY, font_size=20, direction=LEFT, **kwargs):
+        self.equation = equation
+        self.groups = dict(groups or {})
+        self.base_color = base_color
+        rows = []
+        for row, label in zip(equation, labels):
+            if isinstance(label, str):
+                label = cached_text(label, font_size=font_size, color=base_color)
+            rows.append(label.next_to(row, direction))
+        super().__init__(*rows, **kwargs)
+
+    def rows(self, *targets):
+        """
+        Resolves group names and row indices (or lists of them) into row indices.
+        """
+        indices = []
+        for target in targets:
+            if isinstance(target, (list, tuple, set)):
+                indices.extend(self.rows(*target))
+            elif isinstance(target, str):
+                indices.extend(self.groups[target])
+            else:
+                indices.append(int(target))
+        return sorted(set(indices))
+
+    def set_colors(self, *targets, color):
+        for i in self.rows(*targets):
+            self[i].set_color(color)
+        return self
+
+    def highlight(self, *targets, color=YELLOW, **kwargs):
+        """
+        Returns a color-only animation that colors the target rows and resets all other rows to the base color.
+        """
+        selected = set(self.rows(*targets))
+        animations = [
+            Recolor(label, color if i in selected else self.base_color)
+            for i, label in enumerate(self)
+        ]
+        return AnimationGroup(*animations, **kwargs)
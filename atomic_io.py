@@ -0,0 +1,54 @@
+"""
+Atomic file writes for the caches under media/cache.
+
+Several renders can run at once (render_all starts one manim process per
+scene), so a cache file must never be seen half written. write_atomic
+writes to a temporary file in the target's directory and renames it over
+the target, which replaces it in one step. If writing fails the temporary
+file is removed and the error is raised.
+
+load_json reads results that a tool stores as JSON (the screening and
+explicit MPC benchmarks). render_all writes them before the renders start.
+When one is missing anyway it is computed where it is needed, with a
+warning naming the command that writes it ahead of time.
+
+    write_atomic(path, lambda f: np.save(f, pixels))
+    results = load_json(BENCHMARK_PATH, write_benchmark, "python screening.py")
+"""
+import json
+import os
+import tempfile
+import warnings
+
+
+def write_atomic(path, write, mode="wb"):
+    """
+    Calls write(f) on a temporary file opened with mode and moves it to path.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json(path, data):
+    write_atomic(path, lambda f: json.dump(data, f, indent=2), mode="w")
+
+
+def load_json(path, write, command):
+    """
+    The JSON stored at path, calling write(path) first if the file does not exist.
+    """
+    if not os.path.exists(path):
+        warnings.warn(f"{os.path.relpath(path)} is missing and is computed now, "
+                      f"run `{command}` to write it ahead of time", stacklevel=3)
+        write(path)
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,332 @@
+"""
+Reproducible timings of the scenes and of the numeric code behind them.
+
+Three suites, each timed --repeats times after a warm-up:
+
+    kernels     the NumPy/SciPy work alone, with fixed seeds and the sizes
+                the scenes use: the diffusion forward and reverse loops,
+                the KDE curve of the histogram plots, the scipy.stats
+                curves of the multimodal scenes and the divert arc
+                sampling of Motivation
+    construct   every scene's construct() in-process with animations
+                skipped and nothing written, i.e. building the mobject graph
+    render      a full low-quality render of every scene in its own manim
+                process, --render-repeats times (these are slow)
+
+Each timing of a kernel loops over as many calls as fill 0.2 s, like
+timeit's autorange, so sub-millisecond kernels are not timed one call at
+a time. The fastest timing (min) is what gets compared.
+
+Results are written as JSON. --compare reads an earlier file and flags every
+benchmark whose min got slower by more than --threshold, exiting with
+status 1 if there is any. A slowdown only counts if it is also larger than
+--min-delta seconds and than the spread (max - min) of either run, so
+timing noise on a fast kernel or a render is not reported:
+
+    $ python benchmarks.py --save media/benchmarks/baseline.json
+    $ python benchmarks.py --compare media/benchmarks/baseline.json --threshold 0.1
+    $ python benchmarks.py -s kernels -s construct IntroScene
+
+Caches that would hide the work are turned off: section caching for both
+scene suites and manim's animation cache for the renders. The kernel suite
+needs only NumPy and SciPy.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+
+import scene_registry
+
+BENCHMARK_DIR = os.path.join(scene_registry.REPO_DIR, "media", "benchmarks")
+SUITES = ("kernels", "construct", "render")
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_MIN_DELTA = 2e-5
+
+
+def time_call(function, repeats=5):
+    """
+    Times repeats loops of function after a warm-up and returns statistics of
+    the time per call in seconds. Each loop makes as many calls as fill 0.2 s
+    (one for anything slower), found while warming up.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeats, number)]
+    return dict(median=statistics.median(times), min=min(times), max=max(times), repeats=repeats, number=number)
+
+
+def _divert_arcs(num_arcs):
+    from trajectory_path import ArcPath
+
+    up, right, down = np.array([0.0, 1, 0]), np.array([1.0, 0, 0]), np.array([0.0, -1, 0])
+    start = 3 * up + 1.75 * right
+    return [
+        ArcPath(start, 2 * right + 2 * up + 0.01 * n * (right + down),
+                2 * right + 0.01 * n * (right + down), arc_angle=-np.pi / 4)
+        for n in np.linspace(5, 500, num_arcs)
+    ]
+
+
+def kernel_diffusion_forward():
+    """
+    The forward loop of the diffusion scene: 30 dots through the animated steps of T = 1000,
+    then the full float32 history of 100 trajectories.
+    """
+    from diffusion import ForwardDiffusion
+
+    forward = ForwardDiffusion.from_schedule("constant", 1000, beta=0.03)
+    x0 = np.random.default_rng(0).standard_normal((30, 2))
+    batch = np.broadcast_to(x0, (100, 30, 2))
+    animate_steps = sorted({1, 2, 3, 10, 50, 100, 500, 1000})
+
+    def run():
+        rng = np.random.default_rng(0)
+        x, prev_t = x0, 0
+        for t in animate_steps:
+            if t - 1 > prev_t:
+                x = forward.transition(x, prev_t, t - 1, rng)
+            _, x = forward.step(x, t, rng)
+            prev_t = t
+        forward.trajectory(batch, rng)
+    return run
+
+
+def kernel_diffusion_reverse():
+    """
+    Reverse sampling of 1000 trajectories from the bimodal target of the diffusion scene.
+    """
+    from diffusion import ForwardDiffusion, GaussianMixtureScore, ReverseSampler
+
+    forward = ForwardDiffusion.from_schedule("constant", 1000, beta=0.03)
+    x0 = np.random.default_rng(0).standard_normal((30, 2))
+    modes = np.stack([x0, x0 * np.array([-1.0, 1.0])])
+    sampler = ReverseSampler(forward, GaussianMixtureScore(forward, modes, sigmas=0.25, weights=[0.5, 0.5]))
+    record = {t - 1 for t in (1, 2, 3, 10, 50, 100, 500, 1000)}
+
+    def run():
+        rng = np.random.default_rng(0)
+        sampler.sample(rng.standard_normal((1000, 30, 2)), rng=rng, record=record)
+    return run
+
+
+def kernel_kde_plot():
+    """
+    The KDE curve of the diffusion histograms over 10,000 samples, built and
+    evaluated at 200 plot points.
+    """
+    from kde import BinnedKDE
+
+    samples = np.random.default_rng(0).standard_normal(10000)
+    xs = np.linspace(-4, 4, 200)
+
+    def run():
+        kde = BinnedKDE(samples, x_range=(-4, 4))
+        len(samples) * kde(xs)
+    return run
+
+
+def kernel_curve_plot():
+    """
+    The adaptively sampled scipy.stats bimodal density of multimodalproblem.py.
+    """
+    from scipy import stats
+
+    from fast_plot import sample_function
+
+    def bimodal_pdf(x):
+        return 0.5 * stats.norm.pdf(x, loc=-2.0, scale=0.25) + 0.5 * stats.norm.pdf(x, loc=2.0, scale=0.25)
+
+    def run():
+        sample_function(bimodal_pdf, -4, 4, tolerance=0.005, y_scale=5 / 6)
+    return run
+
+
+def kernel_path_sampling():
+    """
+    The divert arcs of Motivation's constraint sweep: dot positions and Bezier points for 100 arcs.
+    """
+    arcs = _divert_arcs(100)
+    alphas = np.arange(100) / 100
+
+    def run():
+        for arc in arcs:
+            arc.points(alphas)
+            arc.bezier_points()
+    return run
+
+
+KERNELS = {
+    "diffusion_forward": kernel_diffusion_forward,
+    "diffusion_reverse": kernel_diffusion_reverse,
+    "kde_plot": kernel_kde_plot,
+    "curve_plot": kernel_curve_plot,
+    "path_sampling": kernel_path_sampling,
+}
+
+
+def construct_scene(scene_class):
+    """
+    Runs construct() of scene_class with animations skipped and no files written.
+    """
+    from manim import tempconfig
+
+    import section_cache
+
+    settings = {"quality": "low_quality", "dry_run": True, "disable_caching": True, "preview": False}
+    sections_enabled, section_cache.ENABLED = section_cache.ENABLED, False
+    try:
+        with tempconfig(settings):
+            scene_class(skip_animations=True).render()
+    finally:
+        section_cache.ENABLED = sections_enabled
+
+
+def run_kernels(names=None, repeats=5):
+    results = {}
+    for name, setup in KERNELS.items():
+        if names and name not in names:
+            continue
+        results[f"kernels:{name}"] = time_call(setup(), repeats)
+        print(f"kernels:{name:38s} {results[f'kernels:{name}']['min'] * 1e3:10.3f} ms", flush=True)
+    return results
+
+
+def run_construct(entries, repeats=5):
+    from render_all import precompute
+
+    precompute(entries)
+    results = {}
+    for entry in entries:
+        try:
+            scene_class = scene_registry.load_scene_class(entry)
+            results[f"construct:{entry.key}"] = time_call(lambda: construct_scene(scene_class), repeats)
+        except Exception as e:
+            print(f"construct:{entry.key:36s} failed: {e}", flush=True)
+            continue
+        print(f"construct:{entry.key:36s} {results[f'construct:{entry.key}']['min']:10.2f} s", flush=True)
+    return results
+
+
+def run_render(entries, repeats=3):
+    from render_all import precompute, render_scene
+
+    precompute(entries)
+    results = {}
+    # The manim processes inherit this, see section_cache
+    os.environ["MANIM_TRAJOPT_SECTIONS"] = "0"
+    for entry in entries:
+        times = []
+        for _ in range(repeats):
+            returncode, seconds = render_scene(entry, "l", ["--disable_caching"])
+            if returncode:
+                break
+            times.append(seconds)
+        if returncode:
+            print(f"render:{entry.key:39s} failed (exit {returncode})", flush=True)
+            continue
+        results[f"render:{entry.key}"] = dict(median=statistics.median(times), min=min(times), max=max(times),
+                                              repeats=repeats, number=1)
+        print(f"render:{entry.key:39s} {min(times):10.2f} s", flush=True)
+    return results
+
+
+def environment():
+    return dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        machine=platform.machine(),
+        processor=platform.processor(),
+        cpus=os.cpu_count(),
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+    )
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Returns (name, old, new, ratio) of the min times for every benchmark in both
+    runs, and the names that got slower by more than threshold (relative),
+    min_delta (seconds) and the spread of either run.
+    """
+    rows, regressions = [], []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["min"], result["min"]
+        ratio = new / old if old > 0 else float("inf")
+        rows.append((name, old, new, ratio))
+        noise = max(baseline[name]["max"] - old, result["max"] - new, min_delta)
+        if ratio > 1 + threshold and new - old > noise:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the scenes and their numeric kernels.")
+    parser.add_argument("scenes", nargs="*", help="scene keys or class names for the scene suites (default: all)")
+    parser.add_argument("-s", "--suite", action="append", choices=SUITES,
+                        help="suite to run, repeatable (default: all)")
+    parser.add_argument("-k", "--kernel", action="append", choices=sorted(KERNELS), help="only these kernels")
+    parser.add_argument("-n", "--repeats", type=int, default=5, help="timed loops per kernel and construct")
+    parser.add_argument("--render-repeats", type=int, default=3, help="renders per scene")
+    parser.add_argument("--save", default=os.path.join(BENCHMARK_DIR, "latest.json"), help="where to write the results")
+    parser.add_argument("--compare", default=None, help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default: 0.1)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="smallest slowdown in seconds that counts as a regression (default: 2e-5)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    suites = args.suite or SUITES
+    entries = scene_registry.discover()
+    try:
+        entries = [scene_registry.find(name, entries) for name in args.scenes] if args.scenes else entries
+    except KeyError as e:
+        parser.error(e.args[0])
+    runnable = []
+    if "construct" in suites or "render" in suites:
+        for entry in entries:
+            missing = entry.missing_dependencies()
+            if missing:
+                print(f"{entry.key:45s} skipped (missing {', '.join(missing)})")
+            else:
+                runnable.append(entry)
+
+    results = {}
+    if "kernels" in suites:
+        results.update(run_kernels(args.kernel, args.repeats))
+    if "construct" in suites:
+        results.update(run_construct(runnable, args.repeats))
+    if "render" in suites:
+        results.update(run_render(runnable, args.render_repeats))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+    with open(args.save, "w") as f:
+        json.dump(dict(environment=environment(), results=results), f, indent=2, sort_keys=True)
+    print(f"results -> {args.save}")
+
+    if baseline is None:
+        return 0
+    rows, regressions = compare(baseline, results, args.threshold, args.min_delta)
+    for name, old, new, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:47s} {old * 1e3:10.3f} ms -> {new * 1e3:10.3f} ms  {ratio - 1:+7.1%}{flag}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Forward (noising) process of a DDPM-style diffusion model.
+
+    x_t = sqrt(1 - beta_t) x_{t-1} + sqrt(beta_t) eps,    eps ~ N(0, I)
+
+With alpha_bar_t = prod_{s<=t} (1 - beta_s) the marginal is closed form,
+
+    q(x_t | x_0) = N(sqrt(alpha_bar_t) x_0, (1 - alpha_bar_t) I),
+
+and so is q(x_t | x_s) for any s < t, so any set of steps can be sampled
+as one consistent chain without visiting the steps in between. When the
+whole history is needed it is written chunk by chunk into a single
+preallocated (T+1, N, d) float32 array, optionally memory mapped.
+"""
+import numpy as np
+
+
+def beta_schedule(kind, T, beta=0.03, beta_start=1e-4, beta_end=0.02, s=0.008, max_beta=0.999):
+    """
+    Returns beta_1 ... beta_T for a "constant", "linear" or "cosine" schedule.
+    """
+    if kind == "constant":
+        return np.full(T, beta, dtype=np.float64)
+    if kind == "linear":
+        return np.linspace(beta_start, beta_end, T, dtype=np.float64)
+    if kind == "cosine":
+        # Nichol & Dhariwal (2021)
+        steps = np.arange(T + 1, dtype=np.float64) / T
+        f = np.cos((steps + s) / (1 + s) * np.pi / 2) ** 2
+        alpha_bars = f / f[0]
+        return np.clip(1 - alpha_bars[1:] / alpha_bars[:-1], 0.0, max_beta)
+    raise ValueError(f"Unknown beta schedule {kind!r}")
+
+
+class ForwardDiffusion:
+    """
+    Closed-form forward process for a given beta schedule.
+    Step indices follow the paper: t = 0 is the data, t = T is (nearly) pure noise.
+    """
+
+    def __init__(self, betas):
+        self.betas = np.asarray(betas, dtype=np.float64)
+        self.T = len(self.betas)
+        # log alpha_bar_t for t = 0 ... T, kept in log space so long schedules do not underflow
+        self.log_alpha_bars = np.concatenate([[0.0], np.cumsum(np.log1p(-self.betas))])
+        self.alpha_bars = np.exp(self.log_alpha_bars)
+
+    @classmethod
+    def from_schedule(cls, kind, T, **kwargs):
+        return cls(beta_schedule(kind, T, **kwargs))
+
+    def _noise(self, shape, rng):
+        if rng is None:
+            rng = np.random.default_rng()
+        return rng.standard_normal(shape)
+
+    def transition(self, x_s, s, t, rng=None):
+        """
+        Samples x_t ~ q(x_t | x_s) for s <= t in one jump.
+        """
+        if t == s:
+            return np.array(x_s, dtype=np.float64)
+        log_ratio = self.log_alpha_bars[t] - self.log_alpha_bars[s]
+        eps = self._noise(np.shape(x_s), rng)
+        return np.exp(0.5 * log_ratio) * x_s + np.sqrt(-np.expm1(log_ratio)) * eps
+
+    def marginal(self, x0, t, rng=None):
+        """
+        Samples x_t ~ q(x_t | x_0).
+        """
+        return self.transition(x0, 0, t, rng)
+
+    def step(self, x_prev, t, rng=None):
+        """
+        Takes the single step t-1 -> t and returns (scaled, x_t) so the scale
+        and noise parts can be shown separately.
+        """
+        beta = self.betas[t - 1]
+        scaled = np.sqrt(1 - beta) * np.asarray(x_prev, dtype=np.float64)
+        return scaled, scaled + np.sqrt(beta) * self._noise(scaled.shape, rng)
+
+    def sample_steps(self, x0, steps, rng=None):
+        """
+        Samples one chain x_0 -> x_T at the requested steps only.
+        Returns a dict {t: x_t} that also contains t = 0.
+        """
+        states = {0: np.array(x0, dtype=np.float64)}
+        x, s = states[0], 0
+        for t in sorted(set(steps)):
+            x = self.transition(x, s, t, rng)
+            states[t], s = x, t
+        return states
+
+    def _chunks(self, max_chunk, max_log_decay):
+        """
+        Splits 1 ... T into chunks short enough that alpha_bar does not change
+        by more than exp(max_log_decay) inside a chunk.
+        """
+        t0 = 0
+        while t0 < self.T:
+            limit = self.log_alpha_bars[t0] - max_log_decay
+            # log_alpha_bars is non-increasing
+            t1 = int(np.searchsorted(-self.log_alpha_bars, -limit, side="right")) - 1
+            t1 = min(max(t1, t0 + 1), t0 + max_chunk, self.T)
+            yield t0, t1
+            t0 = t1
+
+    def trajectory(self, x0, rng=None, out=None, memmap_path=None, dtype=np.float32,
+                   max_chunk=256, max_log_decay=40.0):
+        """
+        Samples the full history x_0 ... x_T into one (T+1, N, d) array.
+
+        Inside each chunk the recursion is solved in closed form with a single
+        cumulative sum: x_{t0+k} = sqrt(a_k) (x_{t0} + sum_{j<=k} sqrt(beta_j / a_j) eps_j),
+        with a_k the alpha product since t0. Pass memmap_path to back the
+        array with a .npy file on disk instead of memory.
+        """
+        x0 = np.asarray(x0, dtype=np.float64)
+        shape = (self.T + 1,) + x0.shape
+        if out is None:
+            if memmap_path is not None:
+                out = np.lib.format.open_memmap(memmap_path, mode="w+", dtype=dtype, shape=shape)
+            else:
+                out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+        if rng is None:
+            rng = np.random.default_rng()
+
+        out[0] = x0
+        x = x0
+        for t0, t1 in self._chunks(max_chunk, max_log_decay):
+            log_a = self.log_alpha_bars[t0 + 1:t1 + 1] - self.log_alpha_bars[t0]
+            coeff = np.sqrt(self.betas[t0:t1]) * np.exp(-0.5 * log_a)
+            eps = rng.standard_normal((t1 - t0,) + x0.shape)
+            eps *= coeff.reshape((-1,) + (1,) * x0.ndim)
+            np.cumsum(eps, axis=0, out=eps)
+            eps += x
+            eps *= np.exp(0.5 * log_a).reshape((-1,) + (1,) * x0.ndim)
+            out[t0 + 1:t1 + 1] = eps
+            x = eps[-1]
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+
+class GaussianMixtureScore:
+    """
+    Analytic noise prediction for data drawn from an isotropic Gaussian mixture.
+
+    Each component k is N(means[k], sigmas[k]^2 I) over a whole sample, e.g.
+    an entire (N, 2) trajectory. Under the forward process component k stays
+    Gaussian with mean sqrt(alpha_bar_t) means[k] and variance
+    alpha_bar_t sigmas[k]^2 + 1 - alpha_bar_t, so the exact score of p_t is
+    available in closed form.
+    """
+
+    def __init__(self, forward, means, sigmas=0.25, weights=None):
+        self.forward = forward
+        self.means = np.asarray(means, dtype=np.float64)
+        self.sample_shape = self.means.shape[1:]
+        k = len(self.means)
+        self.sigmas = np.broadcast_to(np.asarray(sigmas, dtype=np.float64), (k,))
+        weights = np.full(k, 1.0 / k) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.log_weights = np.log(weights / weights.sum())
+        self._flat_means = self.means.reshape(k, -1)
+        self._mean_sq = np.einsum("kd,kd->k", self._flat_means, self._flat_means)
+
+    def score(self, x, t):
+        """
+        Returns grad_x log p_t(x) for a batch x of shape (B, *sample_shape).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        flat = x.reshape(len(x), -1)
+        dim = flat.shape[1]
+        alpha_bar = self.forward.alpha_bars[t]
+        scale = np.sqrt(alpha_bar)
+        var = alpha_bar * self.sigmas ** 2 + (1 - alpha_bar)
+
+        # ||x - m_k||^2 for every sample and component with one matrix product
+        sq_dist = (np.einsum("bd,bd->b", flat, flat)[:, None]
+                   - 2 * scale * flat @ self._flat_means.T
+                   + alpha_bar * self._mean_sq[None, :])
+        log_resp = self.log_weights - 0.5 * dim * np.log(var) - 0.5 * sq_dist / var
+        log_resp -= log_resp.max(axis=1, keepdims=True)
+        resp = np.exp(log_resp)
+        resp /= resp.sum(axis=1, keepdims=True)
+
+        weighted = resp / var
+        score = scale * weighted @ self._flat_means - weighted.sum(axis=1, keepdims=True) * flat
+        return score.reshape(x.shape)
+
+    def __call__(self, x, t):
+        # Noise prediction: eps = -sqrt(1 - alpha_bar_t) * score
+        return -np.sqrt(1 - self.forward.alpha_bars[t]) * self.score(x, t)
+
+    def sample(self, num_samples, rng=None):
+        """
+        Draws clean samples x_0 from the mixture.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        k = rng.choice(len(self.means), size=num_samples, p=np.exp(self.log_weights))
+        noise = rng.standard_normal((num_samples,) + self.sample_shape)
+        return self.means[k] + self.sigmas[k].reshape((-1,) + (1,) * len(self.sample_shape)) * noise
+
+
+class ReverseSampler:
+    """
+    Batched reverse process for a ForwardDiffusion.
+
+    denoiser(x, t) predicts the noise eps for a batch x_t; GaussianMixtureScore
+    is an exact one, a trained network can be plugged in the same way.
+    eta = 1 over every step is ancestral DDPM sampling, fewer steps or
+    eta = 0 give DDIM sampling (Song et al., 2021).
+    """
+
+    def __init__(self, forward, denoiser):
+        self.forward = forward
+        self.denoiser = denoiser
+
+    def timesteps(self, num_steps=None):
+        """
+        Returns the decreasing steps T ... 0 visited by the sampler.
+        """
+        T = self.forward.T
+        if num_steps is None or num_steps >= T:
+            return np.arange(T, -1, -1)
+        return np.unique(np.linspace(0, T, num_steps + 1).round().astype(int))[::-1]
+
+    def step(self, x_t, t, s, eta=1.0, rng=None):
+        """
+        Moves a batch from step t to an earlier step s.
+        """
+        log_ab = self.forward.log_alpha_bars
+        eps = self.denoiser(x_t, t)
+        one_minus_t = -np.expm1(log_ab[t])
+        one_minus_s = -np.expm1(log_ab[s])
+        # sqrt(ab_s) * x0_pred, written without dividing by a tiny sqrt(ab_t)
+        mean = np.exp(0.5 * (log_ab[s] - log_ab[t])) * (x_t - np.sqrt(one_minus_t) * eps)
+        sigma = 0.0
+        if eta > 0 and s > 0:
+            sigma = eta * np.sqrt(one_minus_s / one_minus_t * -np.expm1(log_ab[t] - log_ab[s]))
+        x_s = mean + np.sqrt(max(one_minus_s - sigma ** 2, 0.0)) * eps
+        if sigma > 0:
+            if rng is None:
+                rng = np.random.default_rng()
+            x_s += sigma * rng.standard_normal(np.shape(x_t))
+        return x_s
+
+    def sample(self, x_T, num_steps=None, eta=1.0, rng=None, record=()):
+        """
+        Runs the reverse process from x_T (shape (B, *sample_shape)) to x_0.
+
+        Returns (x_0, states) where states maps each step in record that the
+        sampler visits to the whole batch at that step.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        record = set(record)
+        steps = self.timesteps(num_steps)
+        x = np.array(x_T, dtype=np.float64)
+        states = {}
+        if steps[0] in record:
+            states[int(steps[0])] = x.copy()
+        for t, s in zip(steps[:-1], steps[1:]):
+            x = self.step(x, int(t), int(s), eta, rng)
+            if s in record:
+                states[int(s)] = x.copy()
+        return x, states
@@ -1,7 +1,13 @@
 from manim import *
 import numpy as np
 import random
-from scipy.stats import gaussian_kde  # for kernel density estimation
+
+from diffusion import ForwardDiffusion, GaussianMixtureScore, ReverseSampler
+from fast_plot import plot_function
+from kde import BinnedKDE
+from live_histogram import HistogramCounter, LiveHistogram
+from point_cloud import MovePointSet, PointCloud
+from trajectory_path import ArcPath
 
 class Motivation(Scene):
     def construct(self):
@@ -25,22 +31,9 @@ class Motivation(Scene):
         #################################################################
         # 2. Original Trajectory Setup
         #################################################################
-        def curved_path_func(alpha):
-            """
-            Parametric curve.
-            """
-            return utils.paths.path_along_circles(-PI/4, divert_center[0])(
-                start_point[0], end_point[0], alpha
-            )
-
         def discretize(num_dots):
-            dots_vg = VGroup()
-            for i in range(num_dots):
-                alpha = i / num_dots
-                dot_position = curved_path_func(alpha)
-                dot = Dot(dot_position, color=WHITE, radius=0.05)
-                dots_vg.add(dot)
-            return dots_vg
+            arc = ArcPath(start_point, end_point, divert_center, arc_angle=-PI/4)
+            return PointCloud(arc.points(np.arange(num_dots) / num_dots), radii=0.05, colors=WHITE)
 
         # Path parameters
         start_point   = np.array([2.25 * UP + 1 * LEFT])
@@ -57,15 +50,15 @@ class Motivation(Scene):
 
         # Connect them with a line
         line = VMobject(color=YELLOW, stroke_width=3)
-        line.set_points_as_corners([dot.get_center() for dot in dots_vg])
+        line.set_points_as_corners(dots_vg.get_positions())
         self.add(line)
         self.wait(2)
 
         #################################################################
         # 3. Show an Initial Distribution (Histogram + KDE)
         #################################################################
-        positions_pre = [dot.get_center() for dot in dots_vg]
-        initial_x = np.array([p[0] for p in positions_pre])  # x-coords
+        positions_pre = dots_vg.get_positions()
+        initial_x = positions_pre[:, 0]  # x-coords
 
         hist_axes_init = Axes(
             x_range=[-4, 4, 1],
@@ -85,26 +78,18 @@ class Motivation(Scene):
         bin_count = 10
         hist_vals_init, bin_edges_init = np.histogram(initial_x, bins=bin_count, range=(-4,4))
 
-        bar_chart_init = BarChart(
-            values=hist_vals_init,
-            bar_names=[f"{(bin_edges_init[i]+bin_edges_init[i+1]) / 2:.1f}" for i in range(bin_count)],
-            y_range=[0, max(hist_vals_init)+1, 1],
-            y_length=3,
-            x_length=5,
-            bar_colors=[BLUE],
-        )
-        bar_chart_init.move_to(hist_axes_init.c2p(0,4.5))
+        # Same style and scale as the live histogram of section 6
+        bar_chart_init = LiveHistogram(hist_axes_init, bin_edges_init, hist_vals_init)
 
         self.play(Create(bar_chart_init))
         self.wait(2)
 
         # Kernel Density Estimation
-        kde_init = gaussian_kde(initial_x)
-        def kde_init_pdf(x):
-            return kde_init.evaluate(x)[0]
+        kde_init = BinnedKDE(initial_x, x_range=(-4, 4))
 
-        pdf_graph_init = hist_axes_init.plot(
-            lambda x: len(initial_x) * kde_init_pdf([x]),
+        pdf_graph_init = plot_function(
+            hist_axes_init,
+            lambda x: len(initial_x) * kde_init(x),
             x_range=[-4, 4],
             color=RED
         )
@@ -135,13 +120,16 @@ class Motivation(Scene):
         T = 1000
         beta = 0.03
         animate_steps = {1, 2, 3, 10, 50, 100, 500, 1000}  # only animate these
-        scale_factor = np.sqrt(1 - beta)
-        noise_factor = np.sqrt(beta)
-        positions = np.array([dot.get_center() for dot in dots_vg])
+        forward = ForwardDiffusion.from_schedule("constant", T, beta=beta)
+        rng = np.random.default_rng()
+        positions = dots_vg.get_positions()
 
-        # Convert Dot positions to array
-        self.forward_trajectories = []
-        self.forward_trajectories.append(positions.copy())  # store x_0
+        def to_points(xy):
+            return np.column_stack([xy, np.zeros(len(xy))])
+
+        # Only the displayed steps (and the step before each) are sampled,
+        # jumping between them with the closed-form q(x_t | x_s)
+        self.forward_states = {0: positions.copy()}  # store x_0
 
         #################################################################
         # 5. Forward Diffusion Loop
@@ -151,79 +139,65 @@ class Motivation(Scene):
         self.add(info_box)
 
         rep_dot_index = 0
-        for t in range(1, T+1):
-            old_positions = positions.copy()
-
-            # Scale step
-            scaled_positions = old_positions.copy()
-            scaled_positions[:, 0:2] *= scale_factor
-
-            # Then noise step => final
-            eps = np.random.normal(0.0, 1.0, size=(num_dots, 2))
-            final_positions = scaled_positions.copy()
-            final_positions[:, 0:2] += noise_factor * eps
+        prev_t = 0
+        for t in sorted(animate_steps):
+            # Jump to t-1, then take the single step t-1 -> t as scale + noise
+            old_xy = forward.transition(positions[:, 0:2], prev_t, t - 1, rng)
+            scaled_xy, final_xy = forward.step(old_xy, t, rng)
+            old_positions = to_points(old_xy)
+            scaled_positions = to_points(scaled_xy)
+            final_positions = to_points(final_xy)
 
             # Update 'positions'
             positions = final_positions
-            self.forward_trajectories.append(positions.copy())  # store x_t
-
-            if t in animate_steps:
-                # Info Box
-                step_text = Text(f"Forward Step: t={t}", font_size=24)
-                info_box_new = VGroup(step_text).arrange(UP, aligned_edge=RIGHT)
-                info_box_new.to_corner(UP + RIGHT, buff=1.0)
-
-                self.remove(info_box)
-                self.add(info_box_new)
-                info_box = info_box_new
-
-                old_rep = old_positions[rep_dot_index]
-                scaled_rep = scaled_positions[rep_dot_index]
-
-                arrow_noise = Arrow(
-                    start=scaled_rep,
-                    end=final_positions[rep_dot_index]*1.2,
-                    buff=0,
-                    stroke_width=3,
-                    color=RED
-                )
-                self.add(arrow_noise)
-                arrow_scale_label = Text(
-                    f"Scale Δ=({(scaled_rep[0]-old_rep[0]):.2f}, {(scaled_rep[1]-old_rep[1]):.2f})",
-                    font_size=20, color=GREEN
-                ).next_to(info_box_new, DOWN)
-                self.add(arrow_scale_label)
-
-                anims_scale = []
-                for i, dot in enumerate(dots_vg):
-                    anims_scale.append(dot.animate(run_time=1.0).move_to(scaled_positions[i]))
-
-                scaled_line = line.copy()
-                scaled_line.set_points_as_corners(scaled_positions)
-                self.play(*anims_scale, line.animate().become(scaled_line), run_time=1.0)
-
-                arrow_noise_label = Text(
-                    f"Noise Δ=({(final_positions[rep_dot_index,0]-scaled_rep[0]):.2f}, "
-                    f"{(final_positions[rep_dot_index,1]-scaled_rep[1]):.2f})",
-                    font_size=20, color=RED
-                ).next_to(arrow_scale_label, DOWN)
-                self.add(arrow_noise_label)
-
-                anims_noise = []
-                for i, dot in enumerate(dots_vg):
-                    anims_noise.append(dot.animate(run_time=1.0).move_to(final_positions[i]))
-
-                final_line = line.copy()
-                final_line.set_points_as_corners(final_positions)
-                self.play(*anims_noise, line.animate().become(final_line), run_time=1.0)
-
-                self.wait(0.2)
-                self.remove(arrow_scale_label, arrow_noise, arrow_noise_label)
+            self.forward_states[t - 1] = old_positions
+            self.forward_states[t] = final_positions  # store x_t
+            prev_t = t
+
+            # Info Box
+            step_text = Text(f"Forward Step: t={t}", font_size=24)
+            info_box_new = VGroup(step_text).arrange(UP, aligned_edge=RIGHT)
+            info_box_new.to_corner(UP + RIGHT, buff=1.0)
+
+            self.remove(info_box)
+            self.add(info_box_new)
+            info_box = info_box_new
+
+            old_rep = old_positions[rep_dot_index]
+            scaled_rep = scaled_positions[rep_dot_index]
+
+            arrow_noise = Arrow(
+                start=scaled_rep,
+                end=final_positions[rep_dot_index]*1.2,
+                buff=0,
+                stroke_width=3,
+                color=RED
+            )
+            self.add(arrow_noise)
+            arrow_scale_label = Text(
+                f"Scale Δ=({(scaled_rep[0]-old_rep[0]):.2f}, {(scaled_rep[1]-old_rep[1]):.2f})",
+                font_size=20, color=GREEN
+            ).next_to(info_box_new, DOWN)
+            self.add(arrow_scale_label)
+
+            self.play(MovePointSet(dots_vg, scaled_positions, polylines=[line]), run_time=1.0)
+
+            arrow_noise_label = Text(
+                f"Noise Δ=({(final_positions[rep_dot_index,0]-scaled_rep[0]):.2f}, "
+                f"{(final_positions[rep_dot_index,1]-scaled_rep[1]):.2f})",
+                font_size=20, color=RED
+            ).next_to(arrow_scale_label, DOWN)
+            self.add(arrow_noise_label)
+
+            self.play(MovePointSet(dots_vg, final_positions, polylines=[line]), run_time=1.0)
+
+            self.wait(0.2)
+            self.remove(arrow_scale_label, arrow_noise, arrow_noise_label)
 
         self.remove(line, eq_colored)
 
         #################################################################
-        # 6. Show 1D Histogram of final x + Normal PDF
+        # 6. Show the 1D Histogram of x through all steps + Normal PDF
         #################################################################
         final_x = positions[:, 0]
         hist_axes_final = Axes(
@@ -241,17 +215,23 @@ class Motivation(Scene):
 
         self.play(FadeIn(hist_axes_final), FadeIn(hist_label_final))
 
-        hist_vals_final, bin_edges_final = np.histogram(final_x, bins=10, range=(-3,3))
-        bar_chart_final = BarChart(
-            values=hist_vals_final,
-            bar_names=[f"{(bin_edges_final[i]+bin_edges_final[i+1]) / 2:.1f}" for i in range(10)],
-            y_range=[0, max(hist_vals_final)+1, 1],
-            y_length=3,
-            x_length=5,
-            bar_colors=[BLUE],
-        )
-        bar_chart_final.move_to(hist_axes_final.c2p(0,4.5))
-        self.play(Create(bar_chart_final))
+        # The x of every dot diffused 100 times through all T steps, one
+        # histogram redrawn in place per frame at the scale of the 30 dots
+        num_copies = 100
+        x_history = forward.trajectory(np.tile(self.forward_states[0][:, 0], num_copies), rng)
+        bin_edges_final = np.linspace(-3, 3, 11)
+        counter = HistogramCounter(bin_edges_final, x_history[0])
+        live_hist = LiveHistogram(hist_axes_final, bin_edges_final, counter.counts, scale=1 / num_copies)
+
+        step_tracker = ValueTracker(0)
+        step_label = Variable(0, "t", num_decimal_places=0).scale(0.6).next_to(hist_axes_final, RIGHT)
+        step_label.add_updater(lambda v: v.tracker.set_value(step_tracker.get_value()))
+        live_hist.add_updater(lambda h: h.set_counts(counter.update(x_history[int(step_tracker.get_value())])))
+
+        self.play(FadeIn(live_hist), FadeIn(step_label))
+        self.play(step_tracker.animate.set_value(T), run_time=6, rate_func=linear)
+        live_hist.clear_updaters()
+        step_label.clear_updaters()
         self.wait(1)
 
         sample_mean = float(np.mean(final_x))
@@ -260,7 +240,8 @@ class Motivation(Scene):
         def normal_pdf(x):
             return (1.0/(sample_std*np.sqrt(2*np.pi))) * np.exp(-0.5*((x-sample_mean)/sample_std)**2)
 
-        pdf_graph = hist_axes_final.plot(
+        pdf_graph = plot_function(
+            hist_axes_final,
             lambda x: len(final_x)*normal_pdf(x),
             color=GREEN,
             x_range=[-3,3],
@@ -275,11 +256,12 @@ class Motivation(Scene):
         ).next_to(pdf_graph, DOWN, buff=1.0)
         self.play(Write(concluding))
         self.wait(3)
-        self.remove(pdf_graph, bar_chart_final, hist_label_final, hist_axes_final, step_text)
+        self.remove(pdf_graph, live_hist, step_label, hist_label_final, hist_axes_final, step_text)
 
         ############  <<<<  CONTINUATION: BACKWARD PROCESS  >>>>  ############
         ######################################################################
-        # 7. Reverse Process: p(x_{t-1} | x_t). We'll just replay stored states
+        # 7. Reverse Process: p(x_{t-1} | x_t), sampled from noise with the
+        #    exact score of a bimodal trajectory distribution
         ######################################################################
         eq_reverse = MathTex(
         r"x_{t-1} = \mu_\theta(\mathbf{x}_t, t) + \tilde{\beta}_t \boldsymbol{\epsilon},"
@@ -301,42 +283,53 @@ class Motivation(Scene):
 
         # We'll define a new line for the backward animation
         line_rev = VMobject(color=YELLOW, stroke_width=3)
-        line_rev.set_points_as_corners(self.forward_trajectories[-1])  # x_T
+        line_rev.set_points_as_corners(self.forward_states[T])  # x_T
         self.add(line_rev)
 
         # Move all dots to x_T if not already
         # (they should already be at final_positions, but just to be safe)
-        for i, dot in enumerate(dots_vg):
-            dot.move_to(self.forward_trajectories[-1][i])
+        dots_vg.set_positions(self.forward_states[T])
 
         self.wait(0.5)
 
-        # Replay from t=T down to t=0
-        # self.forward_trajectories[t] is the array for step t
-        # We'll do a small annotation for each step
-        for t_rev in range(T, 0, -1):
-            old_pos = self.forward_trajectories[t_rev]
-            new_pos = self.forward_trajectories[t_rev - 1]
-
-            if t_rev in animate_steps:
-
-                # Animate
-                anims = []
-                for i, dot in enumerate(dots_vg):
-                    anims.append(dot.animate(run_time=1.0).move_to(new_pos[i]))
-
-                updated_line = line_rev.copy()
-                updated_line.set_points_as_corners(new_pos)
-                self.play(*anims, line_rev.animate().become(updated_line), run_time=1.0)
-
-                step_lbl = Text(f"Backward Step: t={t_rev-1}", font_size=20, color=BLUE)
-                info_box_new = VGroup(step_lbl).arrange(UP, aligned_edge=RIGHT)
-                info_box_new.to_corner(UP + RIGHT, buff=1.0)
+        # Bimodal target: the original trajectory and its mirror image,
+        # with the same spread as the modes in multimodalproblem.py
+        x0_xy = self.forward_states[0][:, 0:2]
+        modes = np.stack([x0_xy, x0_xy * np.array([-1.0, 1.0])])
+        denoiser = GaussianMixtureScore(forward, modes, sigmas=0.25, weights=[0.5, 0.5])
+        sampler = ReverseSampler(forward, denoiser)
+
+        # Trajectory 0 starts from the displayed x_T, the rest from fresh noise
+        num_samples = 1000
+        x_T = rng.standard_normal((num_samples, num_dots, 2))
+        x_T[0] = self.forward_states[T][:, 0:2]
+        samples, reverse_states = sampler.sample(
+            x_T, rng=rng, record={t - 1 for t in animate_steps}
+        )
 
-                self.remove(info_box)
-                self.add(info_box_new)
-                info_box = info_box_new
-                self.wait(0.4)
+        # Step from t=T down to t=0 along the sampled reverse trajectory
+        # We'll do a small annotation for each step
+        for t_rev in sorted(animate_steps, reverse=True):
+            new_pos = to_points(reverse_states[t_rev - 1][0])
+
+            # Animate
+            self.play(MovePointSet(dots_vg, new_pos, polylines=[line_rev]), run_time=1.0)
+
+            step_lbl = Text(f"Backward Step: t={t_rev-1}", font_size=20, color=BLUE)
+            info_box_new = VGroup(step_lbl).arrange(UP, aligned_edge=RIGHT)
+            info_box_new.to_corner(UP + RIGHT, buff=1.0)
+
+            self.remove(info_box)
+            self.add(info_box_new)
+            info_box = info_box_new
+            self.wait(0.4)
+
+        # Other trajectories sampled from noise cover both modes
+        sampled_lines = VGroup(*[
+            VMobject(color=BLUE, stroke_width=1, stroke_opacity=0.4).set_points_as_corners(to_points(sample))
+            for sample in samples[1:21]
+        ])
+        self.play(Create(sampled_lines), run_time=2.0)
 
         self.wait(10)
         self.remove(reverse_title)
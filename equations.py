@@ -0,0 +1,70 @@
+"""
+Equations shared by several scenes.
+
+Keeping the strings in one place means every scene hits the same
+mobject_cache entry instead of recompiling the LaTeX.
+"""
+from manim import *
+
+from mobject_cache import cached_math_tex
+
+# Lossless convexification of the powered descent guidance problem, one row per constraint family
+LCVX_EQ_STRINGS = (
+    r"\min_{\xi, \mathbf{u}, t_f} \int_{0}^{t_f} \xi(t) dt\\",
+    r"\text{s.t. } \dot{\mathbf{r}}(t) = \mathbf{v}(t)\\",
+    r"\dot{\mathbf{v}}(t) = \mathbf{g} + \mathbf{u}(t) - \boldsymbol{\omega} \times \boldsymbol{\omega} \times \mathbf{r}(t) - 2\boldsymbol{\omega} \times \mathbf{v}(t)\\",
+    r"\dot{z}(t) = -\alpha \xi (t)\\",
+    r"\mu_{\min}(t) [1 - \delta z(t) + \frac{1}{2} \delta z(t)^2] \leq \xi (t)\\",
+    r"\mu_{\max}(t) [1 - \delta z(t)] \geq \xi (t)\\",
+    r"||\mathbf{u}(t)||^2 \leq \xi (t)\\",
+    r"\mathbf{u}(t)^T \hat{\mathbf{e}}_z \geq \xi \cos(\gamma_p)\\",
+    r"\mathbf{H}_{gs}\mathbf{r}(t) \leq h_{gs}\\",
+    r"||\mathbf{v}(t)||^2 \leq v_{\max}\\",
+    r"\ln(m_{\text{dry}}) \leq z(t_f)\\",
+    r"z_0(t) \leq z(t) \leq \ln(m_{\text{wet}} - \alpha \rho_{\min} t)\\",
+    r"\mathbf{r}(0) = \mathbf{r}_0, \mathbf{v}(0) = \mathbf{v}_0, z(0) = \ln(m_{\text{wet}})\\",
+    r"\mathbf{r}(t_f) = \mathbf{v}(t_f) = 0",
+)
+
+LCVX_ROW_LABELS = (
+    "Minimum slack variable cost function",
+    "Kinematic relationship",
+    "Dynamic equation",
+    "Mass dynamics",
+    "Lower bound of thrust-to-weight ratio",
+    "Upper bound of thrust-to-weight ratio",
+    "Control vector magnitude constraint",
+    "Tilt angle constraint",
+    "Glideslope constraint",
+    "Velocity limit",
+    "Dry mass constraint",
+    "Fuel rate constraint",
+    "Initial conditions",
+    "Final conditions",
+)
+
+# Row indices of each constraint family, for EquationAnnotations highlight steps
+LCVX_ROW_GROUPS = {
+    "cost": [0],
+    "kinematics": [1],
+    "dynamics": [2],
+    "mass": [3],
+    "thrust": [4, 5, 6],
+    "tilt": [7],
+    "glideslope": [8],
+    "velocity": [9],
+    "dry_mass": [10],
+    "fuel_rate": [11],
+    "initial": [12],
+    "final": [13],
+    "equations_of_motion": [1, 2, 3],
+    "constraints": [4, 5, 6, 7, 8, 9, 10, 11],
+    "boundary": [12, 13],
+}
+
+
+def lcvx_equation():
+    """
+    Creates the 14-row LCvx MathTex, scaled and placed on the right edge.
+    """
+    return cached_math_tex(*LCVX_EQ_STRINGS).scale(0.6).to_edge(RIGHT)
@@ -0,0 +1,461 @@
+"""
+Explicit MPC for a small linear system, solved as a multi-parametric QP.
+
+The MPC problem for a state x,
+
+    min  sum_{k<N} (x_k^T Q x_k + u_k^T R u_k) + x_N^T P x_N
+    s.t. x_{k+1} = A x_k + B u_k,   u_min <= u_k <= u_max,   x_0 = x,
+
+is condensed into  min_U 1/2 U^T H U + x^T F U  s.t.  G U <= W + S x.
+For every optimal active set the solution is affine in x on a polytope
+(a critical region). ExplicitMPC enumerates the active sets with pruning
+and stores each region as halfspaces with the first input's law
+u = F_i x + g_i. PointLocationTree is a binary search tree over the region
+facets, flattened into arrays so a batch of states descends it with one
+NumPy step per level.
+
+    python explicit_mpc.py        # benchmark, writes media/cache/explicit_mpc.json
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from scipy.linalg import solve_discrete_are
+from scipy.optimize import linprog, minimize
+from scipy.spatial import HalfspaceIntersection
+
+from atomic_io import load_json, write_json
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_PATH = os.path.join(REPO_DIR, "media", "cache", "explicit_mpc.json")
+
+
+class LinearMPC:
+    """
+    Input-constrained MPC of x+ = A x + B u over a horizon of N steps.
+    The terminal cost P defaults to the LQR cost-to-go.
+    """
+
+    def __init__(self, A, B, Q, R, N, u_min, u_max, P=None):
+        self.A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+        self.B = np.atleast_2d(np.asarray(B, dtype=np.float64))
+        self.Q = np.atleast_2d(np.asarray(Q, dtype=np.float64))
+        self.R = np.atleast_2d(np.asarray(R, dtype=np.float64))
+        self.N = int(N)
+        self.nx, self.nu = self.B.shape
+        self.u_min = np.broadcast_to(np.asarray(u_min, dtype=np.float64), (self.nu,))
+        self.u_max = np.broadcast_to(np.asarray(u_max, dtype=np.float64), (self.nu,))
+        self.P = solve_discrete_are(self.A, self.B, self.Q, self.R) if P is None else np.atleast_2d(P)
+        self._condense()
+
+    @classmethod
+    def double_integrator(cls, dt=0.5, N=5, u_max=1.0):
+        """
+        Position and velocity driven by a bounded acceleration.
+        """
+        A = [[1.0, dt], [0.0, 1.0]]
+        B = [[0.5 * dt ** 2], [dt]]
+        return cls(A, B, np.eye(2), [[0.1]], N, -u_max, u_max)
+
+    def _condense(self):
+        nx, nu, N = self.nx, self.nu, self.N
+        # Stacked states x_1 ... x_N = Phi x + Gamma U
+        Phi = np.vstack([np.linalg.matrix_power(self.A, k + 1) for k in range(N)])
+        Gamma = np.zeros((N * nx, N * nu))
+        for k in range(N):
+            for j in range(k + 1):
+                Gamma[k * nx:(k + 1) * nx, j * nu:(j + 1) * nu] = np.linalg.matrix_power(self.A, k - j) @ self.B
+        Q_bar = np.kron(np.eye(N), self.Q)
+        Q_bar[-nx:, -nx:] = self.P
+        R_bar = np.kron(np.eye(N), self.R)
+        self.H = 2 * (Gamma.T @ Q_bar @ Gamma + R_bar)
+        self.F = 2 * Phi.T @ Q_bar @ Gamma
+        self.G = np.vstack([np.eye(N * nu), -np.eye(N * nu)])
+        self.W = np.concatenate([np.tile(self.u_max, N), -np.tile(self.u_min, N)])
+        self.S = np.zeros((2 * N * nu, nx))
+
+    def solve_qp(self, x):
+        """
+        Solves the MPC problem for one state online (SLSQP) and returns the full input sequence U.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        linear = self.F.T @ x
+        bound = self.W + self.S @ x
+        result = minimize(
+            lambda U: 0.5 * U @ self.H @ U + linear @ U,
+            np.zeros(self.N * self.nu),
+            jac=lambda U: self.H @ U + linear,
+            constraints=[dict(type="ineq", fun=lambda U: bound - self.G @ U, jac=lambda U: -self.G)],
+            method="SLSQP",
+            options=dict(ftol=1e-12, maxiter=200),
+        )
+        return result.x
+
+
+def _chebyshev_ball(A, b):
+    """
+    Returns (center, radius) of the largest ball inside {x : A x <= b}, or (None, 0) if it is empty.
+    """
+    norms = np.linalg.norm(A, axis=1)
+    nx = A.shape[1]
+    cost = np.zeros(nx + 1)
+    cost[-1] = -1.0
+    result = linprog(cost, A_ub=np.column_stack([A, norms]), b_ub=b,
+                     bounds=[(None, None)] * nx + [(0, None)], method="highs")
+    if result.status != 0:
+        return None, 0.0
+    return result.x[:nx], result.x[-1]
+
+
+def _remove_redundant(A, b, tol=1e-9):
+    """
+    Drops the halfspaces of {A x <= b} that are implied by the others.
+    """
+    keep = np.ones(len(b), dtype=bool)
+    for i in range(len(b)):
+        keep[i] = False
+        result = linprog(-A[i], A_ub=A[keep], b_ub=b[keep], bounds=[(None, None)] * A.shape[1], method="highs")
+        # Unbounded or beyond b_i means the halfspace cuts the polytope
+        keep[i] = result.status != 0 or -result.fun > b[i] + tol
+    return A[keep], b[keep]
+
+
+class ExplicitMPC:
+    """
+    The critical-region partition of a LinearMPC over the box x_min <= x <= x_max.
+
+    Region i is {x : A_i x <= b_i}, with its rows stored contiguously in
+    halfspace_A, halfspace_b between offsets[i] and offsets[i + 1]. The
+    first input there is u = F[i] x + g[i].
+    """
+
+    def __init__(self, mpc, x_min, x_max, tol=1e-7):
+        self.mpc = mpc
+        self.x_min = np.asarray(x_min, dtype=np.float64)
+        self.x_max = np.asarray(x_max, dtype=np.float64)
+        self.tol = tol
+        nx = mpc.nx
+        self.box_A = np.vstack([np.eye(nx), -np.eye(nx)])
+        self.box_b = np.concatenate([self.x_max, -self.x_min])
+        self._enumerate()
+
+    def _feasible_active_set(self, active):
+        """
+        Whether some x in the box admits a U with the active rows at equality and the rest satisfied.
+        """
+        mpc = self.mpc
+        n_u = mpc.G.shape[1]
+        inactive = np.setdiff1d(np.arange(len(mpc.W)), active)
+        # Variables (U, x)
+        A_ub = np.vstack([
+            np.hstack([mpc.G[inactive], -mpc.S[inactive]]),
+            np.hstack([np.zeros((len(self.box_b), n_u)), self.box_A]),
+        ])
+        b_ub = np.concatenate([mpc.W[inactive], self.box_b])
+        A_eq = np.hstack([mpc.G[active], -mpc.S[active]]) if len(active) else None
+        b_eq = mpc.W[active] if len(active) else None
+        result = linprog(np.zeros(n_u + mpc.nx), A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                         bounds=[(None, None)] * (n_u + mpc.nx), method="highs")
+        return result.status == 0
+
+    def _region(self, active):
+        """
+        Returns (A, b, K, k, region) for an active set with U = K x + k on the
+        region, or None if the region has no interior.
+        """
+        mpc = self.mpc
+        H_inv = np.linalg.inv(mpc.H)
+        K = -H_inv @ mpc.F.T
+        k = np.zeros(mpc.G.shape[1])
+        halfspaces_A, halfspaces_b = [self.box_A], [self.box_b]
+        if len(active):
+            G_A = mpc.G[active]
+            M = G_A @ H_inv @ G_A.T
+            if np.linalg.matrix_rank(M) < len(active):
+                return None
+            M_inv = np.linalg.inv(M)
+            # Multipliers lambda = L x + l must be nonnegative
+            L = -M_inv @ (mpc.S[active] + G_A @ H_inv @ mpc.F.T)
+            l = -M_inv @ mpc.W[active]
+            K = K - H_inv @ G_A.T @ L
+            k = -H_inv @ G_A.T @ l
+            halfspaces_A.append(-L)
+            halfspaces_b.append(l)
+        # Primal feasibility G (K x + k) <= W + S x of the remaining rows
+        inactive = np.setdiff1d(np.arange(len(mpc.W)), active)
+        halfspaces_A.append(mpc.G[inactive] @ K - mpc.S[inactive])
+        halfspaces_b.append(mpc.W[inactive] - mpc.G[inactive] @ k)
+        A, b = np.vstack(halfspaces_A), np.concatenate(halfspaces_b)
+        # Drop rows that vanish identically
+        norms = np.linalg.norm(A, axis=1)
+        valid = norms > 1e-12
+        if np.any(b[~valid] < -self.tol):
+            return None
+        A, b = A[valid] / norms[valid, None], b[valid] / norms[valid]
+        center, radius = _chebyshev_ball(A, b)
+        if radius <= self.tol:
+            return None
+        A, b = _remove_redundant(A, b)
+        return A, b, K, k, center
+
+    def _enumerate(self):
+        """
+        Breadth-first enumeration of active sets, pruning the supersets of infeasible ones.
+        """
+        mpc = self.mpc
+        num_constraints = len(mpc.W)
+        regions = []
+        level = [()]
+        while level:
+            next_level = []
+            for active in level:
+                active_idx = np.array(active, dtype=np.int64)
+                if not self._feasible_active_set(active_idx):
+                    continue
+                region = self._region(active_idx)
+                if region is not None:
+                    regions.append((active,) + region)
+                start = active[-1] + 1 if active else 0
+                next_level.extend(active + (j,) for j in range(start, num_constraints))
+            level = next_level
+
+        nu = mpc.nu
+        self.active_sets = [region[0] for region in regions]
+        self.offsets = np.cumsum([0] + [len(region[2]) for region in regions])
+        self.halfspace_A = np.vstack([region[1] for region in regions])
+        self.halfspace_b = np.concatenate([region[2] for region in regions])
+        self.F = np.array([region[3][:nu] for region in regions])
+        self.g = np.array([region[4][:nu] for region in regions])
+        self.centers = np.array([region[5] for region in regions])
+        self.vertices = [self._vertices(i) for i in range(len(regions))]
+
+    def __len__(self):
+        return len(self.active_sets)
+
+    def halfspaces(self, i):
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return self.halfspace_A[start:stop], self.halfspace_b[start:stop]
+
+    def _vertices(self, i):
+        A, b = self.halfspaces(i)
+        vertices = HalfspaceIntersection(np.column_stack([A, -b]), self.centers[i]).intersections
+        if vertices.shape[1] == 2:
+            # Counterclockwise order for drawing
+            angles = np.arctan2(*(vertices - vertices.mean(axis=0)).T[::-1])
+            vertices = vertices[np.argsort(angles)]
+        return vertices
+
+    def contains(self, i, X, tol=1e-9):
+        A, b = self.halfspaces(i)
+        return np.all(np.atleast_2d(X) @ A.T <= b + tol, axis=1)
+
+    def areas(self):
+        """
+        Area of every region of a 2-D partition.
+        """
+        return np.array([
+            0.5 * abs(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+            for x, y in (vertices.T for vertices in self.vertices)
+        ])
+
+    def sample(self, i, num_samples, rng):
+        """
+        Draws states uniformly from region i, by rejection from its bounding box.
+        """
+        low, high = self.vertices[i].min(axis=0), self.vertices[i].max(axis=0)
+        samples = np.empty((0, len(low)))
+        while len(samples) < num_samples:
+            X = rng.uniform(low, high, (2 * num_samples, len(low)))
+            samples = np.vstack([samples, X[self.contains(i, X)]])
+        return samples[:num_samples]
+
+    def control(self, X, regions):
+        """
+        Evaluates the first input u = F_i x + g_i for states X (n, nx) in the given regions (n,).
+        """
+        return np.einsum("nij,nj->ni", self.F[regions], X) + self.g[regions]
+
+
+class PointLocationTree:
+    """
+    Binary search tree over the facet hyperplanes of an ExplicitMPC.
+
+    Each node splits its candidate regions with the hyperplane a^T x <= b
+    that best balances the two sides, so leaves hold a single region.
+    Nodes are stored in flat arrays: a negative child -(j + 1) is leaf j.
+    """
+
+    def __init__(self, explicit, tol=1e-7):
+        self.explicit = explicit
+        self.tol = tol
+        # Unique hyperplanes of all region facets
+        planes = np.column_stack([explicit.halfspace_A, explicit.halfspace_b])
+        self.planes = np.unique(np.round(planes, 9), axis=0)
+        self.normals, self.offsets = [], []
+        self.left, self.right = [], []
+        self.leaf_regions = []
+        self._build(np.arange(len(explicit)))
+        self.normals = np.array(self.normals)
+        self.offsets = np.array(self.offsets)
+        self.left = np.array(self.left, dtype=np.int64)
+        self.right = np.array(self.right, dtype=np.int64)
+        self.leaf_regions = np.array(self.leaf_regions, dtype=np.int64)
+        self.depth = self._depth(0) if len(self.offsets) else 0
+
+    def _sides(self, regions):
+        """
+        For every plane, the regions entirely below (<=) and above it, as boolean (planes, regions) arrays.
+        """
+        below = np.empty((len(self.planes), len(regions)), dtype=bool)
+        above = np.empty_like(below)
+        for j, region in enumerate(regions):
+            values = self.explicit.vertices[region] @ self.planes[:, :-1].T - self.planes[:, -1]
+            below[:, j] = values.max(axis=0) <= self.tol
+            above[:, j] = values.min(axis=0) >= -self.tol
+        return below, above
+
+    def _build(self, regions):
+        """
+        Adds the subtree for the candidate regions and returns its child reference.
+        """
+        if len(regions) == 1:
+            self.leaf_regions.append(regions[0])
+            return -len(self.leaf_regions)
+        below, above = self._sides(regions)
+        left_count = (~above).sum(axis=1)
+        right_count = (~below).sum(axis=1)
+        worst = np.maximum(left_count, right_count)
+        best = int(np.argmin(worst))
+        if worst[best] >= len(regions):
+            raise ValueError("No facet hyperplane separates the remaining regions")
+        node = len(self.offsets)
+        self.normals.append(self.planes[best, :-1])
+        self.offsets.append(self.planes[best, -1])
+        self.left.append(0)
+        self.right.append(0)
+        self.left[node] = self._build(regions[~above[best]])
+        self.right[node] = self._build(regions[~below[best]])
+        return node
+
+    def _depth(self, node):
+        if node < 0:
+            return 0
+        return 1 + max(self._depth(self.left[node]), self._depth(self.right[node]))
+
+    def locate(self, X):
+        """
+        Returns the region index of every state in X (n, nx).
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if not len(self.offsets):
+            return np.full(len(X), self.leaf_regions[0])
+        regions = np.empty(len(X), dtype=np.int64)
+        node = np.zeros(len(X), dtype=np.int64)
+        active = np.arange(len(X))
+        while active.size:
+            current = node[active]
+            go_left = np.einsum("ij,ij->i", self.normals[current], X[active]) <= self.offsets[current]
+            child = np.where(go_left, self.left[current], self.right[current])
+            leaf = child < 0
+            regions[active[leaf]] = self.leaf_regions[-child[leaf] - 1]
+            node[active[~leaf]] = child[~leaf]
+            active = active[~leaf]
+        return regions
+
+    def control(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return self.explicit.control(X, self.locate(X))
+
+
+def closed_loop_features(explicit, tree, regions, per_region=100, steps=20, seed=0):
+    """
+    Runs the explicit controller from states sampled in each of the given
+    regions. Returns (features, labels): one row of stacked states and inputs
+    per run, and the position in regions it started from. Runs that leave the
+    partition's box, where the law is not defined, are redrawn.
+    """
+    rng = np.random.default_rng(seed)
+    mpc = explicit.mpc
+    features, labels = [], []
+    for label, region in enumerate(regions):
+        runs = np.empty((0, steps * (mpc.nx + mpc.nu)))
+        while len(runs) < per_region:
+            X = explicit.sample(region, 2 * per_region, rng)
+            inside = np.ones(len(X), dtype=bool)
+            run = []
+            for _ in range(steps):
+                inside &= np.all((X >= explicit.x_min) & (X <= explicit.x_max), axis=1)
+                U = tree.control(X)
+                run.extend([X, U])
+                X = X @ mpc.A.T + U @ mpc.B.T
+            runs = np.vstack([runs, np.hstack(run)[inside]])
+        features.append(runs[:per_region])
+        labels.append(np.full(per_region, label))
+    return np.vstack(features), np.concatenate(labels)
+
+
+def build(mpc=None, x_min=(-10.0, -5.0), x_max=(10.0, 5.0)):
+    """
+    Returns (ExplicitMPC, PointLocationTree) for an MPC problem, by default the double integrator.
+    """
+    explicit = ExplicitMPC(LinearMPC.double_integrator() if mpc is None else mpc, x_min, x_max)
+    return explicit, PointLocationTree(explicit)
+
+
+def benchmark(num_states=100000, num_qp=200, seed=0):
+    """
+    Times batch point location against solving the QP online for each state
+    and checks that both give the same first input.
+    """
+    start = time.perf_counter()
+    explicit, tree = build()
+    build_time = time.perf_counter() - start
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(explicit.x_min, explicit.x_max, (num_states, explicit.mpc.nx))
+
+    tree.control(X[:1000])
+    start = time.perf_counter()
+    u_explicit = tree.control(X)
+    lookup_time = (time.perf_counter() - start) / num_states
+
+    start = time.perf_counter()
+    u_online = np.array([explicit.mpc.solve_qp(x)[:explicit.mpc.nu] for x in X[:num_qp]])
+    qp_time = (time.perf_counter() - start) / num_qp
+
+    return dict(
+        regions=len(explicit), tree_depth=tree.depth, tree_nodes=len(tree.offsets),
+        build_time=build_time, states=num_states,
+        lookup_time_per_state=lookup_time, qp_time_per_state=qp_time,
+        speedup=qp_time / lookup_time,
+        max_control_error=float(np.abs(u_explicit[:num_qp] - u_online).max()),
+    )
+
+
+def load_benchmark(path=BENCHMARK_PATH):
+    """
+    Returns the stored benchmark results. render_all writes them before
+    rendering; a missing file is benchmarked here, with a warning.
+    """
+    return load_json(path, write_benchmark, "python explicit_mpc.py")
+
+
+def write_benchmark(path=BENCHMARK_PATH, **kwargs):
+    results = benchmark(**kwargs)
+    write_json(path, results)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark explicit MPC point location against online QP solves.")
+    parser.add_argument("--states", type=int, default=100000, help="States in the lookup batch")
+    parser.add_argument("--qp", type=int, default=200, help="States solved online")
+    parser.add_argument("--output", default=BENCHMARK_PATH, help="JSON file to write")
+    args = parser.parse_args(argv)
+    results = write_benchmark(args.output, num_states=args.states, num_qp=args.qp)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
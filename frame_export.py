@@ -0,0 +1,218 @@
+"""
+Stream the rendered frames of a scene straight to an encoder or a .npy file.
+
+A normal render writes one partial movie file per animation and joins them
+at the end. export renders a scene in-process with movie writing turned
+off and hands every frame buffer to a sink instead:
+
+    EncoderPipe   one persistent ffmpeg process reading raw RGBA frames on
+                  stdin, for .mp4/.gif/... outputs
+    MemmapSink    a memory-mapped (frames, H, W, 4) uint8 .npy file,
+                  preallocated in chunks and trimmed when the scene ends
+
+Frames are passed on as the camera's own buffer: the pipe gets a
+memoryview of it and the memmap one slice assignment, so no frame is
+copied in Python and no intermediate files are written.
+
+    $ python frame_export.py IntroScene -q h -o media/frames/{scene}.npy
+    $ python frame_export.py -o media/frames/{scene}.gif     # every scene
+"""
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+
+import numpy as np
+
+import scene_registry
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+# Fixed .npy header size, so the shape can be rewritten in place when the file is trimmed
+HEADER_SIZE = 128
+
+
+def npy_header(shape, dtype=np.uint8):
+    """
+    Version 1.0 .npy header for a C-ordered array, padded to HEADER_SIZE bytes.
+    """
+    header = repr({"descr": np.dtype(dtype).str, "fortran_order": False, "shape": tuple(shape)})
+    header = header.ljust(HEADER_SIZE - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+class MemmapSink:
+    """
+    Writes frames into a memory-mapped .npy file that grows by doubling its capacity.
+    """
+
+    def __init__(self, path, capacity=600):
+        self.path = path
+        self.capacity = capacity
+        self.num_frames = 0
+        self.frames = None
+
+    def _map(self, frame_shape, mode):
+        self.frame_shape = frame_shape
+        self.frame_bytes = int(np.prod(frame_shape))
+        with open(self.path, mode) as f:
+            f.write(npy_header((self.capacity,) + frame_shape))
+            f.truncate(HEADER_SIZE + self.capacity * self.frame_bytes)
+        self.frames = np.memmap(self.path, np.uint8, "r+", HEADER_SIZE, (self.capacity,) + frame_shape)
+
+    def write(self, frame, num_frames=1):
+        if self.frames is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._map(frame.shape, "wb")
+        while self.num_frames + num_frames > self.capacity:
+            self.frames.flush()
+            self.frames = None
+            self.capacity *= 2
+            self._map(self.frame_shape, "r+b")
+        self.frames[self.num_frames:self.num_frames + num_frames] = frame
+        self.num_frames += num_frames
+
+    def close(self):
+        """
+        Trims the file to the frames written and returns their count.
+        """
+        if self.frames is None:
+            return 0
+        self.frames.flush()
+        self.frames = None
+        with open(self.path, "r+b") as f:
+            f.write(npy_header((self.num_frames,) + self.frame_shape))
+            f.truncate(HEADER_SIZE + self.num_frames * self.frame_bytes)
+        return self.num_frames
+
+
+class EncoderPipe:
+    """
+    Feeds raw RGBA frames to one ffmpeg process that encodes them to path.
+    encoder_args go between the input and the output, e.g. "-c:v libx264 -pix_fmt yuv420p".
+    """
+
+    def __init__(self, path, frame_rate, encoder_args=None, ffmpeg="ffmpeg"):
+        self.path = path
+        self.frame_rate = frame_rate
+        self.encoder_args = shlex.split(encoder_args) if isinstance(encoder_args, str) else list(encoder_args or [])
+        self.ffmpeg = ffmpeg
+        self.process = None
+        self.num_frames = 0
+
+    def _start(self, frame_shape):
+        height, width = frame_shape[:2]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        command = [
+            self.ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(self.frame_rate),
+            "-i", "-",
+            *self.encoder_args,
+            self.path,
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame, num_frames=1):
+        if self.process is None:
+            self._start(frame.shape)
+        data = memoryview(np.ascontiguousarray(frame)).cast("B")
+        for _ in range(num_frames):
+            self.process.stdin.write(data)
+        self.num_frames += num_frames
+
+    def close(self):
+        if self.process is None:
+            return 0
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode} writing {self.path}")
+        return self.num_frames
+
+
+def make_sink(path, frame_rate, encoder_args=None):
+    """
+    A MemmapSink for .npy paths, an EncoderPipe for anything else.
+    """
+    if path.endswith(".npy"):
+        return MemmapSink(path)
+    return EncoderPipe(path, frame_rate, encoder_args)
+
+
+def attach(scene, sink):
+    """
+    Sends every frame the scene's renderer writes to sink instead of the movie writer.
+    """
+    renderer = scene.renderer
+
+    def write_frame(frame_or_renderer, num_frames=1):
+        frame = frame_or_renderer
+        if not isinstance(frame, np.ndarray):
+            # OpenGL passes the renderer itself
+            frame = frame_or_renderer.get_frame()
+        sink.write(frame, num_frames)
+
+    renderer.file_writer.write_frame = write_frame
+
+
+def export(scene_class, path, quality="h", encoder_args=None):
+    """
+    Renders scene_class at the given quality into path. Returns the number of frames written.
+    """
+    from manim import config, tempconfig
+
+    settings = {
+        "quality": QUALITIES[quality],
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+    }
+    with tempconfig(settings):
+        sink = make_sink(path, config.frame_rate, encoder_args)
+        scene = scene_class()
+        attach(scene, sink)
+        try:
+            scene.render()
+        finally:
+            num_frames = sink.close()
+    return num_frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream rendered frames to an encoder or a .npy memmap.")
+    parser.add_argument("scenes", nargs="*", help="scene keys or class names (default: all)")
+    parser.add_argument("-q", "--quality", default="h", choices=sorted(QUALITIES))
+    parser.add_argument("-o", "--output", default=os.path.join("media", "frames", "{scene}.npy"),
+                        help="output path, {scene} is replaced by the scene key; .npy writes a memmap")
+    parser.add_argument("--encoder-args", default="", help="ffmpeg output arguments for encoded formats")
+    args = parser.parse_args(argv)
+
+    entries = scene_registry.discover()
+    try:
+        entries = [scene_registry.find(name, entries) for name in args.scenes] if args.scenes else entries
+    except KeyError as e:
+        parser.error(e.args[0])
+    status = 0
+    for entry in entries:
+        missing = entry.missing_dependencies()
+        if missing:
+            print(f"{entry.key:45s} skipped (missing {', '.join(missing)})")
+            continue
+        path = args.output.format(scene=entry.key.replace(":", "."))
+        try:
+            num_frames = export(scene_registry.load_scene_class(entry), path, args.quality, args.encoder_args)
+        except Exception as e:
+            print(f"{entry.key:45s} failed: {e}")
+            status = 1
+            continue
+        print(f"{entry.key:45s} {num_frames} frames -> {path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
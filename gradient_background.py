@@ -0,0 +1,62 @@
+"""
+Shaded background for a scalar function over an Axes, as a single image.
+
+GradientField evaluates the function once on a pixel grid with NumPy and
+turns the values into one RGBA image, so shading an objective costs one
+mobject however fine the resolution is.
+
+    background = GradientField(axes, lambda x1, x2: x2, colors=(BLUE, ORANGE), opacity=0.1)
+    self.add(background)
+"""
+import numpy as np
+from manim import *
+
+
+def field_to_rgba(values, colors, opacity=1.0, value_range=None):
+    """
+    Maps a 2-D array of values to uint8 RGBA pixels, interpolating linearly
+    between the colors from the smallest to the largest value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    low, high = (np.nanmin(values), np.nanmax(values)) if value_range is None else value_range
+    t = np.clip((values - low) / (high - low if high > low else 1.0), 0.0, 1.0)
+    # NaN marks points outside the function's domain; they are drawn transparent
+    missing = np.isnan(t)
+    t[missing] = 0.0
+    stops = np.array([color_to_rgb(color) for color in colors])
+    # Position of every value between consecutive color stops
+    position = t * (len(stops) - 1)
+    index = np.minimum(position.astype(np.int64), len(stops) - 2)
+    frac = (position - index)[..., None]
+    rgb = stops[index] * (1 - frac) + stops[index + 1] * frac
+    alpha = np.where(missing, 0.0, opacity)[..., None]
+    return np.round(255 * np.concatenate([rgb, alpha], axis=-1)).astype(np.uint8)
+
+
+class GradientField(ImageMobject):
+    """
+    func(x, y) shaded over the axes' x and y ranges (or the given ones).
+
+    func must accept arrays; it is called once with the (rows, columns)
+    grid of pixel centers. resolution is (columns, rows) of the image,
+    value_range fixes the values mapped to the first and last color.
+    """
+
+    def __init__(self, axes, func, colors=(BLUE, ORANGE), opacity=0.1, resolution=(256, 256),
+                 x_range=None, y_range=None, value_range=None, **kwargs):
+        x_min, x_max = (axes.x_range[0], axes.x_range[1]) if x_range is None else x_range[:2]
+        y_min, y_max = (axes.y_range[0], axes.y_range[1]) if y_range is None else y_range[:2]
+        columns, rows = resolution
+        xs = x_min + (np.arange(columns) + 0.5) * (x_max - x_min) / columns
+        # Image rows go from the top down
+        ys = y_max - (np.arange(rows) + 0.5) * (y_max - y_min) / rows
+        X, Y = np.meshgrid(xs, ys)
+        values = np.broadcast_to(func(X, Y), X.shape)
+        super().__init__(field_to_rgba(values, colors, opacity, value_range), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["bilinear"])
+
+        lower_left = axes.c2p(x_min, y_min)
+        upper_right = axes.c2p(x_max, y_max)
+        self.stretch_to_fit_width(upper_right[0] - lower_left[0])
+        self.stretch_to_fit_height(upper_right[1] - lower_left[1])
+        self.move_to((lower_left + upper_right) / 2)
@@ -0,0 +1,47 @@
+"""
+Downsampled copies of large images, cached on disk.
+
+A scene that shows a big PNG at a few units of height only needs as many
+pixel rows as that height covers at the render resolution. downsampled_image
+decodes and resamples the file once and stores the result as a .npy array,
+keyed by the file's path, size and modification time and the target height,
+so later renders load the small array without touching the PNG.
+
+    pixels = downsampled_image("multipleInputs.png", 2.5, config.pixel_height / config.frame_height)
+"""
+import hashlib
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+from atomic_io import write_atomic
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(REPO_DIR, "media", "cache", "images")
+
+
+def cache_key(path, rows):
+    stat = os.stat(path)
+    payload = repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, rows))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def downsampled_image(path, height, pixels_per_unit, cache_dir=CACHE_DIR):
+    """
+    Returns the image at path as a uint8 array with enough rows for height
+    scene units at pixels_per_unit, keeping its aspect ratio. Images that are
+    already small enough are returned at their own size.
+    """
+    rows = math.ceil(height * pixels_per_unit)
+    cache_path = os.path.join(cache_dir, cache_key(path, rows) + ".npy")
+    if os.path.exists(cache_path):
+        return np.load(cache_path)
+    with Image.open(path) as image:
+        if image.height > rows:
+            columns = max(1, round(image.width * rows / image.height))
+            image = image.resize((columns, rows), Image.LANCZOS)
+        pixels = np.asarray(image)
+    write_atomic(cache_path, lambda f: np.save(f, pixels))
+    return pixels
@@ -0,0 +1,122 @@
+"""
+Instrumented interior-point run on PrimalDualScene's 2-D problem.
+
+    min x2   s.t.   x2 >= x1^2 - 4          (as the cone (x2 + 5, 2 x1, x2 + 3) in Q^3)
+                    x2 >= -2 - x1 / 2       (line 1)
+                    x2 <= 4 - 2 x1          (line 2)
+                    x2 <= 5                 (line 3)
+
+The solve starts from the origin and every iterate is recorded with its
+mu, residual norms, KKT system size and time, once with every constraint
+and once with only the constraints that are tight at the optimum. Both
+traces are stored in one .npz file, so the scene reads them back instead
+of solving while rendering.
+
+    python ipm_trace.py            # writes media/cache/ipm_trace.npz
+"""
+import argparse
+import os
+
+import numpy as np
+
+from socp import ConeProgram
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACE_PATH = os.path.join(REPO_DIR, "media", "cache", "ipm_trace.npz")
+
+# Rows of G x + s = h for each constraint, linear ones first
+CONSTRAINTS = {
+    "line_1": ([[-0.5, -1.0]], [2.0]),
+    "line_2": ([[2.0, 1.0]], [4.0]),
+    "line_3": ([[0.0, 1.0]], [5.0]),
+    "parabola": ([[0.0, -1.0], [-2.0, 0.0], [0.0, -1.0]], [5.0, 0.0, 3.0]),
+}
+CONE_CONSTRAINTS = ("parabola",)
+TIGHT_CONSTRAINTS = ("parabola", "line_1")
+START = (0.0, 0.0)
+FIELDS = ("x", "mu", "pres", "dres", "gap", "step", "iteration_time")
+
+
+def build_program(names=tuple(CONSTRAINTS)):
+    """
+    Returns the ConeProgram of min x2 over the named constraints.
+    """
+    linear = [name for name in names if name not in CONE_CONSTRAINTS]
+    conic = [name for name in names if name in CONE_CONSTRAINTS]
+    G = np.vstack([CONSTRAINTS[name][0] for name in linear + conic])
+    h = np.concatenate([CONSTRAINTS[name][1] for name in linear + conic])
+    cones = {"l": len(linear), "q": [len(CONSTRAINTS[name][1]) for name in conic]}
+    # No equilibration, so the iterates are the ones of the problem as written
+    return ConeProgram(np.array([0.0, 1.0]), G, h, cones, equilibrate_iterations=0)
+
+
+def trace(names=tuple(CONSTRAINTS), start=START):
+    """
+    Solves over the named constraints and returns a dict of per-iteration arrays.
+    """
+    program = build_program(names)
+    records = []
+    result = program.solve(callback=records.append, x0=start)
+    times = np.array([record["time"] for record in records])
+    return dict(
+        x=np.array([record["x"] for record in records]),
+        mu=np.array([record["mu"] for record in records]),
+        pres=np.array([record["pres"] for record in records]),
+        dres=np.array([record["dres"] for record in records]),
+        gap=np.array([record["gap"] for record in records]),
+        step=np.array([record["step"] for record in records]),
+        iteration_time=np.diff(times, prepend=0.0),
+        kkt_size=program.kkt.size,
+        kkt_nnz=program.kkt.nnz,
+        status=result["status"],
+    )
+
+
+def write_trace(path=TRACE_PATH, repeats=20):
+    """
+    Records the full and the reduced (tight constraints only) runs and
+    writes them to path. Timings are the per-iteration minimum over repeats.
+    """
+    arrays = {}
+    for prefix, names in (("full", tuple(CONSTRAINTS)), ("reduced", TIGHT_CONSTRAINTS)):
+        runs = [trace(names) for _ in range(repeats)]
+        run = runs[0]
+        run["iteration_time"] = np.min([r["iteration_time"] for r in runs], axis=0)
+        for key, value in run.items():
+            arrays[f"{prefix}_{key}"] = np.asarray(value)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+def load_trace(path=TRACE_PATH):
+    """
+    Returns {"full": {...}, "reduced": {...}}, recording the trace first if the file is missing.
+    """
+    if not os.path.exists(path):
+        write_trace(path)
+    with np.load(path) as data:
+        runs = {"full": {}, "reduced": {}}
+        for key in data.files:
+            prefix, field = key.split("_", 1)
+            value = data[key]
+            runs[prefix][field] = value.item() if value.ndim == 0 else value
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record the interior-point trace used by PrimalDualScene.")
+    parser.add_argument("--output", default=TRACE_PATH, help="Trace file to write")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs to take the per-iteration timing minimum over")
+    args = parser.parse_args(argv)
+    write_trace(args.output, args.repeats)
+    runs = load_trace(args.output)
+    for name, run in runs.items():
+        print(
+            f"{name}: {len(run['mu']) - 1} iterations, KKT {run['kkt_size']}x{run['kkt_size']}, "
+            f"{1e3 * run['iteration_time'].sum():.2f} ms, x* = {np.round(run['x'][-1], 3)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Binned Gaussian kernel density estimates for the histogram plots.
+
+scipy's gaussian_kde.evaluate sums a kernel for every data point at every
+evaluation point, which is O(samples x data) and is paid again for every
+x of a plotted curve. BinnedKDE spreads the data onto a regular grid once
+(linear binning, each point split between its two nearest grid nodes),
+convolves the grid with the sampled Gaussian kernel through an FFT and
+interpolates the result, so building it is O(data + bins log bins) and
+evaluating it costs one np.interp. The bandwidth follows gaussian_kde:
+the same "scott" and "silverman" rules, scalar factors and callables, and
+the same weighted covariance.
+
+    kde = BinnedKDE(x)                   # 10^6 points in about 30 ms
+    curve = plot_function(axes, lambda t: len(x) * kde(t))
+"""
+import numpy as np
+
+
+class BinnedKDE:
+    """
+    One-dimensional Gaussian KDE of data evaluated on a grid of num_bins nodes.
+
+    The grid covers the data and x_range (if given), padded by cut bandwidths
+    on both sides; the estimate is zero beyond it.
+    """
+
+    def __init__(self, data, bw_method=None, weights=None, num_bins=2048, x_range=None, cut=4.0):
+        self.dataset = np.asarray(data, dtype=np.float64).ravel()
+        if len(self.dataset) < 2:
+            raise ValueError("BinnedKDE needs at least two data points")
+        self.n = len(self.dataset)
+        # None for equal weights, which skips the per-point products
+        self._weights = None if weights is None else np.asarray(weights, dtype=np.float64).ravel()
+        if self._weights is not None:
+            self._weights = self._weights / self._weights.sum()
+            self.neff = 1 / np.sum(self._weights ** 2)
+        else:
+            self.neff = float(self.n)
+        self.set_bandwidth(bw_method)
+
+        low, high = self.dataset.min(), self.dataset.max()
+        if x_range is not None:
+            low, high = min(low, x_range[0]), max(high, x_range[1])
+        pad = cut * self.bandwidth
+        self.grid = np.linspace(low - pad, high + pad, num_bins)
+        self.density = self._convolve(self._bin())
+
+    @property
+    def weights(self):
+        return np.full(self.n, 1 / self.n) if self._weights is None else self._weights
+
+    def scotts_factor(self):
+        return self.neff ** (-1 / 5)
+
+    def silverman_factor(self):
+        return (self.neff * 3 / 4) ** (-1 / 5)
+
+    def set_bandwidth(self, bw_method=None):
+        """
+        Sets factor and bandwidth (the kernel's standard deviation) as gaussian_kde does.
+        """
+        if bw_method is None or bw_method == "scott":
+            self.factor = self.scotts_factor()
+        elif bw_method == "silverman":
+            self.factor = self.silverman_factor()
+        elif np.isscalar(bw_method) and not isinstance(bw_method, str):
+            self.factor = float(bw_method)
+        elif callable(bw_method):
+            self.factor = float(bw_method(self))
+        else:
+            raise ValueError("bw_method should be 'scott', 'silverman', a scalar or a callable")
+        # Unbiased (weighted) variance, as np.cov in gaussian_kde
+        if self._weights is None:
+            variance = np.var(self.dataset, ddof=1)
+        else:
+            mean = np.sum(self._weights * self.dataset)
+            variance = np.sum(self._weights * (self.dataset - mean) ** 2) / (1 - 1 / self.neff)
+        self.bandwidth = self.factor * np.sqrt(variance)
+
+    def _bin(self):
+        """
+        Weights on the grid nodes, each point shared by its two neighbours in proportion to distance.
+        """
+        step = self.grid[1] - self.grid[0]
+        position = (self.dataset - self.grid[0]) / step
+        left = np.clip(np.floor(position).astype(np.int64), 0, len(self.grid) - 2)
+        fraction = position - left
+        if self._weights is not None:
+            fraction *= self._weights
+            left_share = self._weights - fraction
+        else:
+            left_share = 1 - fraction
+        counts = np.bincount(left, left_share, minlength=len(self.grid))
+        counts[1:] += np.bincount(left, fraction, minlength=len(self.grid))[:-1]
+        return counts if self._weights is not None else counts / self.n
+
+    def _convolve(self, counts):
+        step = self.grid[1] - self.grid[0]
+        # The kernel reaches the whole grid, zero padding of that length avoids wrap-around
+        offsets = np.arange(len(self.grid)) * step
+        kernel = np.exp(-0.5 * (offsets / self.bandwidth) ** 2) / (np.sqrt(2 * np.pi) * self.bandwidth)
+        kernel = np.concatenate([kernel, kernel[:0:-1]])
+        size = len(kernel)
+        density = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel), size)[:len(self.grid)]
+        return np.maximum(density, 0.0)
+
+    def evaluate(self, points):
+        """
+        Density at an array of points, interpolated linearly between grid nodes.
+        """
+        return np.interp(points, self.grid, self.density, left=0.0, right=0.0)
+
+    __call__ = evaluate
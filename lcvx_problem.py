@@ -0,0 +1,368 @@
+"""
+Discretized lossless convexification (LCvx) of the powered descent guidance problem.
+
+This is the problem written in IntroScene's lcvs_eq, with z = ln(m) and the
+slack xi written as sigma. Time is split into N nodes, t_k = k tf / (N - 1),
+and each node carries 11 variables
+
+    x_k = (r (3), v (3), z, u (3), sigma)
+
+stored node after node so the constraint matrices are banded. The problem
+is assembled in the conic form used by ECOS and the in-repo solvers,
+
+    min c^T x   s.t.   A_eq x = b_eq,   G x + s = h,   s in K,
+
+where K is the nonnegative orthant of size cones["l"] followed by one
+second-order cone per entry of cones["q"]. Every constraint family keeps
+its block ("eq", "l" or "q") and row range, so exact counts per family can be read back for any N.
+A linear row or a whole second-order cone counts as one constraint.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+NODE_SIZE = 11
+R, V, Z, U, SIGMA = 0, 3, 6, 7, 10
+
+# Mars lander example in the spirit of Acikmese & Ploen (2007), z axis pointing up
+DEFAULT_PARAMETERS = dict(
+    r0=(2000.0, 0.0, 1500.0),
+    v0=(100.0, 0.0, -75.0),
+    g=(0.0, 0.0, -3.7114),
+    omega=(2.53e-5, 0.0, 6.62e-5),
+    m_wet=1905.0,
+    m_dry=1505.0,
+    isp=225.0,
+    thrust_max=6 * 3100.0 * np.cos(np.radians(27.0)),
+    throttle_min=0.3,
+    throttle_max=0.8,
+    tilt_angle=np.radians(60.0),
+    glideslope_angle=np.radians(4.0),
+    v_max=150.0,
+    tf=80.0,
+)
+
+# Constraint families in the order of the rows of lcvs_eq (the cost row excluded)
+FAMILIES = (
+    "kinematics",
+    "dynamics",
+    "mass",
+    "thrust_lower",
+    "thrust_upper",
+    "thrust_magnitude",
+    "tilt",
+    "glideslope",
+    "velocity",
+    "dry_mass",
+    "fuel_rate",
+    "initial",
+    "final",
+)
+EQUALITY_FAMILIES = ("kinematics", "dynamics", "mass", "initial", "final")
+
+
+def _cross_matrix(w):
+    """
+    Returns the matrix W with W @ x = w x x.
+    """
+    wx, wy, wz = w
+    return np.array([[0.0, -wz, wy], [wz, 0.0, -wx], [-wy, wx, 0.0]])
+
+
+class _Rows:
+    """
+    Collects one block of sparse rows (COO triplets plus right-hand side).
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.rows, self.cols, self.vals, self.rhs = [], [], [], []
+        self.size = 0
+
+    def add(self, count, entries, rhs):
+        """
+        Appends count rows. entries is a list of (local_row, col, val) arrays,
+        local_row in [0, count); rhs has one value per row.
+        """
+        for local_row, col, val in entries:
+            local_row, col, val = np.broadcast_arrays(local_row, col, val)
+            self.rows.append(self.size + local_row.ravel())
+            self.cols.append(col.ravel())
+            self.vals.append(np.asarray(val, dtype=np.float64).ravel())
+        self.rhs.append(np.broadcast_to(np.asarray(rhs, dtype=np.float64), (count,)))
+        start = self.size
+        self.size += count
+        return start, self.size
+
+    def matrix(self, num_vars):
+        rows = np.concatenate(self.rows).astype(np.int32)
+        cols = np.concatenate(self.cols).astype(np.int32)
+        vals = np.concatenate(self.vals)
+        matrix = sp.csr_matrix((vals, (rows, cols)), shape=(self.size, num_vars))
+        return matrix, np.concatenate(self.rhs)
+
+
+class LCvxProblem:
+    """
+    The LCvx problem discretized on N nodes with trapezoidal integration.
+
+    Any entry of DEFAULT_PARAMETERS can be overridden by keyword. The
+    initial state only enters b_eq, so set_initial_state updates it in
+    place without rebuilding the matrices.
+    """
+
+    def __init__(self, N, **parameters):
+        if N < 2:
+            raise ValueError("LCvxProblem needs at least 2 nodes")
+        unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+        if unknown:
+            raise TypeError(f"Unknown LCvx parameters: {', '.join(sorted(unknown))}")
+        self.N = int(N)
+        self.parameters = dict(DEFAULT_PARAMETERS, **parameters)
+        self.num_vars = NODE_SIZE * self.N
+        self.families = {}
+        self._build()
+
+    # Variable indices
+
+    def index(self, offset, nodes=None):
+        """
+        Returns the column index of variable offset (R, V, Z, U or SIGMA, plus 0-2 for vectors) at the given nodes.
+        """
+        nodes = np.arange(self.N) if nodes is None else np.asarray(nodes)
+        return nodes * NODE_SIZE + offset
+
+    def _vector(self, offset, nodes=None):
+        # (n, 3) column indices of a 3-vector variable
+        return self.index(offset, nodes)[:, None] + np.arange(3)[None, :]
+
+    # Assembly
+
+    def _build(self):
+        p = self.parameters
+        N = self.N
+        self.dt = dt = p["tf"] / (N - 1)
+        self.times = np.arange(N) * dt
+        self.alpha = alpha = 1.0 / (p["isp"] * 9.807)
+        rho_min = p["throttle_min"] * p["thrust_max"]
+        rho_max = p["throttle_max"] * p["thrust_max"]
+
+        # z0(t) is the least mass possible at t, the expansion point of the thrust bounds
+        self.z_lower = np.log(p["m_wet"] - alpha * rho_max * self.times)
+        self.z_upper = np.log(p["m_wet"] - alpha * rho_min * self.times)
+        self.mu_min = rho_min * np.exp(-self.z_lower)
+        self.mu_max = rho_max * np.exp(-self.z_lower)
+
+        # Equalities, linear inequalities and second-order cones
+        eq, lin, soc = _Rows("eq"), _Rows("l"), _Rows("q")
+        self._cone_dims = []
+        k = np.arange(N - 1)
+        nodes = np.arange(N)
+        rows3 = np.arange(3)[None, :] + 3 * k[:, None]
+
+        # r_{k+1} - r_k - dt/2 (v_k + v_{k+1}) = 0
+        self._family("kinematics", eq, 3 * (N - 1), [
+            (rows3, self._vector(R, k + 1), 1.0),
+            (rows3, self._vector(R, k), -1.0),
+            (rows3, self._vector(V, k), -dt / 2),
+            (rows3, self._vector(V, k + 1), -dt / 2),
+        ], 0.0)
+
+        # v_{k+1} - v_k - dt/2 (a_k + a_{k+1}) = dt g, a = u - w x w x r - 2 w x v
+        W = _cross_matrix(p["omega"])
+        coupling = {R: -W @ W, V: -2 * W}
+        entries = [
+            (rows3, self._vector(V, k + 1), 1.0),
+            (rows3, self._vector(V, k), -1.0),
+            (rows3, self._vector(U, k), -dt / 2),
+            (rows3, self._vector(U, k + 1), -dt / 2),
+        ]
+        for offset, M in coupling.items():
+            for i, j in zip(*np.nonzero(M)):
+                for nodes_ in (k, k + 1):
+                    entries.append((3 * k + i, self.index(offset + j, nodes_), -dt / 2 * M[i, j]))
+        self._family("dynamics", eq, 3 * (N - 1), entries, np.tile(dt * np.asarray(p["g"]), N - 1))
+
+        # z_{k+1} - z_k + alpha dt/2 (sigma_k + sigma_{k+1}) = 0
+        self._family("mass", eq, N - 1, [
+            (k, self.index(Z, k + 1), 1.0),
+            (k, self.index(Z, k), -1.0),
+            (k, self.index(SIGMA, k), alpha * dt / 2),
+            (k, self.index(SIGMA, k + 1), alpha * dt / 2),
+        ], 0.0)
+
+        # mu_min (1 - dz + dz^2 / 2) <= sigma, dz = z - z0, as w >= dz^2 with
+        # w = 2 (sigma / mu_min - 1 + dz), i.e. (w + 1, 2 dz, w - 1) in Q^3
+        two_over_mu = 2.0 / self.mu_min
+        rows = 3 * nodes
+        rhs = np.column_stack([-2 * self.z_lower - 1, -2 * self.z_lower, -2 * self.z_lower - 3])
+        self._family("thrust_lower", soc, 3 * N, [
+            (rows, self.index(SIGMA), -two_over_mu),
+            (rows, self.index(Z), -2.0),
+            (rows + 1, self.index(Z), -2.0),
+            (rows + 2, self.index(SIGMA), -two_over_mu),
+            (rows + 2, self.index(Z), -2.0),
+        ], rhs.ravel(), cone_dim=3)
+
+        # sigma <= mu_max (1 - dz)
+        self._family("thrust_upper", lin, N, [
+            (nodes, self.index(SIGMA), 1.0),
+            (nodes, self.index(Z), self.mu_max),
+        ], self.mu_max * (1 + self.z_lower))
+
+        # ||u|| <= sigma
+        rows = 4 * nodes
+        self._family("thrust_magnitude", soc, 4 * N, [
+            (rows, self.index(SIGMA), -1.0),
+            (rows[:, None] + 1 + np.arange(3), self._vector(U), -1.0),
+        ], 0.0, cone_dim=4)
+
+        # u^T e_z >= sigma cos(gamma_p)
+        self._family("tilt", lin, N, [
+            (nodes, self.index(U + 2), -1.0),
+            (nodes, self.index(SIGMA), np.cos(p["tilt_angle"])),
+        ], 0.0)
+
+        # tan(gamma_gs) ||(r_x, r_y)|| <= r_z, gamma_gs measured from the horizontal
+        tan_gs = np.tan(p["glideslope_angle"])
+        rows = 3 * nodes
+        self._family("glideslope", soc, 3 * N, [
+            (rows, self.index(R + 2), -1.0),
+            (rows + 1, self.index(R), -tan_gs),
+            (rows + 2, self.index(R + 1), -tan_gs),
+        ], 0.0, cone_dim=3)
+
+        # ||v|| <= v_max
+        rows = 4 * nodes
+        rhs = np.zeros((N, 4))
+        rhs[:, 0] = p["v_max"]
+        self._family("velocity", soc, 4 * N, [
+            (rows[:, None] + 1 + np.arange(3), self._vector(V), -1.0),
+        ], rhs.ravel(), cone_dim=4)
+
+        # ln(m_dry) <= z(t_f)
+        self._family("dry_mass", lin, 1, [
+            (0, self.index(Z, N - 1), -1.0),
+        ], -np.log(p["m_dry"]))
+
+        # z0(t) <= z(t) <= ln(m_wet - alpha rho_min t)
+        self._family("fuel_rate", lin, 2 * N, [
+            (2 * nodes, self.index(Z), -1.0),
+            (2 * nodes + 1, self.index(Z), 1.0),
+        ], np.column_stack([-self.z_lower, self.z_upper]).ravel())
+
+        # r(0) = r0, v(0) = v0, z(0) = ln(m_wet)
+        self._family("initial", eq, 7, [
+            (np.arange(7), np.arange(7), 1.0),
+        ], 0.0)
+
+        # r(t_f) = v(t_f) = 0
+        self._family("final", eq, 6, [
+            (np.arange(6), self.index(R, N - 1) + np.arange(6), 1.0),
+        ], 0.0)
+
+        self.A_eq, self.b_eq = eq.matrix(self.num_vars)
+        G_lin, h_lin = lin.matrix(self.num_vars)
+        G_soc, h_soc = soc.matrix(self.num_vars)
+        # Linear rows first, then the cones, as ECOS expects
+        self.G = sp.vstack([G_lin, G_soc], format="csr")
+        self.h = np.concatenate([h_lin, h_soc])
+        for name, (kind, start, stop, count) in self.families.items():
+            if kind == "q":
+                self.families[name] = (kind, start + lin.size, stop + lin.size, count)
+        self.cones = {"l": lin.size, "q": np.concatenate(self._cone_dims).astype(np.int64)}
+
+        # Minimize the integral of sigma with the trapezoidal rule
+        weights = np.full(N, dt)
+        weights[[0, -1]] = dt / 2
+        self.c = np.zeros(self.num_vars)
+        self.c[self.index(SIGMA)] = weights
+
+        self.set_initial_state(p["r0"], p["v0"], p["m_wet"])
+
+    def _family(self, name, block, num_rows, entries, rhs, cone_dim=1):
+        """
+        Adds a family of num_rows rows to a block; second-order cone
+        families are made of num_rows / cone_dim cones of size cone_dim.
+        """
+        start, stop = block.add(num_rows, entries, rhs)
+        count = num_rows // cone_dim
+        if block.kind == "q":
+            self._cone_dims.append(np.full(count, cone_dim))
+        self.families[name] = (block.kind, start, stop, count)
+
+    # Parameters
+
+    def set_initial_state(self, r0, v0, m0=None):
+        """
+        Writes a new initial state into b_eq in place.
+        """
+        _, start, stop, _ = self.families["initial"]
+        m0 = self.parameters["m_wet"] if m0 is None else m0
+        self.b_eq[start:stop] = np.concatenate([np.asarray(r0, dtype=np.float64),
+                                                np.asarray(v0, dtype=np.float64),
+                                                [np.log(m0)]])
+        return self
+
+    # Results
+
+    def unpack(self, x):
+        """
+        Splits a solution vector into r, v, u (N, 3), z, sigma (N,) and the mass m = exp(z).
+        """
+        nodes = np.asarray(x).reshape(self.N, NODE_SIZE)
+        z = nodes[:, Z]
+        return dict(r=nodes[:, R:R + 3], v=nodes[:, V:V + 3], z=z, u=nodes[:, U:U + 3],
+                    sigma=nodes[:, SIGMA], m=np.exp(z), t=self.times)
+
+    def counts(self):
+        """
+        Returns {family: number of constraints} in the order of FAMILIES.
+        """
+        return {name: self.families[name][3] for name in FAMILIES}
+
+    @property
+    def num_constraints(self):
+        return sum(self.counts().values())
+
+    @property
+    def num_equality_constraints(self):
+        return sum(self.families[name][3] for name in EQUALITY_FAMILIES)
+
+
+def constraint_counts(N, **parameters):
+    """
+    Returns the per-family counts of the problem built on N nodes.
+    """
+    return LCvxProblem(N, **parameters).counts()
+
+
+def count_formulas(sizes=(3, 4, 5)):
+    """
+    Fits every family count as a N + b from problems actually built on the
+    given sizes and checks that it is affine. Returns {name: (a, b)} for
+    each of FAMILIES plus "total" and "equality".
+    """
+    problems = [LCvxProblem(N) for N in sizes]
+    values = {name: [problem.counts()[name] for problem in problems] for name in FAMILIES}
+    values["total"] = [problem.num_constraints for problem in problems]
+    values["equality"] = [problem.num_equality_constraints for problem in problems]
+    sizes = np.asarray(sizes)
+    formulas = {}
+    for name, counts in values.items():
+        a, b = np.polyfit(sizes, counts, 1).round().astype(int)
+        if not np.array_equal(a * sizes + b, counts):
+            raise ValueError(f"Constraint count of {name} is not affine in N")
+        formulas[name] = (int(a), int(b))
+    return formulas
+
+
+def format_count(a, b, variable="N"):
+    """
+    Formats a N + b the way the scenes print it, e.g. "15N + 7", "N - 1" or "6".
+    """
+    if a == 0:
+        return str(b)
+    term = variable if a == 1 else f"{a}{variable}"
+    if b == 0:
+        return term
+    return f"{term} {'+' if b > 0 else '-'} {abs(b)}"
@@ -0,0 +1,144 @@
+"""
+Solve pipeline for the LCvx powered descent problem.
+
+LCvxSolver builds the discretized problem and the ConeProgram (equilibration
+and KKT pattern) once. Each solve only writes the new initial state into
+b_eq and runs the interior-point method, so repeated solves cost the
+iterations alone. get_solver keeps one solver per problem setup.
+
+    solver = get_solver(20, v0=(20.0, 0.0, -60.0), tf=50.0)
+    trajectory = solver.solve()
+    trajectory["r"], trajectory["solve_time"]
+
+stored_latency times repeated solves once per problem setup and keeps the
+result in media/cache/lcvx_latency/, one file per setup, so a scene shows
+(and is cached under) the same figure on every render.
+
+SceneMap places a trajectory in a scene so that its start and landing site
+land on two given scene points.
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from atomic_io import write_atomic
+from lcvx_problem import LCvxProblem
+from socp import ConeProgram
+from trajectory_path import hermite_bezier_points
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+LATENCY_DIR = os.path.join(REPO_DIR, "media", "cache", "lcvx_latency")
+
+_solvers = {}
+
+
+def _setup_key(N, parameters):
+    return (N,) + tuple(sorted((name, np.asarray(value).tobytes()) for name, value in parameters.items()))
+
+
+class LCvxSolver:
+    """
+    An LCvxProblem on N nodes with its ConeProgram, set up once.
+    """
+
+    def __init__(self, N=20, **parameters):
+        self.key = _setup_key(N, parameters)
+        self.problem = LCvxProblem(N, **parameters)
+        p = self.problem
+        start = time.perf_counter()
+        self.program = ConeProgram(p.c, p.G, p.h, p.cones, A=p.A_eq, b=p.b_eq)
+        self.setup_time = time.perf_counter() - start
+
+    def solve(self, r0=None, v0=None, m0=None, **kwargs):
+        """
+        Solves from a new initial state (the problem's own when omitted).
+
+        Returns the unpacked trajectory (r, v, u, z, sigma, m, t) with the
+        solver's status, iterations, objective and solve_time in seconds.
+        """
+        parameters = self.problem.parameters
+        self.problem.set_initial_state(
+            parameters["r0"] if r0 is None else r0,
+            parameters["v0"] if v0 is None else v0,
+            m0,
+        )
+        self.program.update(b=self.problem.b_eq)
+        result = self.program.solve(**kwargs)
+        if result["status"] != "optimal":
+            raise RuntimeError(f"LCvx solve stopped with status {result['status']!r}")
+        trajectory = self.problem.unpack(result["x"])
+        for key in ("status", "iterations", "objective", "solve_time"):
+            trajectory[key] = result[key]
+        return trajectory
+
+    def latency(self, repeats=10, **kwargs):
+        """
+        Times repeated solves from the problem's initial state.
+        Returns {"median", "min", "max"} in seconds.
+        """
+        times = [self.solve(**kwargs)["solve_time"] for _ in range(repeats)]
+        return dict(median=float(np.median(times)), min=float(np.min(times)), max=float(np.max(times)))
+
+    def stored_latency(self, repeats=10, cache_dir=LATENCY_DIR):
+        """
+        latency(repeats) measured once for this problem setup and then read back from cache_dir.
+        """
+        key = hashlib.sha256(repr(self.key + (repeats,)).encode("utf-8")).hexdigest()
+        # One file per setup, so parallel renders never overwrite each other's entries
+        path = os.path.join(cache_dir, key[:32] + ".json")
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+        latency = self.latency(repeats)
+        write_atomic(path, lambda f: json.dump(latency, f, indent=2), mode="w")
+        return latency
+
+
+def get_solver(N=20, **parameters):
+    """
+    Returns the cached LCvxSolver for N and the given parameters, building it on first use.
+    """
+    key = _setup_key(N, parameters)
+    if key not in _solvers:
+        _solvers[key] = LCvxSolver(N, **parameters)
+    return _solvers[key]
+
+
+class SceneMap:
+    """
+    Maps the vertical (x, z) plane of a trajectory into the scene with a
+    similarity transform that sends r0 to start and the landing site to end.
+    With mirror the downrange axis is flipped, so a positive x starts on the left.
+    """
+
+    def __init__(self, r0, start, end, mirror=True):
+        self.sign = -1.0 if mirror else 1.0
+        self.start = np.asarray(start, dtype=np.float64).reshape(3)
+        self.end = np.asarray(end, dtype=np.float64).reshape(3)
+        # Rotation and scale as one complex factor
+        r0 = np.asarray(r0, dtype=np.float64)
+        self.factor = complex(*(self.start - self.end)[:2]) / complex(self.sign * r0[0], r0[2])
+
+    def vectors(self, vectors):
+        """
+        Maps (n, 3) vectors (velocities, offsets) without translating them.
+        """
+        vectors = np.atleast_2d(vectors)
+        w = (self.sign * vectors[:, 0] + 1j * vectors[:, 2]) * self.factor
+        return np.column_stack([w.real, w.imag, np.zeros(len(w))])
+
+    def points(self, points):
+        return self.end + self.vectors(points)
+
+    def bezier_points(self, trajectory):
+        """
+        Cubic Bezier control points through the nodes of a trajectory,
+        tangent to its velocity at every node.
+        """
+        dt = trajectory["t"][1] - trajectory["t"][0]
+        return hermite_bezier_points(self.points(trajectory["r"]), self.vectors(trajectory["v"]) * dt / 3)
@@ -0,0 +1,116 @@
+"""
+Level of detail for the discretization nodes drawn along a trajectory.
+
+A trajectory with N nodes is drawn as a fixed number of disk slots, so the
+draw cost stays the same from N = 1 to N = 10^5 and a Transform between
+any two levels moves every slot smoothly instead of realigning a different
+number of disks. The level depends on the on-screen node spacing, i.e. on
+N, the path length and the render resolution together:
+
+    nodes     the nodes are at least min_gap_pixels + 2 * min_radius_pixels
+              apart on screen, so each can be drawn as a separate disk.
+              Disks shrink as N grows so neighbours stay min_gap_pixels
+              apart. With more nodes than slots an evenly spaced subset of
+              distinct nodes is drawn, with fewer the slots stack on them.
+    density   the nodes are closer than that and cannot be told apart. The
+              slots overlap into a continuous band whose opacity grows with
+              the number of nodes per pixel, starting from the share of the
+              path the smallest separate disks cover, so the switch between
+              levels does not jump.
+
+    lod = NodeLOD()
+    dots = lod.dots(arc, 500)            # PointCloud of lod.max_dots disks
+"""
+import numpy as np
+
+
+class LODLevel:
+    """
+    How N nodes are drawn: the node index shown by each slot, the disk radius
+    in scene units and the fill opacity.
+    """
+
+    def __init__(self, kind, num_nodes, indices, radius, opacity=1.0):
+        self.kind = kind
+        self.num_nodes = num_nodes
+        self.indices = indices
+        self.radius = radius
+        self.opacity = opacity
+
+    @property
+    def alphas(self):
+        """
+        Curve parameter of each slot's node, with node i at i / N as in the scenes.
+        """
+        return self.indices / self.num_nodes
+
+    def __repr__(self):
+        return (f"LODLevel({self.kind!r}, num_nodes={self.num_nodes}, "
+                f"radius={self.radius:.4f}, opacity={self.opacity:.2f})")
+
+
+def representative_nodes(num_nodes, num_slots):
+    """
+    Node index for each of num_slots slots: every node, repeated, if there are
+    fewer nodes than slots, otherwise an evenly spaced subset. Always starts at node 0.
+    """
+    return np.arange(num_slots) * num_nodes // num_slots
+
+
+class NodeLOD:
+    """
+    Picks the level for a node count and path, and builds its PointCloud.
+
+    radius is the disk radius for sparse nodes in scene units. pixels_per_unit
+    defaults to the resolution of the current render.
+    """
+
+    def __init__(self, max_dots=400, radius=0.05, min_gap_pixels=2.0, min_radius_pixels=1.5,
+                 pixels_per_unit=None):
+        self.max_dots = max_dots
+        self.radius = radius
+        self.min_gap_pixels = min_gap_pixels
+        self.min_radius_pixels = min_radius_pixels
+        self._pixels_per_unit = pixels_per_unit
+
+    @property
+    def pixels_per_unit(self):
+        if self._pixels_per_unit is not None:
+            return self._pixels_per_unit
+        from manim import config
+
+        return config.pixel_width / config.frame_width
+
+    def level(self, num_nodes, path_length):
+        """
+        The LODLevel for num_nodes nodes along a path of path_length scene units.
+        """
+        num_nodes = max(int(num_nodes), 1)
+        pixel = 1 / self.pixels_per_unit
+        indices = representative_nodes(num_nodes, self.max_dots)
+        node_spacing = path_length / num_nodes / pixel
+        resolvable = self.min_gap_pixels + 2 * self.min_radius_pixels
+        if node_spacing >= resolvable:
+            # Spacing of the disks actually drawn, all nodes or a subset of them
+            spacing = path_length / min(num_nodes, self.max_dots)
+            radius = np.clip((spacing - self.min_gap_pixels * pixel) / 2, self.min_radius_pixels * pixel, self.radius)
+            return LODLevel("nodes", num_nodes, indices, float(radius))
+        # Overlapping slots, the band is as wide as the smallest separate disks
+        # unless the slots are too far apart for that
+        radius = min(max(self.min_radius_pixels * pixel, 0.55 * path_length / self.max_dots), self.radius)
+        # 1 - exp(-k n) for n nodes per pixel, equal to the coverage of separate disks at the switch
+        coverage = 2 * self.min_radius_pixels / resolvable
+        opacity = 1 - (1 - coverage) ** (resolvable / node_spacing)
+        return LODLevel("density", num_nodes, indices, float(radius), float(opacity))
+
+    def dots(self, arc, num_nodes, color=None):
+        """
+        PointCloud of the nodes of arc (an ArcPath) at the level for num_nodes.
+        """
+        from manim import WHITE
+
+        from point_cloud import PointCloud
+
+        level = self.level(num_nodes, arc.length())
+        return PointCloud(arc.points(level.alphas), radii=level.radius, colors=color or WHITE,
+                          fill_opacity=level.opacity)
@@ -0,0 +1,136 @@
+"""
+A histogram whose bars are redrawn in place from a counts array.
+
+BarChart builds a Rectangle per bar plus labels, so showing a distribution
+that changes every frame would mean a new chart per frame. LiveHistogram
+keeps every bar in one VMobject, a rectangle of straight Bezier segments
+per bin placed on existing axes, and set_counts rewrites only the heights
+with a single array operation.
+
+HistogramCounter counts samples into the same bins as np.histogram. Its
+update method counts incrementally: only samples that changed bin since
+the last call are added and removed, which is all that changes between
+two nearby diffusion steps.
+
+    counter = HistogramCounter(edges, trajectory[0])
+    hist = LiveHistogram(axes, edges, counter.counts)
+    hist.add_updater(lambda h: h.set_counts(counter.update(trajectory[int(t.get_value())])))
+"""
+import numpy as np
+from manim import *
+
+# A unit square as 4 straight cubic Bezier segments, counterclockwise from (0, 0)
+_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]], dtype=np.float64)
+_THIRDS = np.array([0, 1, 2, 3]) / 3
+SQUARE_TEMPLATE = np.concatenate([
+    start + _THIRDS[:, None] * (end - start) for start, end in zip(_CORNERS[:-1], _CORNERS[1:])
+])
+POINTS_PER_BAR = len(SQUARE_TEMPLATE)
+
+
+class HistogramCounter:
+    """
+    Counts of samples per bin for fixed bin edges, including values on the
+    last edge and ignoring values outside like np.histogram.
+    """
+
+    def __init__(self, edges, samples=None):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.num_bins = len(self.edges) - 1
+        self.counts = np.zeros(self.num_bins, dtype=np.int64)
+        self.bins = None
+        if samples is not None:
+            self.reset(samples)
+
+    def bin_indices(self, samples):
+        """
+        Bin of every sample, num_bins for samples outside the edges.
+        """
+        samples = np.asarray(samples, dtype=np.float64).ravel()
+        indices = np.searchsorted(self.edges, samples, side="right") - 1
+        indices[samples == self.edges[-1]] = self.num_bins - 1
+        indices[(indices < 0) | (indices >= self.num_bins) | np.isnan(samples)] = self.num_bins
+        return indices
+
+    def _count(self, indices):
+        return np.bincount(indices, minlength=self.num_bins + 1)[:self.num_bins]
+
+    def reset(self, samples):
+        """
+        Counts samples from scratch and remembers their bins for update.
+        """
+        self.bins = self.bin_indices(samples)
+        self.counts = self._count(self.bins)
+        return self.counts
+
+    def update(self, samples):
+        """
+        Counts for new positions of the same samples, touching only those that changed bin.
+        """
+        if self.bins is None:
+            return self.reset(samples)
+        bins = self.bin_indices(samples)
+        if len(bins) != len(self.bins):
+            return self.reset(samples)
+        changed = np.flatnonzero(bins != self.bins)
+        if len(changed):
+            self.counts = self.counts - self._count(self.bins[changed]) + self._count(bins[changed])
+            self.bins = bins
+        return self.counts
+
+    def add(self, samples):
+        """
+        Adds new samples to the counts, for histograms that accumulate over time.
+        """
+        self.counts = self.counts + self._count(self.bin_indices(samples))
+        self.bins = None
+        return self.counts
+
+
+class LiveHistogram(VMobject):
+    """
+    One bar per bin of edges on linear axes, all in a single VMobject.
+
+    scale multiplies the counts before they are drawn in y units of the axes
+    (e.g. 1 / len(samples) for frequencies). bar_width is the fraction of
+    each bin the bar covers.
+    """
+
+    def __init__(self, axes, edges, counts=None, scale=1.0, bar_width=0.9,
+                 color=BLUE, fill_opacity=0.8, stroke_width=0, **kwargs):
+        super().__init__(color=color, fill_opacity=fill_opacity, stroke_width=stroke_width, **kwargs)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.scale = scale
+        origin = np.asarray(axes.c2p(0, 0))
+        x_unit = np.asarray(axes.c2p(1, 0)) - origin
+        self.y_unit = np.asarray(axes.c2p(0, 1)) - origin
+
+        margin = (1 - bar_width) / 2 * np.diff(self.edges)
+        left, right = self.edges[:-1] + margin, self.edges[1:] - margin
+        # Bars without height, the counts only add the y part
+        template_x = SQUARE_TEMPLATE[:, 0]
+        bar_x = left[:, None] + template_x[None, :] * (right - left)[:, None]
+        self.bases = origin + bar_x[:, :, None] * x_unit
+        self.template_y = SQUARE_TEMPLATE[:, 1]
+        self.counts = np.zeros(len(self.edges) - 1)
+        self.set_counts(self.counts if counts is None else counts)
+
+    def set_counts(self, counts):
+        """
+        Redraws every bar for new counts, one array operation.
+        """
+        self.counts = np.asarray(counts, dtype=np.float64)
+        heights = self.scale * self.counts
+        points = self.bases + (heights[:, None] * self.template_y[None, :])[:, :, None] * self.y_unit
+        self.set_points(points.reshape(-1, 3))
+        return self
+
+    def get_counts(self):
+        return self.counts
+
+    def interpolate(self, mobject1, mobject2, alpha, path_func=straight_path()):
+        # Keep counts in step with the points for Transform and .animate
+        super().interpolate(mobject1, mobject2, alpha, path_func)
+        if isinstance(mobject1, LiveHistogram) and isinstance(mobject2, LiveHistogram):
+            self.counts = (1 - alpha) * mobject1.counts + alpha * mobject2.counts
+        return self
@@ -0,0 +1,146 @@
+"""
+Persistent content-addressed cache for Text, Tex and MathTex mobjects.
+
+Building a Text goes through Pango and building a MathTex goes through LaTeX
+and an SVG parse. The finished mobject (its submobject structure and Bezier
+point data) only depends on the strings and the construction arguments, so
+it is pickled to disk under a hash of those and reused by every scene and
+every process. The cache is bounded by size and evicts the least recently
+used entries.
+
+    from mobject_cache import cached_text, cached_math_tex
+
+    label = cached_text("Dynamic equation", font_size=20, color=GRAY)
+    eq = cached_math_tex(r"\\dot{z}(t) = -\\alpha \\xi (t)").scale(0.6)
+
+Set MANIM_TRAJOPT_CACHE to move the cache directory and
+MANIM_TRAJOPT_CACHE_MB to change the size cap.
+"""
+import hashlib
+import os
+import pickle
+
+import manim
+from manim import MathTex, Tex, Text
+
+from atomic_io import write_atomic
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("MANIM_TRAJOPT_CACHE", os.path.join(REPO_DIR, "media", "cache", "mobjects"))
+MAX_CACHE_BYTES = int(float(os.environ.get("MANIM_TRAJOPT_CACHE_MB", 256)) * 1024 * 1024)
+
+# Mobjects already loaded by this process, keyed like the files on disk
+_memory = {}
+
+
+def _key_value(value):
+    """
+    Converts a construction argument into a stable string for hashing.
+    """
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{_key_value(k)}:{_key_value(v)}" for k, v in sorted(value.items(), key=str)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_key_value(v) for v in value) + "]"
+    # TexTemplate: the rendered source is what matters, not object identity
+    body = getattr(value, "body", None)
+    if isinstance(body, str):
+        return "tex_template:" + body
+    return repr(str(value)) if not isinstance(value, (int, float, bool, type(None))) else repr(value)
+
+
+def cache_key(kind, strings, kwargs):
+    payload = "\n".join([
+        manim.__version__,
+        kind,
+        _key_value(list(strings)),
+        _key_value(kwargs),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], key + ".pkl")
+
+
+def _load(path):
+    try:
+        with open(path, "rb") as f:
+            mobject = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    # Mark as recently used for LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return mobject
+
+
+def _store(path, mobject):
+    try:
+        write_atomic(path, lambda f: pickle.dump(mobject, f, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return False
+    return True
+
+
+def evict(max_bytes=None):
+    """
+    Deletes least recently used entries until the cache fits in max_bytes.
+    """
+    if max_bytes is None:
+        max_bytes = MAX_CACHE_BYTES
+    entries = []
+    total = 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def clear():
+    _memory.clear()
+    evict(0)
+
+
+def cached_mobject(kind, build, strings, kwargs):
+    """
+    Returns a fresh copy of build(*strings, **kwargs), constructing it only on a cache miss.
+    """
+    key = cache_key(kind, strings, kwargs)
+    mobject = _memory.get(key)
+    if mobject is None:
+        path = _cache_path(key)
+        mobject = _load(path)
+        if mobject is None:
+            mobject = build(*strings, **kwargs)
+            if _store(path, mobject):
+                evict()
+        _memory[key] = mobject
+    return mobject.copy()
+
+
+def cached_text(text, **kwargs):
+    return cached_mobject("Text", Text, (text,), kwargs)
+
+
+def cached_tex(*tex_strings, **kwargs):
+    return cached_mobject("Tex", Tex, tex_strings, kwargs)
+
+
+def cached_math_tex(*tex_strings, **kwargs):
+    return cached_mobject("MathTex", MathTex, tex_strings, kwargs)
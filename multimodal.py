@@ -2,6 +2,9 @@ from manim import *
 import numpy as np
 import scipy.stats as stats
 
+from fast_plot import plot_function
+from point_cloud import PointCloud
+
 # Utility functions
 def get_distribution_chart(distribution, axes_config, color=BLUE):
     """
@@ -65,11 +68,8 @@ class MSEVsGaussianMLE(Scene):
         self.wait()
 
         # Plot Data Points
-        data_dots = VGroup()
-        for x, y in zip(X, Y):
-            dot = Dot(point=axes.c2p(x, y, 0), color=BLUE)
-            data_dots.add(dot)
-        self.play(LaggedStartMap(FadeIn, data_dots, lag_ratio=0.1, run_time=2))
+        data_dots = PointCloud([axes.c2p(x, y, 0) for x, y in zip(X, Y)], colors=BLUE)
+        self.play(FadeIn(data_dots, run_time=2))
         self.wait(1)
 
         ### 3. PRESENT MSE LOSS FUNCTION ###
@@ -143,9 +143,7 @@ class MSEVsGaussianMLE(Scene):
         # Display a bell curve centered at sample mean
         def gaussian_pdf(x):
             return stats.norm.pdf(x, loc=sample_mean, scale=sigma_true)
-        bell_curve = axes.plot(
-            gaussian_pdf
-        )
+        bell_curve = plot_function(axes, gaussian_pdf)
 
 
         self.play(Create(bell_curve))
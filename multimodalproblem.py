@@ -2,6 +2,9 @@ from manim import *
 import numpy as np
 import scipy.stats as stats
 
+from fast_plot import plot_function
+from point_cloud import PointCloud
+
 # Utility functions
 def get_distribution_chart(distribution, axes_config, color=BLUE):
     """
@@ -68,8 +71,7 @@ class MSEVsGaussianMLEMultimodal(Scene):
                     stats.norm.pdf(x, loc=bimodal_mu2, scale=bimodal_sigma) * bimodal_weights[1])
 
         # Plot the bimodal distribution
-        bimodal_curve = axes.plot(
-            bimodal_pdf        )
+        bimodal_curve = plot_function(axes, bimodal_pdf)
 
         # Animate the transformation
         self.play(FadeIn(bimodal_curve))
@@ -96,27 +98,21 @@ class MSEVsGaussianMLEMultimodal(Scene):
         ### 10. CREATE TWO BALLS ###
         # Center the balls at the means of the bimodal distribution
         # Gaussian distribution for centered and dissipating effect
-        ball_1 = VGroup(*[
-            Dot(
-                point=axes.c2p(
-                    -2 + np.random.normal(0, 0.3),  # Gaussian around -2 with std dev 0.3
-                    1 + np.random.normal(0, 0.3)   # Gaussian around 1 with std dev 0.3
-                ),
-                color=BLUE
+        ball_1 = PointCloud([
+            axes.c2p(
+                -2 + np.random.normal(0, 0.3),  # Gaussian around -2 with std dev 0.3
+                1 + np.random.normal(0, 0.3)   # Gaussian around 1 with std dev 0.3
             )
             for _ in range(50)
-        ])
+        ], colors=BLUE)
 
-        ball_2 = VGroup(*[
-            Dot(
-                point=axes.c2p(
-                    2 + np.random.normal(0, 0.3),  # Gaussian around 2 with std dev 0.3
-                    1 + np.random.normal(0, 0.3)  # Gaussian around 1 with std dev 0.3
-                ),
-                color=BLUE
+        ball_2 = PointCloud([
+            axes.c2p(
+                2 + np.random.normal(0, 0.3),  # Gaussian around 2 with std dev 0.3
+                1 + np.random.normal(0, 0.3)  # Gaussian around 1 with std dev 0.3
             )
             for _ in range(50)
-        ])
+        ], colors=BLUE)
 
 
         # Animate the data
@@ -0,0 +1,115 @@
+"""
+A small NumPy multilayer perceptron behind the NN scene.
+
+MLP has the layer sizes of the scene's network (2 -> 5 -> 15 -> 5 -> 5)
+and returns the activations of every layer for a batch of inputs. The
+model the scene shows is trained to imitate the explicit MPC of
+explicit_mpc.py: it maps a double integrator state (position, velocity) to
+the 5-step input sequence the MPC would apply. The trained weights are
+stored in media/cache/nn_model.npz.
+
+    model = get_model()
+    activations = model.forward(states)     # one (n, size) array per layer
+"""
+import os
+
+import numpy as np
+
+from explicit_mpc import LinearMPC
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(REPO_DIR, "media", "cache", "nn_model.npz")
+LAYER_SIZES = (2, 5, 15, 5, 5)
+STATE_SCALE = np.array([10.0, 5.0])
+
+
+class MLP:
+    """
+    Fully connected network with tanh hidden layers and a linear output layer.
+    """
+
+    def __init__(self, layer_sizes=LAYER_SIZES, seed=0):
+        rng = np.random.default_rng(seed)
+        self.layer_sizes = tuple(layer_sizes)
+        # Glorot-scaled initial weights
+        self.weights = [
+            rng.normal(0.0, np.sqrt(2.0 / (n_in + n_out)), (n_in, n_out))
+            for n_in, n_out in zip(layer_sizes[:-1], layer_sizes[1:])
+        ]
+        self.biases = [np.zeros(n_out) for n_out in layer_sizes[1:]]
+
+    def forward(self, X):
+        """
+        Returns the activations of every layer, input included, for a batch X (n, layer_sizes[0]).
+        """
+        activations = [np.atleast_2d(np.asarray(X, dtype=np.float64))]
+        for i, (W, b) in enumerate(zip(self.weights, self.biases)):
+            z = activations[-1] @ W + b
+            activations.append(z if i == len(self.weights) - 1 else np.tanh(z))
+        return activations
+
+    def __call__(self, X):
+        return self.forward(X)[-1]
+
+    def fit(self, X, Y, iterations=3000, learning_rate=1e-2, beta1=0.9, beta2=0.999):
+        """
+        Full-batch Adam on the mean squared error. Returns the final loss.
+        """
+        parameters = self.weights + self.biases
+        m = [np.zeros_like(p) for p in parameters]
+        v = [np.zeros_like(p) for p in parameters]
+        for t in range(1, iterations + 1):
+            activations = self.forward(X)
+            delta = 2 * (activations[-1] - Y) / len(X)
+            grad_W, grad_b = [], []
+            for i in reversed(range(len(self.weights))):
+                grad_W.append(activations[i].T @ delta)
+                grad_b.append(delta.sum(axis=0))
+                if i:
+                    delta = (delta @ self.weights[i].T) * (1 - activations[i] ** 2)
+            gradients = grad_W[::-1] + grad_b[::-1]
+            for p, g, m_p, v_p in zip(parameters, gradients, m, v):
+                m_p *= beta1
+                m_p += (1 - beta1) * g
+                v_p *= beta2
+                v_p += (1 - beta2) * g ** 2
+                p -= learning_rate * (m_p / (1 - beta1 ** t)) / (np.sqrt(v_p / (1 - beta2 ** t)) + 1e-8)
+        return float(np.mean((self(X) - Y) ** 2))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {f"W{i}": W for i, W in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(path, layer_sizes=np.array(self.layer_sizes), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            model = cls(data["layer_sizes"])
+            model.weights = [data[f"W{i}"] for i in range(len(model.weights))]
+            model.biases = [data[f"b{i}"] for i in range(len(model.biases))]
+        return model
+
+
+def mpc_training_data(num_samples=1000, seed=0):
+    """
+    Double integrator states in the explicit MPC's box, scaled to [-1, 1],
+    and the MPC input sequences for them.
+    """
+    mpc = LinearMPC.double_integrator()
+    rng = np.random.default_rng(seed)
+    states = rng.uniform(-STATE_SCALE, STATE_SCALE, (num_samples, 2))
+    inputs = np.array([mpc.solve_qp(x) for x in states])
+    return states / STATE_SCALE, inputs
+
+
+def get_model(path=MODEL_PATH):
+    """
+    Returns the trained model, training and saving it first if the file is missing.
+    """
+    if os.path.exists(path):
+        return MLP.load(path)
+    model = MLP()
+    model.fit(*mpc_training_data())
+    model.save(path)
+    return model
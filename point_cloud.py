@@ -0,0 +1,156 @@
+"""
+Array-backed point cloud to replace VGroups of individual Dots.
+
+A VGroup of n Dots is n full VMobjects, each with its own Bezier circle and
+attributes, drawn one at a time. PointCloud keeps every disk of the same
+color in a single VMobject whose points are one contiguous (4 * 4 * n, 3)
+array, generated from the positions and radii with one NumPy expression.
+Each color batch is drawn with one fill call and the cloud animates as a
+whole with Transform, FadeIn or .animate.set_positions(...). MovePointSet
+moves every disk to new centers without copying the cloud, and can drag
+polylines through the centers along with it.
+"""
+import numpy as np
+from manim import *
+
+# A unit circle as 4 cubic Bezier segments (4 points each), 16 points per disk
+_KAPPA = 4 * (np.sqrt(2) - 1) / 3
+_QUARTER = np.array([[1, 0, 0], [1, _KAPPA, 0], [_KAPPA, 1, 0], [0, 1, 0]], dtype=np.float64)
+_ROTATE_90 = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]], dtype=np.float64)
+CIRCLE_TEMPLATE = np.concatenate([
+    _QUARTER @ np.linalg.matrix_power(_ROTATE_90, k).T for k in range(4)
+])
+POINTS_PER_DISK = len(CIRCLE_TEMPLATE)
+
+
+def _as_points(positions):
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.ndim == 1:
+        positions = positions.reshape(1, -1)
+    if positions.shape[1] == 2:
+        positions = np.column_stack([positions, np.zeros(len(positions))])
+    return positions
+
+
+def disk_points(positions, radii):
+    """
+    Returns the Bezier points of one disk per position, shape (n * 16, 3).
+    """
+    positions = _as_points(positions)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(positions),))
+    points = positions[:, None, :] + radii[:, None, None] * CIRCLE_TEMPLATE[None, :, :]
+    return points.reshape(-1, 3)
+
+
+class PointCloud(VGroup):
+    """
+    n filled disks stored as one VMobject per distinct color.
+
+    positions is (n, 2) or (n, 3), radii a scalar or (n,) array and colors a
+    single color or one color per point.
+    """
+
+    def __init__(self, positions, radii=DEFAULT_DOT_RADIUS, colors=WHITE, fill_opacity=1.0, **kwargs):
+        positions = _as_points(positions)
+        n = len(positions)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (n,)).copy()
+        per_point = (
+            isinstance(colors, (list, tuple))
+            and len(colors) == n
+            and not all(isinstance(c, (int, float)) for c in colors)
+        )
+        point_colors = list(colors) if per_point else [colors] * n
+
+        # Group points by color, remembering where each one lives
+        keys = [str(ManimColor(c)) for c in point_colors]
+        unique_keys = list(dict.fromkeys(keys))
+        self.batch_of_point = np.array([unique_keys.index(k) for k in keys], dtype=np.int64)
+        self.batch_indices = [np.flatnonzero(self.batch_of_point == b) for b in range(len(unique_keys))]
+
+        batches = []
+        for key, indices in zip(unique_keys, self.batch_indices):
+            batch = VMobject(fill_color=ManimColor(key), fill_opacity=fill_opacity, stroke_width=0)
+            batch.set_points(disk_points(positions[indices], radii[indices]))
+            batches.append(batch)
+        super().__init__(*batches, **kwargs)
+
+    @property
+    def num_points(self):
+        return len(self.batch_of_point)
+
+    def _disk_array(self, batch):
+        return batch.points.reshape(-1, POINTS_PER_DISK, 3)
+
+    def get_positions(self):
+        """
+        Returns the (n, 3) disk centers, read back from the current points.
+        """
+        positions = np.zeros((self.num_points, 3))
+        for batch, indices in zip(self.submobjects, self.batch_indices):
+            # The control points of a Bezier circle are symmetric about its center
+            positions[indices] = self._disk_array(batch).mean(axis=1)
+        return positions
+
+    def get_radii(self):
+        radii = np.zeros(self.num_points)
+        for batch, indices in zip(self.submobjects, self.batch_indices):
+            disks = self._disk_array(batch)
+            radii[indices] = np.linalg.norm(disks[:, 0] - disks.mean(axis=1), axis=1)
+        return radii
+
+    def set_positions(self, positions, radii=None):
+        """
+        Moves every disk to a new center, optionally with new radii.
+        """
+        positions = _as_points(positions)
+        radii = self.get_radii() if radii is None else np.broadcast_to(radii, (self.num_points,))
+        for batch, indices in zip(self.submobjects, self.batch_indices):
+            batch.set_points(disk_points(positions[indices], radii[indices]))
+        return self
+
+    def set_radii(self, radii):
+        return self.set_positions(self.get_positions(), radii)
+
+
+class MovePointSet(Animation):
+    """
+    Moves the disks of a PointCloud from their current centers to end_positions (n, 2|3).
+
+    Each frame computes the (n, 3) centers in one call of path_func and
+    rewrites the disks from them. Every VMobject in polylines is redrawn
+    through the same centers, e.g. the line connecting trajectory nodes.
+    """
+
+    def __init__(self, cloud, end_positions, path_func=None, polylines=(), **kwargs):
+        self.end_positions = _as_points(end_positions)
+        if len(self.end_positions) != cloud.num_points:
+            raise ValueError(f"{len(self.end_positions)} end positions for a cloud of {cloud.num_points} points")
+        self.path_func = path_func or straight_path()
+        self.polylines = list(polylines)
+        super().__init__(cloud, **kwargs)
+
+    def create_starting_mobject(self):
+        # The start is kept as an array, a copy of the cloud is not needed
+        return Mobject()
+
+    def begin(self):
+        self.start_positions = self.mobject.get_positions()
+        self.radii = self.mobject.get_radii()
+        self.positions = self.start_positions.copy()
+        # Polylines update after each interpolation, which also makes the scene redraw them
+        for polyline in self.polylines:
+            polyline.add_updater(self._redraw_polyline)
+        super().begin()
+
+    def _redraw_polyline(self, polyline):
+        polyline.set_points_as_corners(self.positions)
+
+    def interpolate_mobject(self, alpha):
+        self.positions = self.path_func(self.start_positions, self.end_positions, self.rate_func(alpha))
+        self.mobject.set_positions(self.positions, self.radii)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        for polyline in self.polylines:
+            polyline.remove_updater(self._redraw_polyline)
+            self._redraw_polyline(polyline)
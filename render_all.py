@@ -0,0 +1,168 @@
+"""
+Render every scene in the repository in parallel.
+
+Each scene is rendered by its own ``manim`` process, with at most ``--jobs``
+processes running at once. Scenes are started longest-first using the
+durations recorded by the previous run, so the total wall time approaches
+that of the slowest single scene.
+
+    $ python render_all.py -q h -j 8
+    $ python render_all.py --list
+    $ python render_all.py IntroScene diffusion_explanation:Motivation
+
+Scenes whose optional dependencies are missing (e.g. manim_ml for NN.py)
+are reported as skipped instead of failing the run. Benchmark results that
+scenes display (screening.py, explicit_mpc.py) are written once before the
+renders start, rather than in every scene process that finds them missing.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import scene_registry
+
+TIMINGS_FILE = os.path.join(scene_registry.REPO_DIR, "media", "render_times.json")
+# Modules whose BENCHMARK_PATH results scenes read, written by their write_benchmark
+PRECOMPUTED = ("explicit_mpc", "screening")
+
+
+def load_timings(path=TIMINGS_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings, path=TIMINGS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+
+def precompute(entries):
+    """
+    Writes the missing benchmark results that the given scenes import.
+    """
+    imported = {name for entry in entries for name in entry.imports}
+    for name in PRECOMPUTED:
+        if name not in imported:
+            continue
+        module = importlib.import_module(name)
+        if os.path.exists(module.BENCHMARK_PATH):
+            continue
+        start = time.perf_counter()
+        module.write_benchmark()
+        print(f"{os.path.relpath(module.BENCHMARK_PATH):45s} written [{time.perf_counter() - start:.1f}s]", flush=True)
+
+
+def manim_command(entry, quality="h", extra_args=()):
+    return [
+        sys.executable, "-m", "manim", "render",
+        f"-q{quality}",
+        *extra_args,
+        os.path.basename(entry.path),
+        entry.class_name,
+    ]
+
+
+def render_scene(entry, quality="h", extra_args=(), log_dir=None):
+    """
+    Renders one scene in a separate manim process and returns (returncode, seconds).
+    """
+    command = manim_command(entry, quality, extra_args)
+    start = time.perf_counter()
+    if log_dir is None:
+        result = subprocess.run(command, cwd=scene_registry.REPO_DIR,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        os.makedirs(log_dir, exist_ok=True)
+        log_path = os.path.join(log_dir, entry.key.replace(":", ".") + ".log")
+        with open(log_path, "w") as log:
+            result = subprocess.run(command, cwd=scene_registry.REPO_DIR,
+                                    stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - start
+
+
+def select_scenes(names, entries):
+    if not names:
+        return entries
+    return [scene_registry.find(name, entries) for name in names]
+
+
+def render_all(entries, jobs=None, quality="h", extra_args=(), log_dir=None):
+    """
+    Renders the given scenes across a pool of manim processes.
+    Returns a list of (entry, status, seconds) in completion order.
+    """
+    timings = load_timings()
+    results = []
+    runnable = []
+    for entry in entries:
+        missing = entry.missing_dependencies()
+        if missing:
+            results.append((entry, "skipped (missing " + ", ".join(missing) + ")", 0.0))
+        else:
+            runnable.append(entry)
+
+    precompute(runnable)
+    # Longest scenes first, unknown durations count as longest
+    runnable.sort(key=lambda e: -timings.get(e.key, float("inf")))
+
+    jobs = jobs or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(render_scene, entry, quality, extra_args, log_dir): entry
+            for entry in runnable
+        }
+        for future in as_completed(futures):
+            entry = futures[future]
+            returncode, seconds = future.result()
+            status = "ok" if returncode == 0 else f"failed (exit {returncode})"
+            if returncode == 0:
+                timings[entry.key] = seconds
+            results.append((entry, status, seconds))
+            print(f"{entry.key:45s} {status} [{seconds:.1f}s]", flush=True)
+
+    save_timings(timings)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help="scene keys or class names (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="parallel manim processes (default: cpu count)")
+    parser.add_argument("-q", "--quality", default="h", choices=["l", "m", "h", "p", "k"])
+    parser.add_argument("--list", action="store_true", help="list the registered scenes and exit")
+    parser.add_argument("--log-dir", default=None, help="write each scene's manim output to this directory")
+    parser.add_argument("--manim-args", default="", help="extra arguments passed to every manim call")
+    args = parser.parse_args(argv)
+
+    try:
+        entries = select_scenes(args.scenes, scene_registry.discover())
+    except KeyError as e:
+        parser.error(e.args[0])
+    if args.list:
+        for entry in entries:
+            print(entry.key)
+        return 0
+
+    start = time.perf_counter()
+    results = render_all(entries, args.jobs, args.quality, args.manim_args.split(), args.log_dir)
+    total = time.perf_counter() - start
+
+    print()
+    for entry, status, seconds in sorted(results, key=lambda r: r[0].key):
+        print(f"{entry.key:45s} {status:30s} {seconds:8.1f}s")
+    serial = sum(seconds for _, _, seconds in results)
+    print(f"\nWall time {total:.1f}s (sum of scene times {serial:.1f}s)")
+    return 0 if all(not status.startswith("failed") for _, status, _ in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
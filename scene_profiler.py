@@ -0,0 +1,269 @@
+"""
+Opt-in per-animation profiler for the scenes.
+
+profile_scene renders one scene in-process with timers around the
+scene's play/wait calls, the renderer's frame updates (rasterization),
+the file writer (encoding) and Tex/Text construction. Each play or wait
+becomes one record with the line of the scene file that issued it:
+
+    construction_time   time in construct since the previous call ended,
+                        of which tex_time and text_time building Tex/Text
+    play_time           the call itself, of which raster_time and encode_time
+    frames, time_per_frame
+    mobjects, points    family size and Bezier points on screen afterwards
+
+The report is written as JSON and summarized by call site, so a line whose
+many cheap calls add up (a loop of per-dot .animate calls) ranks by its total.
+
+    $ python scene_profiler.py diffusion_explanation:Motivation -q l
+    $ python scene_profiler.py                # every scene
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import scene_registry
+from frame_export import QUALITIES
+
+REPORT_PATH = os.path.join(scene_registry.REPO_DIR, "media", "profile", "{scene}.json")
+
+
+class Timer:
+    """
+    Accumulates the time spent in the wrapped callables. Nested calls of
+    the same timer (a MathTex building its parts) are only counted once.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.depth = 0
+
+    def wrap(self, function):
+        def wrapper(*args, **kwargs):
+            self.depth += 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                if not self.depth:
+                    self.total += time.perf_counter() - start
+        wrapper.__wrapped__ = function
+        return wrapper
+
+
+def _call_site(scene_file):
+    """
+    Line of scene_file that is executing, or the innermost caller outside manim and this module.
+    """
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if os.path.abspath(path) == scene_file:
+            return f"{os.path.basename(path)}:{frame.f_lineno}"
+        if fallback is None and "manim" not in path and path != __file__:
+            fallback = f"{os.path.basename(path)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return fallback or "?"
+
+
+def _scene_size(scene):
+    family = [member for mobject in scene.mobjects for member in mobject.get_family()]
+    return len(family), int(sum(len(member.points) for member in family))
+
+
+class SceneProfiler:
+    """
+    Patches one scene instance and the Tex/Text classes, recording a record per play/wait.
+    """
+
+    def __init__(self, scene):
+        import inspect
+
+        from manim import MarkupText, Text
+        from manim.mobject.text.tex_mobject import SingleStringMathTex
+
+        self.scene = scene
+        self.scene_file = os.path.abspath(inspect.getfile(type(scene)))
+        self.records = []
+        self.tex, self.text = Timer(), Timer()
+        self.raster, self.encode = Timer(), Timer()
+        self.frames = 0
+        self.depth = 0
+        # Tex/Text totals when the previous call ended
+        self.tex_mark, self.text_mark = 0.0, 0.0
+        self.classes = [(SingleStringMathTex, self.tex), (Text, self.text), (MarkupText, self.text)]
+
+    def __enter__(self):
+        scene = self.scene
+        renderer = scene.renderer
+        self.originals = [(cls, cls.__init__) for cls, _ in self.classes]
+        for cls, timer in self.classes:
+            cls.__init__ = timer.wrap(cls.__init__)
+        renderer.update_frame = self.raster.wrap(renderer.update_frame)
+        write_frame = renderer.file_writer.write_frame
+
+        def counted_write_frame(frame, *args, **kwargs):
+            self.frames += args[0] if args else kwargs.get("num_frames", 1)
+            return write_frame(frame, *args, **kwargs)
+
+        renderer.file_writer.write_frame = self.encode.wrap(counted_write_frame)
+        scene.play = self._wrap_call(scene.play, "play")
+        scene.wait = self._wrap_call(scene.wait, "wait")
+        self.last_end = time.perf_counter()
+        self.start = self.last_end
+        return self
+
+    def __exit__(self, *exc):
+        for cls, init in self.originals:
+            cls.__init__ = init
+        self.total_time = time.perf_counter() - self.start
+        return False
+
+    def _wrap_call(self, method, kind):
+        def wrapper(*args, **kwargs):
+            # wait() goes through play(); only the outer call is recorded
+            if self.depth:
+                return method(*args, **kwargs)
+            before = dict(
+                start=time.perf_counter(), tex=self.tex.total, text=self.text.total,
+                raster=self.raster.total, encode=self.encode.total, frames=self.frames,
+            )
+            site = _call_site(self.scene_file)
+            self.depth += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                self._record(kind, site, before)
+        return wrapper
+
+    def _record(self, kind, site, before):
+        end = time.perf_counter()
+        frames = self.frames - before["frames"]
+        play_time = end - before["start"]
+        mobjects, points = _scene_size(self.scene)
+        # Tex/Text built before the call count as construction
+        self.records.append(dict(
+            index=len(self.records), kind=kind, site=site,
+            construction_time=before["start"] - self.last_end,
+            tex_time=before["tex"] - self.tex_mark,
+            text_time=before["text"] - self.text_mark,
+            play_time=play_time,
+            raster_time=self.raster.total - before["raster"],
+            encode_time=self.encode.total - before["encode"],
+            frames=frames,
+            time_per_frame=play_time / frames if frames else None,
+            mobjects=mobjects,
+            points=points,
+        ))
+        self.tex_mark, self.text_mark = self.tex.total, self.text.total
+        self.last_end = end
+
+
+def summarize(records, top=10):
+    """
+    Totals per call site, ranked by construction plus play time.
+    """
+    sites = defaultdict(lambda: dict(calls=0, time=0.0, construction_time=0.0, play_time=0.0, frames=0))
+    for record in records:
+        site = sites[record["site"]]
+        site["calls"] += 1
+        site["construction_time"] += record["construction_time"]
+        site["play_time"] += record["play_time"]
+        site["time"] += record["construction_time"] + record["play_time"]
+        site["frames"] += record["frames"]
+    ranked = sorted(sites.items(), key=lambda item: -item[1]["time"])
+    return [dict(site=name, **values) for name, values in ranked[:top]]
+
+
+def profile_scene(scene_class, quality="l"):
+    """
+    Renders scene_class with profiling and returns the report dict.
+    """
+    from manim import tempconfig
+
+    import section_cache
+
+    settings = {"quality": QUALITIES[quality], "disable_caching": True, "preview": False}
+    # Cached sections would hide the work being measured
+    sections_enabled, section_cache.ENABLED = section_cache.ENABLED, False
+    try:
+        with tempconfig(settings):
+            scene = scene_class()
+            with SceneProfiler(scene) as profiler:
+                scene.render()
+    finally:
+        section_cache.ENABLED = sections_enabled
+    records = profiler.records
+    return dict(
+        scene=scene_class.__name__,
+        quality=QUALITIES[quality],
+        total_time=profiler.total_time,
+        totals=dict(
+            construction_time=sum(r["construction_time"] for r in records),
+            tex_time=profiler.tex.total,
+            text_time=profiler.text.total,
+            play_time=sum(r["play_time"] for r in records),
+            raster_time=profiler.raster.total,
+            encode_time=profiler.encode.total,
+            frames=profiler.frames,
+        ),
+        summary=summarize(records),
+        calls=records,
+    )
+
+
+def format_summary(report, top=5):
+    totals = report["totals"]
+    lines = [
+        f"{report['scene']} ({report['quality']}): {report['total_time']:.1f}s total, "
+        f"{totals['frames']} frames, construction {totals['construction_time']:.1f}s "
+        f"(tex {totals['tex_time']:.1f}s, text {totals['text_time']:.1f}s), "
+        f"raster {totals['raster_time']:.1f}s, encode {totals['encode_time']:.1f}s"
+    ]
+    for site in report["summary"][:top]:
+        lines.append(
+            f"  {site['site']:28s} {site['time']:7.2f}s  {site['calls']:4d} calls  {site['frames']:5d} frames"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the play/wait calls of the scenes.")
+    parser.add_argument("scenes", nargs="*", help="scene keys or class names (default: all)")
+    parser.add_argument("-q", "--quality", default="l", choices=sorted(QUALITIES))
+    parser.add_argument("-o", "--output", default=REPORT_PATH, help="report path, {scene} is replaced by the scene key")
+    args = parser.parse_args(argv)
+
+    entries = scene_registry.discover()
+    try:
+        entries = [scene_registry.find(name, entries) for name in args.scenes] if args.scenes else entries
+    except KeyError as e:
+        parser.error(e.args[0])
+    status = 0
+    for entry in entries:
+        missing = entry.missing_dependencies()
+        if missing:
+            print(f"{entry.key}: skipped (missing {', '.join(missing)})")
+            continue
+        try:
+            report = profile_scene(scene_registry.load_scene_class(entry), args.quality)
+        except Exception as e:
+            print(f"{entry.key}: failed: {e}")
+            status = 1
+            continue
+        path = args.output.format(scene=entry.key.replace(":", "."))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(format_summary(report))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Registry of every manim Scene in the repository.
+
+Scenes are discovered by parsing the source files rather than importing them,
+so listing the scenes never needs manim or optional dependencies such as
+manim_ml (used by NN.py).
+
+Every scene has a unique key of the form ``module:Class``. Bare class names
+can be used to look a scene up as long as they are unambiguous, e.g.
+``IntroScene`` works but ``Motivation`` must be written as
+``Motivation:Motivation`` or ``diffusion_explanation:Motivation``.
+"""
+import ast
+import importlib.util
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Base classes from manim that mark a class as a renderable scene
+MANIM_SCENE_BASES = {
+    "Scene",
+    "ThreeDScene",
+    "MovingCameraScene",
+    "ZoomedScene",
+    "VectorScene",
+    "LinearTransformationScene",
+    "SpecialThreeDScene",
+}
+
+
+class SceneEntry:
+    """
+    A discovered Scene subclass and the modules its file imports.
+    """
+
+    def __init__(self, path, class_name, lineno, imports):
+        self.path = path
+        self.class_name = class_name
+        self.lineno = lineno
+        self.imports = imports
+
+    @property
+    def module(self):
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    @property
+    def key(self):
+        return f"{self.module}:{self.class_name}"
+
+    def missing_dependencies(self):
+        """
+        Returns the top-level modules imported by the scene file that are not installed.
+        """
+        if REPO_DIR not in sys.path:
+            sys.path.insert(0, REPO_DIR)
+        missing = []
+        for name in self.imports:
+            try:
+                if importlib.util.find_spec(name) is None:
+                    missing.append(name)
+            except (ImportError, ValueError):
+                missing.append(name)
+        return missing
+
+    def __repr__(self):
+        return f"SceneEntry({self.key!r})"
+
+
+def _base_names(class_node):
+    names = []
+    for base in class_node.bases:
+        if isinstance(base, ast.Name):
+            names.append(base.id)
+        elif isinstance(base, ast.Attribute):
+            names.append(base.attr)
+    return names
+
+
+def _defines_construct(class_node):
+    return any(
+        isinstance(node, ast.FunctionDef) and node.name == "construct"
+        for node in class_node.body
+    )
+
+
+def _top_level_imports(tree):
+    imports = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            top = name.split(".")[0]
+            if top not in imports:
+                imports.append(top)
+    return imports
+
+
+def scan_file(path):
+    """
+    Returns the SceneEntry for every concrete Scene subclass defined in a file.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    imports = _top_level_imports(tree)
+
+    scene_classes = {}
+    entries = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = _base_names(node)
+        parents = [scene_classes[b] for b in bases if b in scene_classes]
+        if not parents and not MANIM_SCENE_BASES.intersection(bases):
+            continue
+        has_construct = _defines_construct(node) or any(parents)
+        scene_classes[node.name] = has_construct
+        if has_construct:
+            entries.append(SceneEntry(path, node.name, node.lineno, imports))
+    return entries
+
+
+def discover(directory=REPO_DIR):
+    """
+    Returns every scene found in the top-level python files of a directory.
+    """
+    entries = []
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".py") or file_name.startswith("_"):
+            continue
+        entries.extend(scan_file(os.path.join(directory, file_name)))
+    return entries
+
+
+def find(name, entries=None):
+    """
+    Looks up a scene by key (``module:Class``), ``file.py:Class`` or unambiguous class name.
+    """
+    if entries is None:
+        entries = discover()
+    if ":" in name:
+        module, class_name = name.split(":", 1)
+        module = os.path.splitext(os.path.basename(module))[0]
+        matches = [e for e in entries if e.module == module and e.class_name == class_name]
+    else:
+        matches = [e for e in entries if e.class_name == name]
+    if not matches:
+        raise KeyError(f"No scene named {name!r}")
+    if len(matches) > 1:
+        options = ", ".join(e.key for e in matches)
+        raise KeyError(f"Scene name {name!r} is ambiguous, use one of: {options}")
+    return matches[0]
+
+
+def load_scene_class(entry):
+    """
+    Imports the scene's module and returns the Scene class itself.
+    """
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    spec = importlib.util.spec_from_file_location(entry.module, entry.path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[entry.module] = module
+    spec.loader.exec_module(module)
+    return getattr(module, entry.class_name)
+
+
+if __name__ == "__main__":
+    for entry in discover():
+        missing = entry.missing_dependencies()
+        note = f"  (missing: {', '.join(missing)})" if missing else ""
+        print(f"{entry.key:45s} {os.path.basename(entry.path)}:{entry.lineno}{note}")
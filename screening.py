@@ -0,0 +1,301 @@
+"""
+Tight-constraint screening for the LCvx powered descent problem.
+
+Most inequality constraints of a solved LCvx instance are slack. If the
+tight ones are known in advance the interior-point method only needs those,
+and its KKT system shrinks accordingly. ScreenedSolver
+
+    1. asks a predictor which constraints are likely tight,
+    2. solves the problem with the equalities and those constraints only,
+    3. checks the result against every constraint of the full problem and
+       adds back the violated ones, repeating until nothing is violated.
+
+A solution of the reduced problem that satisfies all constraints is optimal
+for the full problem, so screening never changes the answer, only the cost
+of reaching it. The thrust constraints are always kept: lossless
+convexification makes them the binding structure of the problem, and
+without them the reduced problem is unbounded. A reduced solve that fails
+anyway falls back to the full constraint set.
+
+A constraint "unit" is one linear inequality or one whole second-order cone.
+A predictor is any callable taking the initial state (r0, v0) as a length-6
+array and returning a boolean mask over the units.
+
+    python screening.py --instances 40      # writes media/cache/screening.json
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from atomic_io import load_json, write_json
+from lcvx_problem import DEFAULT_PARAMETERS
+from lcvx_solver import get_solver
+from socp import ConeProgram
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_PATH = os.path.join(REPO_DIR, "media", "cache", "screening.json")
+ALWAYS_KEEP = ("thrust_lower", "thrust_upper", "thrust_magnitude")
+
+
+class NearestNeighborPredictor:
+    """
+    Predicts the union of the tight sets of the k nearest solved instances,
+    with initial states compared after scaling each coordinate to unit spread.
+    """
+
+    def __init__(self, k=3):
+        self.k = k
+        self.states = None
+        self.masks = None
+
+    def fit(self, states, masks):
+        self.states = np.asarray(states, dtype=np.float64)
+        self.masks = np.asarray(masks, dtype=bool)
+        self.scale = self.states.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        return self
+
+    def __call__(self, state):
+        distances = np.linalg.norm((self.states - state) / self.scale, axis=1)
+        nearest = np.argsort(distances)[:self.k]
+        return self.masks[nearest].any(axis=0)
+
+
+class ScreenedSolver:
+    """
+    Solves LCvx instances on a predicted subset of the inequality constraints,
+    adding violated constraints back until the full problem is satisfied.
+    Reduced programs are cached per subset, like the full one in get_solver.
+
+    Without a predictor (e.g. a fitted NearestNeighborPredictor) every solve
+    needs an explicit mask.
+    """
+
+    def __init__(self, N=20, predictor=None, always_keep=ALWAYS_KEEP, feasibility_tol=1e-6,
+                 max_rounds=10, **parameters):
+        self.full = get_solver(N, **parameters)
+        self.problem = self.full.problem
+        self.predictor = predictor
+        self.feasibility_tol = feasibility_tol
+        self.max_rounds = max_rounds
+        cones = self.problem.cones
+        self.num_linear = cones["l"]
+        self.cone_dims = cones["q"]
+        self.num_units = self.num_linear + len(self.cone_dims)
+        self.unit_of_row = np.concatenate([
+            np.arange(self.num_linear),
+            self.num_linear + np.repeat(np.arange(len(self.cone_dims)), self.cone_dims),
+        ])
+        self.cone_starts = self.num_linear + np.concatenate([[0], np.cumsum(self.cone_dims)[:-1]]).astype(np.int64)
+        self.families = self.unit_families(self.problem)
+        self.always_keep = np.isin(self.families, always_keep)
+        self._programs = {}
+
+    @staticmethod
+    def unit_families(problem):
+        """
+        Returns the family name of every constraint unit.
+        """
+        names = np.empty(problem.cones["l"] + len(problem.cones["q"]), dtype=object)
+        for name, (kind, start, stop, count) in problem.families.items():
+            if kind == "l":
+                names[start:stop] = name
+            elif kind == "q":
+                # Cones are numbered after the linear rows, in row order
+                first = problem.cones["l"] + np.searchsorted(
+                    np.cumsum(np.concatenate([[0], problem.cones["q"]])), start - problem.cones["l"])
+                names[first:first + count] = name
+        return names
+
+    def _unit_slacks(self, s, z=None):
+        """
+        Per-unit primal slack (s0 - ||s1|| for cones) and, when z is given, the matching dual size.
+        """
+        slack = np.empty(self.num_units)
+        slack[:self.num_linear] = s[:self.num_linear]
+        dual = np.empty(self.num_units) if z is not None else None
+        if z is not None:
+            dual[:self.num_linear] = z[:self.num_linear]
+        for dim in np.unique(self.cone_dims):
+            cones = np.flatnonzero(self.cone_dims == dim)
+            idx = self.cone_starts[cones][:, None] + np.arange(dim)
+            S = s[idx]
+            slack[self.num_linear + cones] = S[:, 0] - np.linalg.norm(S[:, 1:], axis=1)
+            if z is not None:
+                Z = z[idx]
+                dual[self.num_linear + cones] = Z[:, 0] - np.linalg.norm(Z[:, 1:], axis=1)
+        return slack, dual
+
+    def _unit_scale(self):
+        # 1 + the largest |h| over the rows of each unit
+        starts = np.concatenate([np.arange(self.num_linear), self.cone_starts])
+        return np.maximum.reduceat(1.0 + np.abs(self.problem.h), starts)
+
+    def tight_units(self, result, tol=1e-6):
+        """
+        Marks the units of a full solution that are (nearly) tight: slack
+        below tol relative to the unit's scale, or a dual larger than the slack.
+        """
+        slack, dual = self._unit_slacks(result["s"], result["z"])
+        return (slack <= tol * self._unit_scale()) | (dual > slack)
+
+    def violations(self, x):
+        """
+        Returns the mask of units the point x violates in the full problem.
+        """
+        s = self.problem.h - self.problem.G @ x
+        slack, _ = self._unit_slacks(s)
+        return slack < -self.feasibility_tol * self._unit_scale()
+
+    def _program(self, mask):
+        key = mask.tobytes()
+        if key not in self._programs:
+            p = self.problem
+            rows = mask[self.unit_of_row]
+            cones = {"l": int(mask[:self.num_linear].sum()), "q": self.cone_dims[mask[self.num_linear:]]}
+            self._programs[key] = ConeProgram(p.c, p.G[rows], p.h[rows], cones, A=p.A_eq, b=p.b_eq)
+        program = self._programs[key]
+        program.update(b=self.problem.b_eq)
+        return program
+
+    def solve(self, r0=None, v0=None, mask=None):
+        """
+        Solves one instance with screening. Returns the trajectory with the
+        screening statistics: rounds, units kept and added back, whether it
+        fell back to the full set, total IPM iterations and solve_time.
+        """
+        parameters = self.problem.parameters
+        r0 = np.asarray(parameters["r0"] if r0 is None else r0, dtype=np.float64)
+        v0 = np.asarray(parameters["v0"] if v0 is None else v0, dtype=np.float64)
+        start = time.perf_counter()
+        if mask is None:
+            if self.predictor is None:
+                raise ValueError("ScreenedSolver.solve needs a mask when no predictor is set")
+            mask = self.predictor(np.concatenate([r0, v0]))
+        mask = np.array(mask, dtype=bool) | self.always_keep
+        kept = int(mask.sum())
+        self.problem.set_initial_state(r0, v0)
+        iterations, added, fallback = 0, 0, False
+        for rounds in range(1, self.max_rounds + 1):
+            result = self._program(mask).solve()
+            iterations += result["iterations"]
+            if result["status"] != "optimal":
+                if mask.all():
+                    raise RuntimeError(f"LCvx solve stopped with status {result['status']!r}")
+                fallback = True
+                added += int((~mask).sum())
+                mask[:] = True
+                continue
+            violated = self.violations(result["x"])
+            if not violated.any():
+                break
+            added += int(violated.sum())
+            mask |= violated
+        else:
+            raise RuntimeError(f"Screening did not converge in {self.max_rounds} rounds")
+        trajectory = self.problem.unpack(result["x"])
+        trajectory.update(
+            status=result["status"], objective=result["objective"], iterations=iterations,
+            rounds=rounds, kept=kept, added=added, fallback=fallback,
+            solve_time=time.perf_counter() - start,
+        )
+        return trajectory
+
+
+def sample_instances(num_instances, seed=0, parameters=DEFAULT_PARAMETERS):
+    """
+    Draws initial states (r0, v0) around the default ones, as an (n, 6) array.
+    """
+    rng = np.random.default_rng(seed)
+    center = np.concatenate([parameters["r0"], parameters["v0"]])
+    spread = np.array([400.0, 400.0, 300.0, 20.0, 20.0, 20.0])
+    return center + rng.uniform(-1.0, 1.0, (num_instances, 6)) * spread
+
+
+def benchmark(N=20, num_train=40, num_test=40, seed=0, predictor=None):
+    """
+    Fits a NearestNeighborPredictor (unless one is given) on full solves of
+    training instances, then solves the test instances with and without
+    screening. Infeasible instances are skipped. Returns a JSON-ready dict
+    of median times, iteration counts, KKT sizes and the fallback rate.
+    """
+    screened = ScreenedSolver(N)
+    full = screened.full
+    if predictor is None:
+        states, masks = [], []
+        for state in sample_instances(num_train, seed):
+            screened.problem.set_initial_state(state[:3], state[3:])
+            full.program.update(b=screened.problem.b_eq)
+            result = full.program.solve()
+            if result["status"] == "optimal":
+                states.append(state)
+                masks.append(screened.tight_units(result))
+        predictor = NearestNeighborPredictor().fit(states, masks)
+    screened.predictor = predictor
+
+    runs = []
+    for state in sample_instances(num_test, seed + 1):
+        try:
+            reference = full.solve(state[:3], state[3:])
+        except RuntimeError:
+            continue
+        # Warm the cache of reduced programs so only solve time is compared
+        mask = predictor(state) | screened.always_keep
+        kkt_size = screened._program(mask).kkt.size
+        result = screened.solve(state[:3], state[3:], mask=mask)
+        runs.append(dict(
+            full_time=reference["solve_time"], screened_time=result["solve_time"],
+            full_iterations=reference["iterations"], screened_iterations=result["iterations"],
+            kept=result["kept"], added=result["added"], fallback=result["fallback"],
+            rounds=result["rounds"], kkt_size=kkt_size, objective_error=abs(result["objective"] - reference["objective"]),
+        ))
+
+    def median(key):
+        return float(np.median([run[key] for run in runs]))
+
+    kept = median("kept")
+    return dict(
+        N=N, instances=len(runs), units=screened.num_units,
+        full_time=median("full_time"), screened_time=median("screened_time"),
+        speedup=float(np.median([run["full_time"] / run["screened_time"] for run in runs])),
+        full_iterations=float(np.mean([run["full_iterations"] for run in runs])),
+        screened_iterations=float(np.mean([run["screened_iterations"] for run in runs])),
+        kept=kept, kept_fraction=kept / screened.num_units,
+        add_back_rate=float(np.mean([run["added"] > 0 for run in runs])),
+        fallback_rate=float(np.mean([run["fallback"] for run in runs])),
+        max_objective_error=float(max(run["objective_error"] for run in runs)),
+        full_kkt_size=full.program.kkt.size,
+        screened_kkt_size=median("kkt_size"),
+    )
+
+
+def load_benchmark(path=BENCHMARK_PATH):
+    """
+    Returns the stored benchmark results. render_all writes them before
+    rendering; a missing file is benchmarked here, with a warning.
+    """
+    return load_json(path, write_benchmark, "python screening.py")
+
+
+def write_benchmark(path=BENCHMARK_PATH, **kwargs):
+    results = benchmark(**kwargs)
+    write_json(path, results)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tight-constraint screening on LCvx instances.")
+    parser.add_argument("-N", type=int, default=20, help="Discretization nodes")
+    parser.add_argument("--instances", type=int, default=40, help="Training and test instances each")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=BENCHMARK_PATH, help="JSON file to write")
+    args = parser.parse_args(argv)
+    results = write_benchmark(args.output, N=args.N, num_train=args.instances, num_test=args.instances, seed=args.seed)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
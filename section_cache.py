@@ -0,0 +1,248 @@
+"""
+Section-level render cache for long scenes.
+
+A scene mixes in SectionCache and wraps each narrative part in a named
+section:
+
+    class IntroScene(SectionCache, Scene):
+        def construct(self):
+            with self.section("divert", num_dots=20):
+                ...
+            with self.section("optimal_control"):
+                ...
+
+Each section is keyed by a hash of its source code, its keyword parameters,
+the render settings, the sources of the repository modules the scene has
+imported (equations.py, point_cloud.py, ...) and the state the scene is in
+when it starts. The source is the with-block plus the statements of
+construct before it that are not other sections, so a change to shared
+setup code invalidates every section after it. Keyword parameters should
+carry any value the block uses that is computed at render time (solver
+output); it has to be the same from one render to the next for the section
+to hit, so store measured values such as timings rather than re-measuring.
+
+On a miss the section renders normally and its partial movie files are
+copied to media/cache/sections/<key>/. On a hit the section still runs,
+as a manim section with skip_animations, so the scene ends up in the same
+state without drawing a frame, and the cached files are spliced into the
+movie in its place. Editing one caption re-renders that section only, plus
+any later section whose starting state it changed.
+
+The key of the next section always uses the state the scene actually
+reached. If a cached section ends in a different state than the one it was
+recorded with, e.g. because a time-based updater (TracedPath) advances in
+one step while the section is skipped, the following sections miss and are
+rendered again from that state; the next render then hits them.
+
+Set MANIM_TRAJOPT_SECTIONS=0 to render every section.
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import manim
+import numpy as np
+from manim import config
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(REPO_DIR, "media", "cache", "sections")
+ENABLED = os.environ.get("MANIM_TRAJOPT_SECTIONS", "1") != "0"
+
+# Mobject attributes that determine what a mobject looks like
+STATE_ATTRIBUTES = (
+    "points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas",
+    "stroke_width", "pixel_array", "z_index",
+)
+
+# Parsed source files, keyed by (path, mtime)
+_sources = {}
+# Source digests of imported modules, keyed by (path, mtime)
+_module_digests = {}
+
+
+def state_digest(mobjects):
+    """
+    Hash of the class, geometry and colors of every mobject in the families of mobjects.
+    """
+    digest = hashlib.sha256()
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            digest.update(type(member).__name__.encode())
+            for name in STATE_ATTRIBUTES:
+                value = getattr(member, name, None)
+                if value is not None:
+                    digest.update(name.encode())
+                    digest.update(np.ascontiguousarray(value).tobytes())
+    return digest.hexdigest()
+
+
+def _file_digest(path):
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _module_digests:
+        with open(path, "rb") as f:
+            _module_digests[key] = hashlib.sha256(f.read()).digest()
+    return _module_digests[key]
+
+
+def module_digest(exclude=()):
+    """
+    Hash of the source of every imported module that lives in the repository,
+    except the files in exclude (absolute paths).
+    """
+    paths = set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and path.endswith(".py"):
+            path = os.path.abspath(path)
+            if path.startswith(REPO_DIR + os.sep) and path not in exclude:
+                paths.add(path)
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, REPO_DIR).encode())
+        digest.update(_file_digest(path))
+    return digest.hexdigest()
+
+
+def _value_bytes(value):
+    if isinstance(value, np.ndarray):
+        return b"array" + repr((value.shape, value.dtype.str)).encode() + value.tobytes()
+    if isinstance(value, dict):
+        return b"{" + b",".join(_value_bytes(k) + b":" + _value_bytes(v) for k, v in sorted(value.items(), key=str)) + b"}"
+    if isinstance(value, (list, tuple)):
+        return b"[" + b",".join(_value_bytes(v) for v in value) + b"]"
+    return repr(value).encode()
+
+
+def _parse(path):
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _sources:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        _sources[key] = (source, ast.parse(source, filename=path))
+    return _sources[key]
+
+
+def _is_section(node):
+    return isinstance(node, ast.With) and any(
+        isinstance(item.context_expr, ast.Call)
+        and isinstance(item.context_expr.func, ast.Attribute)
+        and item.context_expr.func.attr == "section"
+        for item in node.items
+    )
+
+
+def section_source(path, lineno):
+    """
+    Source of the section whose with statement is on line lineno: the block
+    itself and the statements before it in the enclosing function that are
+    not sections. Falls back to the whole file if the block is not found.
+    """
+    source, tree = _parse(path)
+    for function in ast.walk(tree):
+        if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        parts = []
+        for statement in function.body:
+            if _is_section(statement) and statement.lineno <= lineno <= statement.items[-1].context_expr.end_lineno:
+                parts.append(ast.get_source_segment(source, statement))
+                return "\n".join(parts)
+            if not _is_section(statement):
+                parts.append(ast.get_source_segment(source, statement))
+    return source
+
+
+class _Section:
+    def __init__(self, scene, name, params, path, lineno):
+        self.scene = scene
+        self.name = name
+        self.params = params
+        self.path = os.path.abspath(path)
+        self.source = section_source(path, lineno)
+        self.manifest = None
+
+    @property
+    def caching(self):
+        writer = self.scene.renderer.file_writer
+        return ENABLED and config.write_to_movie and hasattr(writer, "sections")
+
+    def key(self, start_state):
+        digest = hashlib.sha256()
+        for part in (
+            manim.__version__, self.name, self.source, _value_bytes(self.params), start_state,
+            # The scene file itself is covered by source, per section
+            module_digest(exclude={self.path}),
+            repr((config.pixel_width, config.pixel_height, config.frame_rate,
+                  config.movie_file_extension, config.transparent, str(config.background_color))),
+        ):
+            digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        return digest.hexdigest()
+
+    def __enter__(self):
+        scene = self.scene
+        if not self.caching:
+            scene.next_section(self.name)
+            return self
+        if scene._section_state is None:
+            scene._section_state = state_digest(scene.mobjects)
+        self.directory = os.path.join(CACHE_DIR, self.key(scene._section_state))
+        manifest_path = os.path.join(self.directory, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            segments = [os.path.join(self.directory, name) for name in manifest["segments"]]
+            if all(os.path.exists(path) for path in segments):
+                self.manifest = dict(manifest, segments=segments)
+        scene.next_section(self.name, skip_animations=self.manifest is not None)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None or not self.caching:
+            return False
+        scene = self.scene
+        section = scene.renderer.file_writer.sections[-1]
+        if self.manifest is not None:
+            section.partial_movie_files.extend(self.manifest["segments"])
+            scene._section_state = state_digest(scene.mobjects)
+            if scene._section_state != self.manifest["end_state"]:
+                manim.logger.info(f"Section {self.name!r} loaded from cache, but ended in a different "
+                                  f"state than it was recorded with; the following sections are keyed on this one")
+            else:
+                manim.logger.info(f"Section {self.name!r} loaded from cache")
+            return False
+        scene._section_state = state_digest(scene.mobjects)
+        self._store([path for path in section.partial_movie_files if path is not None])
+        return False
+
+    def _store(self, paths):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_directory = tempfile.mkdtemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            names = []
+            for i, path in enumerate(paths):
+                names.append(f"{i:05d}{os.path.splitext(path)[1]}")
+                shutil.copyfile(path, os.path.join(tmp_directory, names[-1]))
+            with open(os.path.join(tmp_directory, "manifest.json"), "w") as f:
+                json.dump(dict(name=self.name, segments=names, end_state=self.scene._section_state), f)
+            # Atomic, so a concurrent render never sees a partial section
+            os.replace(tmp_directory, self.directory)
+        except OSError:
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+
+
+class SectionCache:
+    """
+    Mixin for Scene classes that adds cached named sections, see the module docstring.
+    """
+
+    _section_state = None
+
+    def section(self, name, **params):
+        """
+        Context manager for one named section of construct.
+        """
+        frame = sys._getframe(1)
+        return _Section(self, name, params, frame.f_code.co_filename, frame.f_lineno)
@@ -0,0 +1,427 @@
+"""
+Primal-dual interior-point method for second-order cone programs.
+
+    min c^T x   s.t.   A x = b,   G x + s = h,   s in K
+
+K is the nonnegative orthant of size cones["l"] followed by one
+second-order cone per entry of cones["q"], the layout LCvxProblem builds.
+The method follows CVXOPT's coneqp and ECOS: Nesterov-Todd scaling,
+Mehrotra predictor-corrector steps and a sparse quasi-definite KKT system
+factored with SuperLU, with static regularization and iterative refinement.
+
+Everything that only depends on the problem structure (equilibration, the
+KKT sparsity pattern and where the scaling blocks live in it) is set up
+once in ConeProgram. b and h can then be updated in place between solves.
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+
+class Cones:
+    """
+    Vectorized operations on K = R_+^l x Q^{q_1} x ... x Q^{q_k}.
+
+    The second-order cones are grouped by size so every operation is a
+    handful of NumPy calls, whatever the number of cones.
+    """
+
+    def __init__(self, l, q=()):
+        self.l = int(l)
+        self.q = np.asarray(q, dtype=np.int64)
+        self.size = self.l + int(self.q.sum())
+        self.degree = self.l + len(self.q)
+        starts = self.l + np.concatenate([[0], np.cumsum(self.q)[:-1]]).astype(np.int64)
+        # (dim, (n, dim) indices into the cone vector) for each cone size
+        self.groups = [
+            (int(dim), starts[self.q == dim][:, None] + np.arange(dim)[None, :])
+            for dim in np.unique(self.q)
+        ]
+        self.identity = np.zeros(self.size)
+        self.identity[:self.l] = 1.0
+        for dim, idx in self.groups:
+            self.identity[idx[:, 0]] = 1.0
+
+    def product(self, u, v):
+        """
+        Jordan product u o v.
+        """
+        out = np.empty_like(u)
+        out[:self.l] = u[:self.l] * v[:self.l]
+        for dim, idx in self.groups:
+            U, V = u[idx], v[idx]
+            out[idx[:, 0]] = np.einsum("nd,nd->n", U, V)
+            out[idx[:, 1:]] = U[:, :1] * V[:, 1:] + V[:, :1] * U[:, 1:]
+        return out
+
+    def divide(self, lam, d):
+        """
+        Solves lam o u = d for u.
+        """
+        out = np.empty_like(d)
+        out[:self.l] = d[:self.l] / lam[:self.l]
+        for dim, idx in self.groups:
+            L, D = lam[idx], d[idx]
+            det = L[:, 0] ** 2 - np.einsum("nd,nd->n", L[:, 1:], L[:, 1:])
+            u0 = (L[:, 0] * D[:, 0] - np.einsum("nd,nd->n", L[:, 1:], D[:, 1:])) / det
+            out[idx[:, 0]] = u0
+            out[idx[:, 1:]] = (D[:, 1:] - u0[:, None] * L[:, 1:]) / L[:, :1]
+        return out
+
+    def max_step(self, x, dx):
+        """
+        Returns the largest alpha with x + alpha dx in K (inf if unbounded), for x in int K.
+        """
+        alpha = np.inf
+        if self.l:
+            neg = dx[:self.l] < 0
+            if neg.any():
+                alpha = np.min(-x[:self.l][neg] / dx[:self.l][neg])
+        for dim, idx in self.groups:
+            X, D = x[idx], dx[idx]
+            # J(x + t d) = J(x) + 2 t <x, d>_J + t^2 J(d), written as c + 2 b t + a t^2
+            a = D[:, 0] ** 2 - np.einsum("nd,nd->n", D[:, 1:], D[:, 1:])
+            b = X[:, 0] * D[:, 0] - np.einsum("nd,nd->n", X[:, 1:], D[:, 1:])
+            c = X[:, 0] ** 2 - np.einsum("nd,nd->n", X[:, 1:], X[:, 1:])
+            disc = np.maximum(b ** 2 - a * c, 0.0)
+            # The path leaves the cone at the smallest positive root of a t^2 + 2 b t + c, c > 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                quadratic = np.abs(a) > 1e-14 * np.maximum(1.0, b ** 2)
+                roots = [
+                    np.where(quadratic, (-b - np.sqrt(disc)) / a, np.inf),
+                    np.where(quadratic, (-b + np.sqrt(disc)) / a, np.inf),
+                    np.where(~quadratic & (b < 0), -c / (2 * b), np.inf),
+                ]
+            root = np.full(len(a), np.inf)
+            for r in roots:
+                root = np.where((r > 0) & (r < root), r, root)
+            alpha = min(alpha, float(np.min(root, initial=np.inf)))
+        return alpha
+
+    def interior_shift(self, x):
+        """
+        Returns the smallest t with x + t e in K.
+        """
+        t = -np.min(x[:self.l], initial=np.inf) if self.l else -np.inf
+        for dim, idx in self.groups:
+            X = x[idx]
+            t = max(t, float(np.max(np.linalg.norm(X[:, 1:], axis=1) - X[:, 0])))
+        return t
+
+    def nt_scaling(self, s, z):
+        """
+        Returns the Nesterov-Todd scaling W (with W z = W^{-1} s = lam) and lam.
+        """
+        scaling = Scaling(self)
+        scaling.w = np.sqrt(s[:self.l] / z[:self.l])
+        for dim, idx in self.groups:
+            S, Z = s[idx], z[idx]
+            s_norm = np.sqrt(S[:, 0] ** 2 - np.einsum("nd,nd->n", S[:, 1:], S[:, 1:]))
+            z_norm = np.sqrt(Z[:, 0] ** 2 - np.einsum("nd,nd->n", Z[:, 1:], Z[:, 1:]))
+            S = S / s_norm[:, None]
+            Z = Z / z_norm[:, None]
+            gamma = np.sqrt((1 + np.einsum("nd,nd->n", S, Z)) / 2)
+            w = S.copy()
+            w[:, 0] += Z[:, 0]
+            w[:, 1:] -= Z[:, 1:]
+            w /= 2 * gamma[:, None]
+            eta = np.sqrt(s_norm / z_norm)
+            # W = eta [[w0, w1^T], [w1, I + w1 w1^T / (1 + w0)]], W^{-1} flips the sign of w1
+            block = np.einsum("ni,nj->nij", w[:, 1:], w[:, 1:]) / (1 + w[:, 0])[:, None, None]
+            block += np.eye(dim - 1)
+            W = np.empty((len(w), dim, dim))
+            W[:, 0, 0] = w[:, 0]
+            W[:, 0, 1:] = W[:, 1:, 0] = w[:, 1:]
+            W[:, 1:, 1:] = block
+            W_inv = W.copy()
+            W_inv[:, 0, 1:] *= -1
+            W_inv[:, 1:, 0] *= -1
+            scaling.blocks.append((W * eta[:, None, None], W_inv / eta[:, None, None]))
+        scaling.lam = scaling.apply(z)
+        return scaling
+
+
+class Scaling:
+    """
+    A block-diagonal NT scaling matrix W.
+    """
+
+    def __init__(self, cones):
+        self.cones = cones
+        self.w = None
+        self.blocks = []
+        self.lam = None
+
+    def apply(self, v, inverse=False):
+        cones = self.cones
+        out = np.empty_like(v)
+        out[:cones.l] = v[:cones.l] / self.w if inverse else v[:cones.l] * self.w
+        for (dim, idx), (W, W_inv) in zip(cones.groups, self.blocks):
+            out[idx] = np.einsum("nij,nj->ni", W_inv if inverse else W, v[idx])
+        return out
+
+    def squared_blocks(self):
+        """
+        Returns the values of W^T W in the order KKTSystem expects them.
+        """
+        parts = [self.w ** 2]
+        for W, W_inv in self.blocks:
+            parts.append(np.einsum("nij,njk->nik", W, W).ravel())
+        return np.concatenate(parts)
+
+
+class KKTSystem:
+    """
+    The quasi-definite system
+
+        [ delta I   A^T        G^T           ] [dx]   [r_x]
+        [ A        -delta I    0             ] [dy] = [r_y]
+        [ G         0         -W^T W - delta I] [dz]   [r_z]
+
+    stored once as a CSC pattern; each factorization only rewrites the W^T W values.
+    """
+
+    def __init__(self, A, G, cones, delta=1e-8):
+        self.n = A.shape[1]
+        self.p = A.shape[0]
+        self.m = G.shape[0]
+        self.size = self.n + self.p + self.m
+        self.delta = delta
+        A, G = sp.coo_matrix(A), sp.coo_matrix(G)
+        n, p = self.n, self.p
+
+        # Positions of the W^T W values, LP diagonal first then each cone group row by row
+        w_rows = [np.arange(cones.l)]
+        w_cols = [np.arange(cones.l)]
+        for dim, idx in cones.groups:
+            w_rows.append(np.repeat(idx, dim, axis=1).ravel())
+            w_cols.append(np.tile(idx, (1, dim)).ravel())
+        w_rows = np.concatenate(w_rows) + n + p
+        w_cols = np.concatenate(w_cols) + n + p
+        self.num_w = len(w_rows)
+
+        self.regularization = np.concatenate([np.full(n, delta), np.full(p, -delta), np.full(self.m, -delta)])
+        diag = np.arange(self.size)
+        rows = np.concatenate([A.row + n, A.col, G.row + n + p, G.col, diag, w_rows])
+        cols = np.concatenate([A.col, A.row + n, G.col, G.row + n + p, diag, w_cols])
+        vals = np.concatenate([A.data, A.data, G.data, G.data, self.regularization, np.zeros(self.num_w)])
+        ids = np.concatenate([np.zeros(2 * A.nnz + 2 * G.nnz + self.size), np.arange(1, self.num_w + 1)])
+        self.matrix = sp.csc_matrix((vals, (rows, cols)), shape=(self.size, self.size))
+        id_matrix = sp.csc_matrix((ids, (rows, cols)), shape=(self.size, self.size))
+        # Both matrices share one pattern, so the ids give the data slot of every W^T W value
+        self.w_slots = np.empty(self.num_w, dtype=np.int64)
+        filled = id_matrix.data > 0
+        self.w_slots[id_matrix.data[filled].astype(np.int64) - 1] = np.flatnonzero(filled)
+        self.base_data = self.matrix.data.copy()
+        self.nnz = self.matrix.nnz
+        self.lu = None
+
+    def factor(self, scaling):
+        data = self.base_data.copy()
+        data[self.w_slots] -= scaling.squared_blocks()
+        self.matrix.data = data
+        self.lu = splu(self.matrix, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                       options=dict(SymmetricMode=True))
+
+    def solve(self, rhs, refinement=3):
+        """
+        Solves the unregularized system, correcting the regularized solve with iterative refinement.
+        """
+        x = self.lu.solve(rhs)
+        for _ in range(refinement):
+            residual = rhs - (self.matrix @ x - self.regularization * x)
+            if np.linalg.norm(residual, np.inf) <= 1e-14 * (1 + np.linalg.norm(rhs, np.inf)):
+                break
+            x += self.lu.solve(residual)
+        return x
+
+
+def equilibrate(A, G, cones, iterations=10):
+    """
+    Ruiz equilibration of [A; G]. Returns the column scaling D and the row
+    scalings E_A, E_G; the rows of one second-order cone share one factor.
+    """
+    n = A.shape[1]
+    D = np.ones(n)
+    E_A = np.ones(A.shape[0])
+    E_G = np.ones(G.shape[0])
+    A, G = sp.csr_matrix(A), sp.csr_matrix(G)
+    # Cone id of every row of G, so cone rows can be pooled
+    cone_of_row = np.concatenate([np.arange(cones.l), cones.l + np.repeat(np.arange(len(cones.q)), cones.q)]).astype(np.int64)
+    for _ in range(iterations):
+        As = sp.diags(E_A) @ A @ sp.diags(D)
+        Gs = sp.diags(E_G) @ G @ sp.diags(D)
+        col = np.maximum(abs(As).max(axis=0).toarray().ravel(), abs(Gs).max(axis=0).toarray().ravel())
+        row_A = abs(As).max(axis=1).toarray().ravel()
+        row_G = abs(Gs).max(axis=1).toarray().ravel()
+        pooled = np.zeros(cones.degree)
+        np.maximum.at(pooled, cone_of_row, row_G)
+        row_G = pooled[cone_of_row]
+        D /= np.sqrt(np.where(col > 0, col, 1.0))
+        E_A /= np.sqrt(np.where(row_A > 0, row_A, 1.0))
+        E_G /= np.sqrt(np.where(row_G > 0, row_G, 1.0))
+    return D, E_A, E_G
+
+
+class ConeProgram:
+    """
+    A second-order cone program set up once and solved many times.
+
+    cones is {"l": number of linear inequalities, "q": sizes of the second-order cones}.
+    """
+
+    def __init__(self, c, G, h, cones, A=None, b=None, equilibrate_iterations=10, delta=1e-8):
+        n = len(c)
+        self.cones = Cones(cones.get("l", 0), cones.get("q", ()))
+        A = sp.csr_matrix((0, n)) if A is None else sp.csr_matrix(A)
+        b = np.zeros(0) if b is None else b
+        G = sp.csr_matrix(G)
+        self.D, self.E_A, self.E_G = equilibrate(A, G, self.cones, equilibrate_iterations)
+        self.A = (sp.diags(self.E_A) @ A @ sp.diags(self.D)).tocsr()
+        self.G = (sp.diags(self.E_G) @ G @ sp.diags(self.D)).tocsr()
+        self.c = np.empty(n)
+        self.b = np.empty(len(self.E_A))
+        self.h = np.empty(len(self.E_G))
+        self.update(c=c, b=b, h=h)
+        self.kkt = KKTSystem(self.A, self.G, self.cones, delta)
+
+    def update(self, c=None, b=None, h=None):
+        """
+        Writes new problem data into the scaled c, b and h in place.
+        """
+        if c is not None:
+            c = self.D * np.asarray(c, dtype=np.float64)
+            # Scale the cost so the dual variables have a magnitude comparable to the primal ones
+            self.cost_scale = 1.0 / max(1.0, np.linalg.norm(c, np.inf))
+            self.c[:] = c * self.cost_scale
+        if b is not None:
+            self.b[:] = self.E_A * np.asarray(b, dtype=np.float64)
+        if h is not None:
+            self.h[:] = self.E_G * np.asarray(h, dtype=np.float64)
+        return self
+
+    def _newton(self, scaling, rx, ry, rz, ds):
+        """
+        Solves for a search direction whose complementarity part is lam o (W dz + W^{-1} ds) = ds.
+        """
+        n, p = self.kkt.n, self.kkt.p
+        scaled_ds = self.cones.divide(scaling.lam, ds)
+        rhs = np.concatenate([-rx, -ry, -rz - scaling.apply(scaled_ds)])
+        sol = self.kkt.solve(rhs)
+        dx, dy, dz = sol[:n], sol[n:n + p], sol[n + p:]
+        ds_vec = scaling.apply(scaled_ds - scaling.apply(dz))
+        return dx, dy, dz, ds_vec
+
+    def _initial_point(self, x0=None):
+        """
+        CVXOPT's starting point: least-norm s and z shifted into the interior.
+        A given primal point x0 replaces the least-norm x, with s = h - G x0.
+        """
+        n, p, m = self.kkt.n, self.kkt.p, self.kkt.m
+        identity = Scaling(self.cones)
+        identity.w = np.ones(self.cones.l)
+        identity.blocks = [(np.broadcast_to(np.eye(dim), (len(idx), dim, dim)),) * 2 for dim, idx in self.cones.groups]
+        self.kkt.factor(identity)
+        sol = self.kkt.solve(np.concatenate([np.zeros(n), self.b, self.h]))
+        x, s = sol[:n], -sol[n + p:]
+        if x0 is not None:
+            x = np.asarray(x0, dtype=np.float64) / self.D
+            s = self.h - self.G @ x
+        sol = self.kkt.solve(np.concatenate([-self.c, np.zeros(p), np.zeros(m)]))
+        y, z = sol[n:n + p], sol[n + p:]
+        e = self.cones.identity
+        for v in (s, z):
+            shift = self.cones.interior_shift(v)
+            if shift >= -1e-8 * max(np.linalg.norm(v), 1.0):
+                v += (1 + shift) * e
+        return x, y, z, s
+
+    def solve(self, max_iterations=50, tol=1e-8, callback=None, x0=None):
+        """
+        Runs the interior-point method and returns a dict with x, y, z, s
+        (in the original scaling), the status ("optimal", "max_iterations"
+        or "numerical_error"), iteration count and solve time in seconds.
+
+        callback(info) is called once per iteration with the current
+        iterate and its mu, residuals, step and KKT size. x0 optionally
+        sets the starting primal point.
+        """
+        start = time.perf_counter()
+        cones = self.cones
+        x, y, z, s = self._initial_point(x0)
+        norm_b = max(1.0, np.linalg.norm(self.b))
+        norm_h = max(1.0, np.linalg.norm(self.h))
+        norm_c = max(1.0, np.linalg.norm(self.c))
+        e = cones.identity
+        status = "max_iterations"
+        iteration = 0
+        step = 0.0
+        sigma = 0.0
+
+        for iteration in range(max_iterations + 1):
+            rx = self.c + self.A.T @ y + self.G.T @ z
+            ry = self.A @ x - self.b
+            rz = self.G @ x + s - self.h
+            gap = s @ z
+            mu = gap / cones.degree
+            pcost = self.c @ x
+            dcost = -self.b @ y - self.h @ z
+            pres = max(np.linalg.norm(ry) / norm_b, np.linalg.norm(rz) / norm_h)
+            dres = np.linalg.norm(rx) / norm_c
+            if callback is not None:
+                callback(dict(
+                    iteration=iteration, mu=mu, gap=gap, pres=pres, dres=dres,
+                    step=step, sigma=sigma, pcost=pcost / self.cost_scale,
+                    kkt_size=self.kkt.size, kkt_nnz=self.kkt.nnz,
+                    time=time.perf_counter() - start,
+                    **self._unscale(x, y, z, s),
+                ))
+            if not np.isfinite(gap) or not np.isfinite(pres):
+                status = "numerical_error"
+                break
+            relgap = gap / max(abs(pcost), abs(dcost), 1e-12)
+            if pres <= tol and dres <= tol and (gap <= tol or relgap <= tol):
+                status = "optimal"
+                break
+            if iteration == max_iterations:
+                break
+
+            scaling = cones.nt_scaling(s, z)
+            lam = scaling.lam
+            try:
+                self.kkt.factor(scaling)
+            except RuntimeError:
+                status = "numerical_error"
+                break
+
+            # Predictor (affine scaling) direction
+            lam_sq = cones.product(lam, lam)
+            dx_a, dy_a, dz_a, ds_a = self._newton(scaling, rx, ry, rz, -lam_sq)
+            alpha = min(1.0, cones.max_step(s, ds_a), cones.max_step(z, dz_a))
+            rho = (s + alpha * ds_a) @ (z + alpha * dz_a) / gap
+            sigma = min(1.0, max(0.0, rho)) ** 3
+
+            # Corrector with Mehrotra's second-order term
+            correction = cones.product(scaling.apply(ds_a, inverse=True), scaling.apply(dz_a))
+            ds = -lam_sq - correction + sigma * mu * e
+            dx, dy, dz, ds_vec = self._newton(scaling, rx, ry, rz, ds)
+            step = min(1.0, 0.99 * min(cones.max_step(s, ds_vec), cones.max_step(z, dz)))
+            x += step * dx
+            y += step * dy
+            z += step * dz
+            s += step * ds_vec
+
+        result = self._unscale(x, y, z, s)
+        result.update(status=status, iterations=iteration, solve_time=time.perf_counter() - start,
+                      objective=self.c @ x / self.cost_scale)
+        return result
+
+    def _unscale(self, x, y, z, s):
+        return dict(
+            x=self.D * x,
+            y=self.E_A * y / self.cost_scale,
+            z=self.E_G * z / self.cost_scale,
+            s=s / self.E_G,
+        )
@@ -0,0 +1,102 @@
+"""
+Vectorized divert arcs for the trajectory scenes.
+
+ArcPath reproduces manim's utils.paths.path_along_circles(arc_angle, center)
+evaluated between a start and an end point, but for a whole array of alphas
+in one NumPy call. It also returns cubic Bezier control points that match
+the curve's position and tangent at every knot, so a path can be set
+directly with set_points instead of set_points_smoothly over 100 samples.
+hermite_bezier_points does the same for any sampled curve with known
+tangents, such as a solved trajectory with its velocities.
+"""
+import numpy as np
+
+OUT = np.array([0.0, 0.0, 1.0])
+
+
+def _as_vector(point):
+    return np.asarray(point, dtype=np.float64).reshape(3)
+
+
+def rotate(vectors, angles, axis=OUT):
+    """
+    Rotates each row of vectors (m, 3) about a unit axis by the matching angle (m,).
+    """
+    vectors = np.atleast_2d(vectors)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1, 1)
+    cos, sin = np.cos(angles), np.sin(angles)
+    # Rodrigues' formula
+    return (vectors * cos
+            + np.cross(axis, vectors) * sin
+            + np.outer(vectors @ axis, axis) * (1 - cos))
+
+
+def hermite_bezier_points(anchors, handles):
+    """
+    Returns cubic Bezier control points (4 per segment) through the anchors
+    (m, 3), with handles (m, 3) the tangent at each anchor times the
+    segment length in the curve parameter over 3.
+    """
+    anchors = np.asarray(anchors, dtype=np.float64)
+    handles = np.asarray(handles, dtype=np.float64)
+    points = np.empty((len(anchors) - 1, 4, 3))
+    points[:, 0] = anchors[:-1]
+    points[:, 1] = anchors[:-1] + handles[:-1]
+    points[:, 2] = anchors[1:] - handles[1:]
+    points[:, 3] = anchors[1:]
+    return points.reshape(-1, 3)
+
+
+class ArcPath:
+    """
+    The curve traced by path_along_circles(arc_angle, center)(start, end, alpha), 0 <= alpha <= 1.
+
+    P(alpha) = center + R(alpha * arc_angle) d(alpha), with d interpolating
+    linearly from start - center to R(-arc_angle)(end - center).
+    """
+
+    def __init__(self, start, end, center, arc_angle=-np.pi / 4, axis=OUT):
+        self.start = _as_vector(start)
+        self.end = _as_vector(end)
+        self.center = _as_vector(center)
+        self.arc_angle = float(arc_angle)
+        norm = np.linalg.norm(axis)
+        self.axis = OUT if norm == 0 else np.asarray(axis, dtype=np.float64) / norm
+        # Offsets from the center at alpha = 0 and (before rotating) at alpha = 1
+        self._d0 = self.start - self.center
+        self._d1 = rotate(self.end - self.center, [-self.arc_angle], self.axis)[0]
+
+    def points(self, alphas):
+        """
+        Returns the (m, 3) points of the curve at an array of alphas.
+        """
+        alphas = np.asarray(alphas, dtype=np.float64).reshape(-1, 1)
+        d = (1 - alphas) * self._d0 + alphas * self._d1
+        return self.center + rotate(d, alphas[:, 0] * self.arc_angle, self.axis)
+
+    def derivatives(self, alphas):
+        """
+        Returns dP/dalpha (m, 3) at an array of alphas.
+        """
+        alphas = np.asarray(alphas, dtype=np.float64).reshape(-1, 1)
+        d = (1 - alphas) * self._d0 + alphas * self._d1
+        # Rotation commutes with axis x (.), so R (theta axis x d + d') is the derivative
+        tangent = self.arc_angle * np.cross(self.axis, d) + (self._d1 - self._d0)
+        return rotate(tangent, alphas[:, 0] * self.arc_angle, self.axis)
+
+    def __call__(self, alpha):
+        return self.points([alpha])[0]
+
+    def length(self, num_samples=64):
+        """
+        Arc length of the curve, from a polyline through num_samples + 1 points.
+        """
+        points = self.points(np.linspace(0, 1, num_samples + 1))
+        return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+    def bezier_points(self, num_segments=8):
+        """
+        Returns 4 * num_segments cubic Bezier control points for the whole curve.
+        """
+        knots = np.linspace(0, 1, num_segments + 1)
+        return hermite_bezier_points(self.points(knots), self.derivatives(knots) / (3 * num_segments))
@@ -0,0 +1,186 @@
+"""
+Fast dry run of every scene that catches construction errors without rendering.
+
+Each scene's construct() runs with animations skipped: every play jumps
+straight to its final state, frames are never rasterized and nothing is
+encoded or written. Everything else happens for real, so every MathTex/Tex
+is compiled by LaTeX, every Text is laid out, and every Transform is begun
+on its actual source and target, which aligns their points, and then
+checked for a pair that cannot be interpolated (a missing target, or a
+vectorized mobject paired with a non-vectorized one).
+
+Scenes are checked in parallel worker processes. A failure is reported
+with the scene and the line of the scene file that raised it:
+
+    $ python validate_scenes.py
+    IntroScene:IntroScene        ok       42 tex, 17 text, 9 transforms  [3.1s]
+    Motivation:Motivation        FAILED   Motivation.py:87  ValueError: latex error converting to dvi ...
+    $ python validate_scenes.py IntroScene -j 1
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import scene_registry
+from render_all import precompute
+
+
+class TransformMismatch(ValueError):
+    pass
+
+
+def _check_transform(animation):
+    from manim import VMobject
+
+    source, target = animation.mobject, animation.target_mobject
+    if target is None:
+        raise TransformMismatch(f"{type(animation).__name__} of {type(source).__name__} has no target")
+    if isinstance(source, VMobject) != isinstance(target, VMobject):
+        raise TransformMismatch(
+            f"{type(animation).__name__} cannot interpolate {type(source).__name__} into {type(target).__name__}"
+        )
+
+
+class _Counters:
+    """
+    Patches the Tex/Text constructors and Transform.begin for one validation run, counting each.
+    """
+
+    def __init__(self):
+        self.tex = self.text = self.transforms = 0
+
+    def __enter__(self):
+        from manim import MarkupText, Text, Transform
+        from manim.mobject.text.tex_mobject import SingleStringMathTex
+
+        self.originals = [
+            (SingleStringMathTex, "__init__", "tex"),
+            (Text, "__init__", "text"),
+            (MarkupText, "__init__", "text"),
+            (Transform, "begin", "transforms"),
+        ]
+        self.originals = [(cls, name, counter, getattr(cls, name)) for cls, name, counter in self.originals]
+        for cls, name, counter, method in self.originals:
+            setattr(cls, name, self._counted(method, counter, cls is Transform))
+        return self
+
+    def __exit__(self, *exc):
+        for cls, name, _, method in self.originals:
+            setattr(cls, name, method)
+        return False
+
+    def _counted(self, method, counter, is_transform):
+        def wrapper(instance, *args, **kwargs):
+            if is_transform:
+                # begin() builds the target of .animate and MoveToTarget first
+                result = method(instance, *args, **kwargs)
+                _check_transform(instance)
+                self.transforms += 1
+                return result
+            setattr(self, counter, getattr(self, counter) + 1)
+            return method(instance, *args, **kwargs)
+        wrapper.__wrapped__ = method
+        return wrapper
+
+
+def _failure_site(scene_file, tb):
+    """
+    The innermost line of scene_file in a traceback, or its innermost frame.
+    """
+    frames = traceback.extract_tb(tb)
+    for frame in reversed(frames):
+        if os.path.abspath(frame.filename) == scene_file:
+            return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    if frames:
+        return f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno}"
+    return "?"
+
+
+def validate_scene(entry):
+    """
+    Dry-runs one scene and returns a result dict with status "ok", "failed" or "skipped".
+    """
+    result = dict(key=entry.key, status="ok", seconds=0.0, tex=0, text=0, transforms=0)
+    missing = entry.missing_dependencies()
+    if missing:
+        return dict(result, status="skipped", error=f"missing {', '.join(missing)}")
+
+    start = time.perf_counter()
+    counters = _Counters()
+    try:
+        from manim import tempconfig
+
+        import section_cache
+
+        section_cache.ENABLED = False
+        scene_class = scene_registry.load_scene_class(entry)
+        settings = {"quality": "low_quality", "dry_run": True, "disable_caching": True, "preview": False}
+        with tempconfig(settings), counters:
+            scene = scene_class(skip_animations=True)
+            # Explicit frame requests from a scene become no-ops as well
+            scene.renderer.update_frame = lambda *args, **kwargs: None
+            scene.renderer.file_writer.write_frame = lambda *args, **kwargs: None
+            scene.render()
+    except Exception as e:
+        result.update(
+            status="failed",
+            error=f"{type(e).__name__}: {e}".strip().splitlines()[0],
+            site=_failure_site(os.path.abspath(entry.path), e.__traceback__),
+        )
+    result.update(seconds=time.perf_counter() - start, tex=counters.tex, text=counters.text,
+                  transforms=counters.transforms)
+    return result
+
+
+def format_result(result):
+    key = f"{result['key']:45s}"
+    if result["status"] == "skipped":
+        return f"{key} skipped  ({result['error']})"
+    if result["status"] == "failed":
+        return f"{key} FAILED   {result['site']}  {result['error']}  [{result['seconds']:.1f}s]"
+    return (f"{key} ok       {result['tex']} tex, {result['text']} text, "
+            f"{result['transforms']} transforms  [{result['seconds']:.1f}s]")
+
+
+def validate_all(entries, jobs=None):
+    """
+    Validates the scenes across worker processes, printing each result as it arrives.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, max(len(entries), 1))
+    precompute([entry for entry in entries if not entry.missing_dependencies()])
+    # A fresh process per scene, so one scene's config or patched classes never leak into another
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context, max_tasks_per_child=1) as pool:
+        results = []
+        for result in pool.map(validate_scene, entries):
+            print(format_result(result), flush=True)
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dry-run every scene without rasterizing or encoding.")
+    parser.add_argument("scenes", nargs="*", help="scene keys or class names (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: cpu count)")
+    args = parser.parse_args(argv)
+
+    entries = scene_registry.discover()
+    try:
+        entries = [scene_registry.find(name, entries) for name in args.scenes] if args.scenes else entries
+    except KeyError as e:
+        parser.error(e.args[0])
+    start = time.perf_counter()
+    results = validate_all(entries, args.jobs)
+    passed = sum(r["status"] == "ok" for r in results)
+    failed = sum(r["status"] == "failed" for r in results)
+    print(f"{passed} passed, {failed} failed, {len(results) - passed - failed} skipped "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())